@@ -0,0 +1,157 @@
+"""
+Compare audio preparation strategies for transcription on a local media file: the legacy
+64 kbps mp3 re-encode (FFmpegExtractAudio), keeping the native stream, remuxing it, the
+16 kHz mono fallback, and the speech-only copy with silence and music cut by VAD. Reports wall time, ffmpeg CPU time and bytes written/uploaded.
+
+Usage: python benchmarks/bench_audio.py [--input media.webm] [--seconds 600] [--repeat 3]
+Without --input a synthetic 64 kbps opus/webm file is generated. Requires ffmpeg in PATH.
+"""
+import argparse
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from youtube_minder.services.downloader import (  # noqa: E402
+    TRANSCRIBABLE_EXTENSIONS,
+    _run_ffmpeg,
+    downsample_audio,
+    remux_audio,
+)
+from youtube_minder.services.vad import extract_speech  # noqa: E402
+
+
+def write_synthetic_source(path: Path, seconds: float) -> None:
+    """Speech-band test signal encoded the way YouTube serves low-bitrate audio (opus in webm)."""
+    _run_ffmpeg(
+        [
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=220:sample_rate=48000:duration={seconds}",
+            "-af",
+            "tremolo=f=3:d=0.8",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            "64k",
+            str(path),
+        ]
+    )
+
+
+def reencode_mp3(source: Path, target: Path) -> None:
+    """What FFmpegExtractAudio(preferredcodec=mp3, preferredquality=64) runs."""
+    _run_ffmpeg(["-i", str(source), "-vn", "-c:a", "libmp3lame", "-b:a", "64k", str(target)])
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _legacy_mp3(source: Path, run_dir: Path) -> Path:
+    target = run_dir / "out.mp3"
+    reencode_mp3(source, target)
+    return target
+
+
+def _native(source: Path, run_dir: Path) -> None:
+    if source.suffix.lower() not in TRANSCRIBABLE_EXTENSIONS:
+        raise _Unsupported("container not accepted by the transcription API")
+    return None
+
+
+def _remux(source: Path, run_dir: Path) -> Path:
+    suffix = source.suffix if source.suffix.lower() in TRANSCRIBABLE_EXTENSIONS else ".m4a"
+    target = run_dir / f"out{suffix}"
+    remux_audio(source, target)
+    return target
+
+
+def _downsample(source: Path, run_dir: Path) -> Path:
+    target = run_dir / "out.mp3"
+    downsample_audio(source, target)
+    return target
+
+
+def _speech_only(source: Path, run_dir: Path) -> Path | None:
+    target = run_dir / "speech.mp3"
+    speech_map = extract_speech(str(source), target)
+    print(f"  VAD kept {speech_map.speech_seconds:.0f}s of {speech_map.duration:.0f}s", file=sys.stderr)
+    return target if target.exists() else None
+
+
+STRATEGIES: list[tuple[str, Callable[[Path, Path], Path | None]]] = [
+    ("mp3 re-encode 64k (legacy)", _legacy_mp3),
+    ("native stream", _native),
+    ("remux (copy)", _remux),
+    ("16 kHz mono fallback", _downsample),
+    ("speech only (VAD)", _speech_only),
+]
+
+
+def _child_cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def bench(prepare: Callable[[Path, Path], Path | None], source: Path, run_dir: Path, repeat: int) -> dict:
+    best_wall = best_cpu = float("inf")
+    output = source
+    for _ in range(repeat):
+        shutil.rmtree(run_dir, ignore_errors=True)
+        run_dir.mkdir(parents=True)
+        cpu_before = _child_cpu_seconds()
+        started = time.perf_counter()
+        output = prepare(source, run_dir) or source
+        best_wall = min(best_wall, time.perf_counter() - started)
+        best_cpu = min(best_cpu, _child_cpu_seconds() - cpu_before)
+    return {
+        "wall_seconds": best_wall,
+        "cpu_seconds": best_cpu,
+        "written_mb": (output.stat().st_size if output != source else 0) / 1e6,
+        "upload_mb": output.stat().st_size / 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, default=None, help="Local audio/video file (e.g. a yt-dlp download).")
+    parser.add_argument("--seconds", type=float, default=600, help="Length of the synthetic source.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workdir", type=Path, default=Path("data/bench/audio"))
+    args = parser.parse_args()
+
+    if not shutil.which("ffmpeg"):
+        sys.exit("ffmpeg is required for this benchmark.")
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    source = args.input
+    if source is None:
+        source = args.workdir / f"synthetic_{args.seconds:g}s.webm"
+        if not source.exists():
+            write_synthetic_source(source, args.seconds)
+
+    print(f"source: {source} ({source.stat().st_size / 1e6:.2f} MB)")
+    print(f"{'strategy':<28} {'wall s':>8} {'cpu s':>8} {'written MB':>11} {'upload MB':>10}")
+    for idx, (name, prepare) in enumerate(STRATEGIES):
+        try:
+            r = bench(prepare, source, args.workdir / f"run{idx}", args.repeat)
+        except (subprocess.CalledProcessError, _Unsupported) as exc:
+            print(f"{name:<28} skipped: {exc}")
+            continue
+        print(
+            f"{name:<28} {r['wall_seconds']:>8.3f} {r['cpu_seconds']:>8.3f} "
+            f"{r['written_mb']:>11.2f} {r['upload_mb']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
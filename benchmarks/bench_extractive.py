@@ -0,0 +1,71 @@
+"""
+Benchmark the local extractive summary (TextRank over TF-IDF) on transcripts of 10k-500k
+characters: punctuated text, and auto-caption text cleaned from rolling VTT (no sentence
+punctuation, so it is cut into word windows). Reports latency percentiles and sentence counts.
+
+Usage: python benchmarks/bench_extractive.py [--chars 10000 50000 100000 250000 500000] [--repeat 5]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from bench_vtt import _WORDS, write_rolling_vtt  # noqa: E402
+from youtube_minder.services.downloader import _clean_vtt_text  # noqa: E402
+from youtube_minder.services.extractive import extractive_summary, split_sentences  # noqa: E402
+
+
+def punctuated_text(chars: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    sentences: list[str] = []
+    size = 0
+    while size < chars:
+        sentence = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 18))).capitalize() + "."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)[:chars]
+
+
+def caption_text(chars: int, workdir: Path) -> str:
+    """Cleaned auto-caption text of at least `chars` characters, cut to size."""
+    path = workdir / "captions.vtt"
+    # Roughly 20 characters of clean text per second of rolling captions
+    write_rolling_vtt(path, hours=chars / 20 / 3600 * 1.2)
+    return _clean_vtt_text(path.read_text(encoding="utf-8"))[:chars]
+
+
+def bench(text: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extractive_summary(text)
+        timings.append((time.perf_counter() - started) * 1000)
+    p50, p90 = np.percentile(timings, [50, 90])
+    return {"p50_ms": p50, "p90_ms": p90, "sentences": len(split_sentences(text))}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, nargs="+", default=[10_000, 50_000, 100_000, 250_000, 500_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'input':<24} {'p50 ms':>9} {'p90 ms':>9} {'sentences':>10}")
+    with tempfile.TemporaryDirectory(prefix="ym-bench-extractive-") as tmp:
+        for chars in args.chars:
+            for kind, text in (("punctuated", punctuated_text(chars)), ("captions", caption_text(chars, Path(tmp)))):
+                r = bench(text, args.repeat)
+                label = f"{kind}[{chars // 1000}k]"
+                print(f"{label:<24} {r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} {r['sentences']:>10}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+End-to-end pipeline benchmark against generated fixtures, fully offline.
+
+yt-dlp is replaced by a fixture extractor that "downloads" generated VTT files and
+silent MP3s, and OpenAI calls go to a local fake server (fake_openai.py). Each stage
+reports latency percentiles, peak RSS and token usage; results can be saved as a JSON
+baseline and later runs compared against it.
+
+Usage:
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --compare benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from bench_vtt import write_rolling_vtt  # noqa: E402
+from fake_openai import FakeOpenAIServer  # noqa: E402
+
+
+# Silent MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, mono, no padding (417 bytes, 1152 samples)
+_MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0xC4]) + bytes(413)
+_MP3_FRAME_SECONDS = 1152 / 44100
+_PERCENTILES = (50, 90, 99)
+
+
+def write_silent_mp3(path: Path, seconds: float) -> None:
+    with open(path, "wb") as handle:
+        handle.write(_MP3_FRAME * max(1, int(seconds / _MP3_FRAME_SECONDS)))
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+class FixtureYoutubeDL:
+    """
+    yt-dlp stand-in: extract_info returns fixture metadata and, when downloading, copies
+    the fixture VTT / MP3 for the URL's video id to where yt-dlp would have written it.
+    """
+
+    fixtures: dict[str, dict] = {}
+
+    def __init__(self, opts: dict | None = None) -> None:
+        self.opts = opts or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    @staticmethod
+    def sanitize_info(info, remove_private_keys=False):
+        return info
+
+    def extract_info(self, url, download=True, process=True):
+        from youtube_minder.services.downloader import extract_video_id
+
+        video_id = extract_video_id(url)
+        if video_id not in self.fixtures:
+            raise RuntimeError(f"No fixture for {url}")
+        info = {"id": video_id, "webpage_url": url, **self.fixtures[video_id]["info"]}
+        return self.process_ie_result(info, download=download)
+
+    def process_ie_result(self, info, download=True):
+        if not download:
+            return info
+        fixture = self.fixtures[info["id"]]
+        outtmpl = Path(self.opts["outtmpl"])
+        if self.opts.get("writesubtitles") and fixture.get("vtt"):
+            lang = self.opts.get("subtitleslangs", ["en"])[0]
+            shutil.copyfile(fixture["vtt"], outtmpl.parent / f"{info['id']}.{lang}.vtt")
+        if not self.opts.get("skip_download") and fixture.get("mp3"):
+            shutil.copyfile(fixture["mp3"], outtmpl.parent / f"{info['id']}.mp3")
+        return info
+
+
+class Harness:
+    def __init__(self, server: FakeOpenAIServer, repeat: int) -> None:
+        self.server = server
+        self.repeat = repeat
+        self.results: dict[str, dict] = {}
+
+    def run(self, name: str, fn: Callable[[], object], setup: Callable[[], None] | None = None) -> None:
+        timings = []
+        usage_before = self.server.usage()
+        rss_before = _peak_rss_mb()
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        usage_after = self.server.usage()
+
+        p = np.percentile(np.array(timings) * 1000, _PERCENTILES)
+        result = {
+            "runs": len(timings),
+            **{f"p{q}_ms": round(float(v), 3) for q, v in zip(_PERCENTILES, p)},
+            "mean_ms": round(float(np.mean(timings) * 1000), 3),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "rss_growth_mb": round(_peak_rss_mb() - rss_before, 1),
+            **{
+                key: (usage_after[key] - usage_before[key]) // len(timings)
+                for key in ("requests", "prompt_tokens", "cached_tokens", "completion_tokens")
+            },
+        }
+        self.results[name] = result
+        print(
+            f"{name:<38} {result['p50_ms']:>9.1f} {result['p90_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+            f"{result['peak_rss_mb']:>8.1f} {result['requests']:>5} {result['prompt_tokens']:>8} "
+            f"{result['cached_tokens']:>8} {result['completion_tokens']:>7}",
+            flush=True,
+        )
+
+    def skip(self, name: str, reason: str) -> None:
+        self.results[name] = {"skipped": reason}
+        print(f"{name:<38} skipped: {reason}", flush=True)
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_ms: float) -> list[str]:
+    """Return stages whose p50 latency or prompt tokens grew by more than tolerance against the baseline."""
+    regressions = []
+    for name, base in baseline.get("stages", {}).items():
+        current = results.get(name)
+        if not current or "p50_ms" not in current or "p50_ms" not in base:
+            continue
+        limit = max(base["p50_ms"] * (1 + tolerance), base["p50_ms"] + min_ms)
+        if current["p50_ms"] > limit:
+            regressions.append(f"{name}: p50 {current['p50_ms']:.1f} ms vs baseline {base['p50_ms']:.1f} ms")
+        if current.get("prompt_tokens", 0) > base.get("prompt_tokens", 0) * (1 + tolerance):
+            regressions.append(f"{name}: {current['prompt_tokens']} prompt tokens vs baseline {base['prompt_tokens']}")
+    return regressions
+
+
+def _patch_pipeline(workdir: Path) -> Callable[[], None]:
+    """Point yt-dlp, the data directories, cache and locks of the app at the workdir."""
+    from youtube_minder.services import downloader
+    from youtube_minder.services.cache import ResultCache
+    from youtube_minder.services.workspace import DownloadWorkspace
+    from youtube_minder.utils.singleflight import SingleFlight
+    from youtube_minder.workflows import processor, sources
+
+    downloader.yt_dlp.YoutubeDL = FixtureYoutubeDL
+    sources.DATA_DIR = workdir / "data"
+    sources.DOWNLOADS_DIR = workdir / "data" / "downloads"
+    sources.TRANSCRIPTIONS_DIR = processor.TRANSCRIPTIONS_DIR = workdir / "data" / "transcriptions"
+    processor._single_flight = SingleFlight(workdir / "data" / "locks")
+
+    workspace = DownloadWorkspace(workdir / "data" / "downloads", 1 << 30, workdir / "data" / "locks")
+    state = {"cache": None}
+
+    def _fresh_state() -> None:
+        shutil.rmtree(workdir / "data", ignore_errors=True)
+        state["cache"] = ResultCache(workdir / "data" / "cache.sqlite3", 256 * 1024 * 1024)
+        downloader.get_extraction_session().clear()
+
+    processor.get_result_cache = lambda: state["cache"]
+    sources.get_download_workspace = lambda: workspace
+    _fresh_state()
+    return _fresh_state
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vtt-minutes", type=float, nargs="+", default=[5, 30, 120])
+    parser.add_argument("--mp3-seconds", type=float, nargs="+", default=[10, 60])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated API latency per request.")
+    parser.add_argument("--workdir", type=Path, default=None, help="Fixture/data directory (default: temp dir).")
+    parser.add_argument("--output", type=Path, default=None, help="Write this run's results as JSON.")
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON to check for regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p50 slowdown.")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="Ignore slowdowns smaller than this (noise).")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency=args.latency_ms / 1000).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ["OPENAI_API_KEY"] = "bench"
+    # Measure the pipeline, not the client-side rate limiter (override to benchmark it)
+    os.environ.setdefault("OPENAI_RPM_LIMIT", "1000000")
+    os.environ.setdefault("OPENAI_TPM_LIMIT", "1000000000")
+
+    from youtube_minder.services import downloader, notes, qa, summarizer
+    from youtube_minder.services.renderer import _WRAPPER_PATH, HTMLRenderer
+    from youtube_minder.services.transcriber import transcribe_openai
+    from youtube_minder.workflows import processor
+
+    tmp = None
+    workdir = args.workdir
+    if workdir is None:
+        tmp = tempfile.TemporaryDirectory(prefix="ym-bench-")
+        workdir = Path(tmp.name)
+    fixtures_dir = workdir / "fixtures"
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    reset_pipeline = _patch_pipeline(workdir)
+    harness = Harness(server, args.repeat)
+
+    print(
+        f"{'stage':<38} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'RSS MB':>8} {'reqs':>5} "
+        f"{'prompt':>8} {'cached':>8} {'compl':>7}"
+    )
+    try:
+        notes_html = None
+        for minutes in args.vtt_minutes:
+            label = f"{minutes:g}m"
+            video_id = f"vtt{int(minutes * 60):08d}"
+            vtt_path = fixtures_dir / f"{video_id}.vtt"
+            if not vtt_path.exists():
+                write_rolling_vtt(vtt_path, minutes / 60, seed=int(minutes))
+            FixtureYoutubeDL.fixtures[video_id] = {
+                "info": {"title": f"Fixture {label}", "duration": int(minutes * 60)},
+                "vtt": vtt_path,
+            }
+            url = f"https://www.youtube.com/watch?v={video_id}"
+            vtt_content = vtt_path.read_text(encoding="utf-8")
+            text = downloader._clean_vtt_text(vtt_content)
+            subs_dir = workdir / "subs"
+
+            harness.run(f"clean_vtt_text[{label}]", lambda: downloader._clean_vtt_text(vtt_content))
+            harness.run(
+                f"download_subtitles[{label}]",
+                lambda: downloader.download_subtitles(url, str(subs_dir), langs=["en"]),
+                setup=lambda: shutil.rmtree(subs_dir, ignore_errors=True),
+            )
+            harness.run(f"summarize_text[{label}]", lambda: summarizer.summarize_text(text, language="en"))
+            harness.run(
+                f"generate_notes_html[{label}]",
+                lambda: notes.generate_notes_html(text, language="en", title=f"Fixture {label}"),
+            )
+            harness.run(
+                f"follow-ups[summary+notes+qa,{label}]",
+                lambda: (
+                    summarizer.summarize_text(text, language="en"),
+                    notes.generate_notes_html(text, language="en", title=f"Fixture {label}"),
+                    qa.answer_questions(text, ["What is the main topic?"]),
+                ),
+                setup=server.clear_prompt_cache,
+            )
+            harness.run(
+                f"process_video[subs,cold,{label}]",
+                lambda: processor.process_video(url, "en", "subs"),
+                setup=reset_pipeline,
+            )
+            harness.run(f"process_video[subs,warm,{label}]", lambda: processor.process_video(url, "en", "subs"))
+            if notes_html is None:
+                notes_html = notes.generate_notes_html(text, language="en", title=f"Fixture {label}")
+
+        for seconds in args.mp3_seconds:
+            label = f"{seconds:g}s"
+            video_id = f"mp3{int(seconds):08d}"
+            mp3_path = fixtures_dir / f"{video_id}.mp3"
+            if not mp3_path.exists():
+                write_silent_mp3(mp3_path, seconds)
+            FixtureYoutubeDL.fixtures[video_id] = {
+                "info": {"title": f"Fixture {label}", "duration": int(seconds)},
+                "mp3": mp3_path,
+            }
+            harness.run(f"transcribe_openai[{label}]", lambda: transcribe_openai(str(mp3_path)))
+            if shutil.which("ffprobe"):
+                url = f"https://www.youtube.com/watch?v={video_id}"
+                harness.run(
+                    f"process_video[audio,cold,{label}]",
+                    lambda: processor.process_video(url, "en", "audio"),
+                    setup=reset_pipeline,
+                )
+            else:
+                harness.skip(f"process_video[audio,cold,{label}]", "ffprobe not found")
+
+        if notes_html is not None:
+            try:
+                cold = HTMLRenderer(_WRAPPER_PATH)
+                harness.run("HTMLRenderer.render[uncached]", lambda: cold.render(notes_html))
+                cached = HTMLRenderer(_WRAPPER_PATH, cache_dir=workdir / "pdf_cache")
+                cached.render(notes_html)
+                harness.run("HTMLRenderer.render[cached]", lambda: cached.render(notes_html))
+            except RuntimeError as exc:
+                harness.skip("HTMLRenderer.render", str(exc))
+    finally:
+        server.stop()
+        if tmp is not None:
+            tmp.cleanup()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "latency_ms": args.latency_ms,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "stages": harness.results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(harness.results, baseline, args.tolerance, args.min_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%}).", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Compare transcription engines: the OpenAI API path (segmented uploads) and the local
+faster-whisper backend. Each engine runs in a fresh subprocess so peak RSS is its own;
+reported are model load time, cold and warm wall time, real-time factor (warm wall time /
+audio duration, lower is faster) and peak RSS.
+
+Usage:
+    python benchmarks/bench_transcribe.py --input lecture.webm [--engines openai local] [--fake-api]
+
+Without --input a synthetic 16 kHz WAV (voiced tones with pauses, numpy) is generated. It
+exercises decoding and VAD but is not speech, so use a real recording for meaningful RTF.
+With --fake-api (or without OPENAI_API_KEY) the API path goes to the local fake server and
+measures only client-side overhead. The API path needs ffprobe/ffmpeg; local needs faster-whisper.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from fake_openai import FakeOpenAIServer  # noqa: E402
+
+
+SAMPLE_RATE = 16000
+
+
+def write_synthetic_wav(path: Path, seconds: float) -> None:
+    """Alternating 'syllables' (a harmonic stack with a vowel-like envelope) and short pauses."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = (np.sin(2 * np.pi * 3.0 * t) > -0.2) & (np.sin(2 * np.pi * 0.25 * t) > -0.8)
+    signal = 0.3 * voiced * syllables + 0.01 * np.random.default_rng(0).standard_normal(t.size)
+    pcm = np.clip(signal / np.max(np.abs(signal)) * 0.8 * 32767, -32768, 32767).astype("<i2")
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(SAMPLE_RATE)
+        handle.writeframes(pcm.tobytes())
+
+
+def _audio_seconds(path: Path) -> float:
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path), "rb") as handle:
+            return handle.getnframes() / handle.getframerate()
+    from youtube_minder.services.transcriber import _probe_duration
+
+    return _probe_duration(str(path))
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def run_worker(engine_name: str, input_path: Path) -> dict:
+    """Measure one engine in this process (invoked by main() in a subprocess)."""
+    from youtube_minder.services.transcriber import get_transcription_engine
+
+    engine = get_transcription_engine(engine_name)
+    started = time.perf_counter()
+    if hasattr(engine, "load"):
+        engine.load()
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    text = engine.transcribe(str(input_path))
+    cold_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    engine.transcribe(str(input_path))
+    warm_seconds = time.perf_counter() - started
+
+    duration = _audio_seconds(input_path)
+    return {
+        "engine": engine.description,
+        "load_seconds": load_seconds,
+        "cold_seconds": cold_seconds,
+        "warm_seconds": warm_seconds,
+        "rtf": warm_seconds / duration if duration else float("nan"),
+        "peak_rss_mb": _peak_rss_mb(),
+        "words": len(text.split()),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, default=None, help="Audio file (default: synthetic WAV).")
+    parser.add_argument("--seconds", type=float, default=120, help="Length of the synthetic WAV.")
+    parser.add_argument("--engines", nargs="+", default=["openai", "local"], choices=["openai", "local"])
+    parser.add_argument("--fake-api", action="store_true", help="Send API transcriptions to the local fake server.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated fake API latency per request.")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.input)))
+        return 0
+
+    tmp = tempfile.TemporaryDirectory(prefix="ym-bench-stt-")
+    input_path = args.input
+    if input_path is None:
+        input_path = Path(tmp.name) / f"synthetic_{args.seconds:g}s.wav"
+        write_synthetic_wav(input_path, args.seconds)
+        print(f"Synthetic input ({args.seconds:g}s, not speech); pass --input for meaningful RTF.", file=sys.stderr)
+
+    server = None
+    env = dict(os.environ)
+    if args.fake_api or not env.get("OPENAI_API_KEY"):
+        server = FakeOpenAIServer(latency=args.latency_ms / 1000).start()
+        env.update(OPENAI_BASE_URL=server.base_url, OPENAI_API_KEY="bench")
+        env.setdefault("OPENAI_RPM_LIMIT", "1000000")
+
+    print(f"{'engine':<44} {'load s':>7} {'cold s':>7} {'warm s':>7} {'RTF':>7} {'RSS MB':>8} {'words':>6}")
+    try:
+        for engine_name in args.engines:
+            proc = subprocess.run(
+                [sys.executable, __file__, "--worker", engine_name, "--input", str(input_path)],
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+            if proc.returncode != 0:
+                reason = (proc.stderr.strip().splitlines() or ["failed"])[-1]
+                print(f"{engine_name:<44} skipped: {reason}")
+                continue
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(
+                f"{r['engine']:<44} {r['load_seconds']:>7.2f} {r['cold_seconds']:>7.2f} {r['warm_seconds']:>7.2f} "
+                f"{r['rtf']:>7.3f} {r['peak_rss_mb']:>8.1f} {r['words']:>6}"
+            )
+    finally:
+        if server is not None:
+            server.stop()
+        tmp.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark the streaming VTT parser on synthetic YouTube-style rolling auto-captions.
+
+Usage: python benchmarks/bench_vtt.py [--hours 0.25 1 4]
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from youtube_minder.services.vtt import clean_vtt_file  # noqa: E402
+
+
+_WORDS = (
+    "the of and to in is that it for on with as this was are be at by we you "
+    "parser stream token cache model video caption summary latency request"
+).split()
+
+
+def _ts(seconds: float) -> str:
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def write_rolling_vtt(path: Path, hours: float, seed: int = 0) -> None:
+    """Write auto-caption style VTT: each line is shown twice, rolling up one line per cue."""
+    rng = random.Random(seed)
+    duration = hours * 3600
+    t = 0.0
+    previous = ""
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("WEBVTT\nKind: captions\nLanguage: en\n\n")
+        while t < duration:
+            words = [rng.choice(_WORDS) for _ in range(rng.randint(5, 9))]
+            timed = words[0] + "".join(
+                f"<{_ts(t + (i + 1) * 0.3)}><c> {w}</c>" for i, w in enumerate(words[1:])
+            )
+            handle.write(f"{_ts(t)} --> {_ts(t + 2)} align:start position:0%\n{previous}\n{timed}\n\n")
+            previous = " ".join(words)
+            handle.write(f"{_ts(t + 2)} --> {_ts(t + 2.01)} align:start position:0%\n{previous}\n \n\n")
+            t += 2.01
+
+
+def bench(path: Path, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = clean_vtt_file(path)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    clean_vtt_file(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = path.stat().st_size
+    return {
+        "input_bytes": size,
+        "output_chars": len(text),
+        "best_seconds": min(timings),
+        "mb_per_second": size / 1e6 / min(timings),
+        "peak_mem_mb": peak / 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, nargs="+", default=[0.25, 1.0, 4.0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workdir", type=Path, default=Path("data/bench"))
+    args = parser.parse_args()
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    print(f"{'hours':>6} {'input MB':>9} {'output MB':>10} {'ratio':>6} {'best s':>8} {'MB/s':>7} {'peak MB':>8}")
+    for hours in args.hours:
+        path = args.workdir / f"rolling_{hours:g}h.vtt"
+        if not path.exists():
+            write_rolling_vtt(path, hours)
+        r = bench(path, args.repeat)
+        print(
+            f"{hours:>6g} {r['input_bytes'] / 1e6:>9.2f} {r['output_chars'] / 1e6:>10.2f} "
+            f"{r['input_bytes'] / max(r['output_chars'], 1):>6.1f} {r['best_seconds']:>8.3f} "
+            f"{r['mb_per_second']:>7.1f} {r['peak_mem_mb']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Offline stand-in for the OpenAI HTTP API used by the benchmarks.
+
+Serves chat completions (plain and streamed), audio transcriptions and embeddings with
+deterministic bodies sized from the request, and counts requests and tokens so the
+harness can attribute usage to each pipeline stage. Chat prompts go through a simulated
+prefix cache (like OpenAI's: prefixes of 1024+ tokens in 128-token steps), reported as
+usage.prompt_tokens_details.cached_tokens.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+_WORDS = (
+    "the model summary transcript video section point detail cache latency stream "
+    "request token parser caption speaker topic example result"
+).split()
+
+
+_CACHE_MIN_CHARS = 1024 * 4
+_CACHE_STEP_CHARS = 128 * 4
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _filler(n_words: int, seed: str) -> str:
+    offset = int(hashlib.sha256(seed.encode("utf-8")).hexdigest()[:8], 16)
+    return " ".join(_WORDS[(offset + i) % len(_WORDS)] for i in range(n_words))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, delayed ACKs add ~40 ms per call
+    disable_nagle_algorithm = True
+    server: "FakeOpenAIServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("x-request-id", f"req_{time.monotonic_ns()}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload: dict) -> None:
+        self._send(200, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def do_POST(self):
+        body = self._read_body()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/chat/completions"):
+            self._chat(json.loads(body or b"{}"))
+        elif path.endswith("/audio/transcriptions"):
+            self._transcription(body)
+        elif path.endswith("/embeddings"):
+            self._embeddings(json.loads(body or b"{}"))
+        else:
+            self._send(404, b'{"error": {"message": "not found"}}', "application/json")
+
+    def _chat(self, request: dict) -> None:
+        prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+        prompt_tokens = _tokens(prompt)
+        cached_tokens = self.server.cached_prefix_tokens(prompt)
+        content = _filler(min(40 + prompt_tokens // 20, 400), prompt[-200:])
+        if "html" in prompt.casefold():
+            content = f"<h2>Notes</h2>\n<p>{content}</p>"
+        completion_tokens = _tokens(content)
+        self.server.record(prompt_tokens, completion_tokens, cached_tokens)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        base = {"id": "chatcmpl-bench", "created": int(time.time()), "model": request.get("model", "")}
+
+        if not request.get("stream"):
+            self._send_json(
+                {
+                    **base,
+                    "object": "chat.completion",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                }
+            )
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        words = content.split(" ")
+        for start in range(0, len(words), 8):
+            piece = " ".join(words[start:start + 8]) + (" " if start + 8 < len(words) else "")
+            chunk = {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        final = {
+            **base,
+            "object": "chat.completion.chunk",
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        if (request.get("stream_options") or {}).get("include_usage"):
+            final["usage"] = usage
+        self.wfile.write(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+    def _transcription(self, body: bytes) -> None:
+        # Roughly 2.5 spoken words per second of 128 kbps audio
+        seconds = len(body) / 16000
+        text = _filler(max(1, int(seconds * 2.5)), str(len(body)))
+        self.server.record(0, _tokens(text))
+        if b'name="response_format"\r\n\r\ntext' in body:
+            self._send(200, text.encode("utf-8"), "text/plain; charset=utf-8")
+        else:
+            self._send_json({"text": text})
+
+    def _embeddings(self, request: dict) -> None:
+        inputs = request.get("input") or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        data = []
+        for idx, text in enumerate(inputs):
+            digest = hashlib.sha256(str(text).encode("utf-8")).digest()
+            data.append({"object": "embedding", "index": idx, "embedding": [b / 255 - 0.5 for b in digest * 2]})
+        prompt_tokens = sum(_tokens(str(t)) for t in inputs)
+        self.server.record(prompt_tokens, 0)
+        self._send_json(
+            {
+                "object": "list",
+                "data": data,
+                "model": request.get("model", ""),
+                "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+            }
+        )
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Threaded local server; point the SDK at base_url (e.g. via OPENAI_BASE_URL)."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._usage = {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+        self._prefixes: set[str] = set()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def record(self, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> None:
+        with self._lock:
+            self._usage["requests"] += 1
+            self._usage["prompt_tokens"] += prompt_tokens
+            self._usage["cached_tokens"] += cached_tokens
+            self._usage["completion_tokens"] += completion_tokens
+
+    def cached_prefix_tokens(self, prompt: str) -> int:
+        """Tokens of the longest prefix of prompt seen before; remembers the prompt's prefixes."""
+        cached = 0
+        digests = [
+            hashlib.sha1(prompt[:size].encode("utf-8")).hexdigest()
+            for size in range(_CACHE_MIN_CHARS, len(prompt) + 1, _CACHE_STEP_CHARS)
+        ]
+        with self._lock:
+            for idx, digest in enumerate(digests):
+                if digest in self._prefixes:
+                    cached = (_CACHE_MIN_CHARS + idx * _CACHE_STEP_CHARS) // 4
+            self._prefixes.update(digests)
+        return cached
+
+    def clear_prompt_cache(self) -> None:
+        with self._lock:
+            self._prefixes.clear()
+
+    def usage(self) -> dict:
+        with self._lock:
+            return dict(self._usage)
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
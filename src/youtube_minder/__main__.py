@@ -0,0 +1,6 @@
+import sys
+
+from youtube_minder.cli import main
+
+
+sys.exit(main())
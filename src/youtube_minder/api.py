@@ -0,0 +1,165 @@
+"""
+Headless HTTP API on the standard library: process_video, notes, Q&A and PDF rendering as
+JSON endpoints. Workflow modules (and with them yt-dlp, openai and WeasyPrint) are imported
+on the first request that needs them, so the server starts in a fraction of a second.
+
+    GET  /health
+    GET  /metrics                      Prometheus text format
+    POST /process  {"url", "language", "method"}
+    POST /notes    {"url", "language", "method"}
+    POST /qa       {"url", "language", "method", "questions": [...]}
+    POST /pdf      {"url", "language", "method"}  -> application/pdf
+
+POST bodies may also set "engine" ("openai" or "local") for audio transcription.
+"""
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from youtube_minder.utils.metrics import get_metrics_registry
+
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class BadRequest(ValueError):
+    """Invalid request parameters (HTTP 400)."""
+
+
+def result_to_dict(result) -> dict:
+    return {
+        "summary": result.summary,
+        "transcription_text": result.transcription_text,
+        "transcription_path": str(result.transcription_path),
+        "display_filename": result.display_filename,
+        "is_subtitle": result.is_subtitle,
+        "used_cache": result.used_cache,
+        "summary_is_fallback": result.summary_is_fallback,
+        "video_info": result.video_info,
+    }
+
+
+def _process(params: dict, stages: list[dict]):
+    from youtube_minder.workflows import processor
+
+    url = params.get("url")
+    language = params.get("language", "en")
+    method = params.get("method", "subs")
+    if not isinstance(url, str) or not url:
+        raise BadRequest("Missing YouTube URL.")
+    if method not in ("subs", "audio"):
+        raise BadRequest("method must be 'subs' or 'audio'.")
+    if not isinstance(language, str) or not language:
+        raise BadRequest("language must be a language code such as 'en'.")
+    if params.get("engine") not in (None, "openai", "local"):
+        raise BadRequest("engine must be 'openai' or 'local'.")
+    return processor.process_video(
+        url,
+        language,
+        method,
+        on_event=lambda event: stages.append(event.as_dict()),
+        engine=params.get("engine"),
+    )
+
+
+def handle_process(params: dict) -> dict:
+    stages: list[dict] = []
+    result = _process(params, stages)
+    return {**result_to_dict(result), "stages": stages}
+
+
+def handle_notes(params: dict) -> dict:
+    from youtube_minder.workflows import processor
+
+    stages: list[dict] = []
+    result = _process(params, stages)
+    html = processor.generate_video_notes(
+        result, params.get("language", "en"), on_event=lambda event: stages.append(event.as_dict())
+    )
+    return {"video_info": result.video_info, "html": html, "stages": stages}
+
+
+def handle_qa(params: dict) -> dict:
+    from youtube_minder.workflows import processor
+
+    questions = params.get("questions")
+    if not isinstance(questions, list) or not questions or not all(isinstance(q, str) and q for q in questions):
+        raise BadRequest("questions must be a non-empty list of strings.")
+    stages: list[dict] = []
+    result = _process(params, stages)
+    answers = processor.answer_video_questions(
+        result, questions, on_event=lambda event: stages.append(event.as_dict())
+    )
+    return {"video_info": result.video_info, "answers": answers, "stages": stages}
+
+
+def handle_pdf(params: dict) -> bytes:
+    from youtube_minder.services.renderer import get_notes_renderer
+
+    return get_notes_renderer().render(handle_notes(params)["html"])
+
+
+ROUTES: dict[str, Callable[[dict], dict | bytes]] = {
+    "/process": handle_process,
+    "/notes": handle_notes,
+    "/qa": handle_qa,
+    "/pdf": handle_pdf,
+}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "youtube-minder"
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/metrics":
+            body = get_metrics_registry().render().encode("utf-8")
+            self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send_json(404, {"error": "Not found."})
+
+    def do_POST(self):
+        route = ROUTES.get(self.path.split("?", 1)[0])
+        if route is None:
+            self._send_json(404, {"error": "Not found."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                raise BadRequest("Request body too large.")
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                raise BadRequest("Request body must be a JSON object.")
+            payload = route(params)
+        except (BadRequest, json.JSONDecodeError) as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        except Exception as exc:
+            from youtube_minder.workflows.processor import ProcessingError
+
+            status = 422 if isinstance(exc, ProcessingError) else 500
+            self._send_json(status, {"error": str(exc) or exc.__class__.__name__})
+            return
+
+        if isinstance(payload, bytes):
+            self._send(200, payload, "application/pdf")
+        else:
+            self._send_json(200, payload)
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
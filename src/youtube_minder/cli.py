@@ -0,0 +1,102 @@
+"""
+`youtube-minder` console script: summarize a video (optionally with notes, a PDF and
+answers), run a batch, or serve the HTTP API, without loading Streamlit. Workflow modules
+are imported only by the command that needs them.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from youtube_minder.config import API_HOST, API_PORT
+
+
+def _print_status(message: str, level: str) -> None:
+    print(f"[{level}] {message}", file=sys.stderr)
+
+
+def _summarize(args: argparse.Namespace) -> int:
+    from youtube_minder.api import result_to_dict
+    from youtube_minder.workflows import processor
+
+    try:
+        result = processor.process_video(
+            args.url, args.language, args.method, on_update=_print_status, engine=args.engine
+        )
+        notes_html = None
+        if args.notes or args.pdf:
+            notes_html = processor.generate_video_notes(result, args.language)
+        if args.notes:
+            Path(args.notes).write_text(notes_html, encoding="utf-8")
+        if args.pdf:
+            from youtube_minder.services.renderer import get_notes_renderer
+
+            Path(args.pdf).write_bytes(get_notes_renderer().render(notes_html))
+        answers = processor.answer_video_questions(result, args.ask) if args.ask else None
+    except (processor.ProcessingError, RuntimeError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps({**result_to_dict(result), "answers": answers}, ensure_ascii=False, indent=2))
+        return 0
+    print(result.summary)
+    if answers:
+        print(f"\n{answers}")
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from youtube_minder.api import create_server
+
+    server = create_server(args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"Serving youtube-minder API on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="youtube-minder", description="Summarize YouTube videos.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summarize = commands.add_parser("summarize", help="Summarize one video.")
+    summarize.add_argument("url")
+    summarize.add_argument("--language", choices=["en", "ru"], default="en")
+    summarize.add_argument("--method", choices=["subs", "audio"], default="subs")
+    summarize.add_argument(
+        "--engine", choices=["openai", "local"], default=None, help="Speech-to-text backend for --method audio."
+    )
+    summarize.add_argument("--notes", metavar="PATH", help="Also write HTML notes to PATH.")
+    summarize.add_argument("--pdf", metavar="PATH", help="Also render the notes to a PDF at PATH.")
+    summarize.add_argument("--ask", metavar="QUESTION", action="append", help="Answer a question (repeatable).")
+    summarize.add_argument("--json", action="store_true", help="Print the full result as JSON.")
+    summarize.set_defaults(handler=_summarize)
+
+    # Listed for --help only; main() hands its arguments to the batch parser untouched
+    commands.add_parser("batch", add_help=False, help="Summarize many videos (see `youtube-minder batch --help`).")
+
+    serve = commands.add_parser("serve", help="Run the HTTP API.")
+    serve.add_argument("--host", default=API_HOST)
+    serve.add_argument("--port", type=int, default=API_PORT)
+    serve.set_defaults(handler=_serve)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["batch"]:
+        from youtube_minder.workflows import batch
+
+        return batch.main(argv[1:])
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
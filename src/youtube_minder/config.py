@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -9,3 +10,39 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_DIR = BASE_DIR / "data"
 DOWNLOADS_DIR = DATA_DIR / "downloads"
 TRANSCRIPTIONS_DIR = DATA_DIR / "transcriptions"
+LOCKS_DIR = DATA_DIR / "locks"
+
+# Per-video download directories are kept for retries, evicting least recently used beyond this size
+DOWNLOADS_MAX_BYTES = int(os.getenv("DOWNLOADS_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+
+# Subtitle languages fetched together in one pass (plus the summary language), so that
+# switching the summary language is served from the per-language transcript cache
+SUBTITLE_LANGS = [lang.strip() for lang in os.getenv("SUBTITLE_LANGS", "en,ru").split(",") if lang.strip()]
+
+# Result cache for summaries, notes and Q&A answers
+CACHE_DB_PATH = DATA_DIR / "cache.sqlite3"
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Rendered notes PDFs, keyed by a hash of the HTML
+PDF_CACHE_DIR = DATA_DIR / "pdf_cache"
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Longest video (seconds) accepted for audio transcription; long audio is transcribed in segments
+AUDIO_MAX_DURATION = int(os.getenv("AUDIO_MAX_DURATION", "10800"))
+
+# Background processing jobs
+JOBS_DB_PATH = DATA_DIR / "jobs.sqlite3"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "3600"))
+
+# Speculative subtitle (or short-video audio) fetch started when the UI fetches video info;
+# unclaimed prefetches are unpinned after the TTL so their downloads can be evicted
+PREFETCH_TTL_SECONDS = int(os.getenv("PREFETCH_TTL_SECONDS", "600"))
+PREFETCH_AUDIO_MAX_DURATION = int(os.getenv("PREFETCH_AUDIO_MAX_DURATION", "900"))
+
+# Prometheus-style metrics endpoint (GET /metrics) started by the UI; 0 disables it
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Headless HTTP API (`youtube-minder serve`)
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", "8000"))
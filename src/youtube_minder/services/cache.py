@@ -0,0 +1,142 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from youtube_minder.config import CACHE_DB_PATH, CACHE_MAX_BYTES
+from youtube_minder.utils.hashing import get_sha256_hash
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    language TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at);
+CREATE INDEX IF NOT EXISTS results_video_id ON results (video_id);
+"""
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    video_id: str
+    stage: str
+    language: str
+    model: str
+    prompt_hash: str
+    input_hash: str = ""
+
+    @property
+    def digest(self) -> str:
+        return get_sha256_hash(
+            "\x1f".join([self.video_id, self.stage, self.language, self.model, self.prompt_hash, self.input_hash])
+        )
+
+
+class ResultCache:
+    """
+    Content-addressed cache for LLM outputs (summaries, notes, answers), stored in SQLite
+    with size-based LRU eviction.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int) -> None:
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._initialized = True
+        return conn
+
+    def get(self, key: CacheKey) -> str | None:
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute("SELECT value FROM results WHERE key = ?", (key.digest,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key.digest))
+            return row[0]
+        finally:
+            conn.close()
+
+    def set(self, key: CacheKey, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results "
+                    "(key, video_id, stage, language, model, prompt_hash, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key.digest,
+                        key.video_id,
+                        key.stage,
+                        key.language,
+                        key.model,
+                        key.prompt_hash,
+                        value,
+                        size,
+                        now,
+                        now,
+                    ),
+                )
+                self._evict(conn)
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM results ORDER BY accessed_at ASC").fetchall()
+        for cache_key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM results WHERE key = ?", (cache_key,))
+            total -= size
+
+    def get_or_compute(self, key: CacheKey, compute: Callable[[], str]) -> tuple[str, bool]:
+        """
+        Return (value, from_cache). Empty results are not stored.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        value = compute()
+        if value:
+            self.set(key, value)
+        return value, False
+
+
+_default_cache: ResultCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide cache stored in DATA_DIR."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(CACHE_DB_PATH, CACHE_MAX_BYTES)
+        return _default_cache
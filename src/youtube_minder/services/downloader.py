@@ -1,20 +1,26 @@
 import yt_dlp
+import copy
 import os
+import threading
 import time
 import re
-import html
 import shutil
+import subprocess
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 
+from youtube_minder.services.vtt import clean_vtt_file, clean_vtt_lines
+from youtube_minder.utils.metrics import current_stage
+
 try:
     import yt_dlp_ejs  # type: ignore
 except Exception:
     yt_dlp_ejs = None
 
-_VTT_TIMESTAMP_RE = re.compile(r"^\d{2}:\d{2}:\d{2}\.\d{3}\s+-->\s+\d{2}:\d{2}:\d{2}\.\d{3}")
-_VTT_METADATA_PREFIXES = ("Kind:", "Language:")
 _ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
 _FALLBACK_PLAYER_CLIENTS_403 = [["android"], ["android", "web"]]
+_VIDEO_ID_RE = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/|/v/)([A-Za-z0-9_-]{11})")
 
 
 def _strip_ansi(text: str) -> str:
@@ -47,69 +53,108 @@ def _with_player_clients(ydl_opts: dict, player_clients: list[str]) -> dict:
     return ydl_opts_retry
 
 
-def _clean_vtt_text(vtt_content: str) -> str:
+def extract_video_id(youtube_url: str) -> str | None:
     """
-    Strip WEBVTT headers, timestamps, and tags; return plain text.
+    Parse the 11-char video id from common YouTube URL forms without network access.
     """
-    lines = vtt_content.splitlines()
-    cleaned_lines: list[str] = []
-    skip_block = False
-    last_non_empty_norm = None
-
-    for line in lines:
-        raw = line.strip()
-
-        if not raw:
-            if skip_block:
-                skip_block = False
-                continue
-            # Keep paragraph breaks minimal
-            if cleaned_lines and cleaned_lines[-1]:
-                cleaned_lines.append("")
-            continue
-
-        # Skip WEBVTT header and metadata
-        if raw.upper().startswith("WEBVTT"):
-            continue
-        if raw.startswith(_VTT_METADATA_PREFIXES):
-            continue
-
-        # Skip NOTE/STYLE/REGION blocks
-        if raw.startswith("NOTE") or raw.startswith("STYLE") or raw.startswith("REGION"):
-            skip_block = True
-            continue
-
-        if skip_block:
-            # End block on empty line (handled above)
-            continue
+    match = _VIDEO_ID_RE.search(youtube_url or "")
+    return match.group(1) if match else None
 
-        # Skip cue timing lines
-        if _VTT_TIMESTAMP_RE.match(raw):
-            continue
 
-        # Skip cue identifiers (usually numeric)
-        if raw.isdigit():
-            continue
+class ExtractionSession:
+    """
+    Cache of extracted info dicts per video id (with TTL, at most max_entries, least recently
+    used dropped first) plus the player client that last got past a 403, so downloads can
+    skip re-extracting the page and player.
+    """
 
-        # Remove tags and unescape HTML entities
-        text = re.sub(r"<[^>]+>", "", raw)
-        text = html.unescape(text).strip()
+    def __init__(self, ttl_seconds: float, max_entries: int = 256) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._url_ids: dict[str, str] = {}
+        self._player_clients: list[str] | None = None
+
+    def _video_id(self, youtube_url: str) -> str | None:
+        return extract_video_id(youtube_url) or self._url_ids.get(youtube_url)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at > self.ttl_seconds
+
+    def _remove(self, video_ids: set[str]) -> None:
+        if not video_ids:
+            return
+        for video_id in video_ids:
+            self._entries.pop(video_id, None)
+        self._url_ids = {url: vid for url, vid in self._url_ids.items() if vid not in video_ids}
+
+    def get(self, youtube_url: str) -> dict | None:
+        with self._lock:
+            video_id = self._video_id(youtube_url)
+            entry = self._entries.get(video_id) if video_id else None
+            if entry is None:
+                return None
+            stored_at, info = entry
+            if self._expired(stored_at, time.monotonic()):
+                self._remove({video_id})
+                return None
+            self._entries.move_to_end(video_id)
+            return copy.deepcopy(info)
+
+    def store(self, youtube_url: str, info: dict) -> None:
+        video_id = info.get("id")
+        if not video_id or info.get("_type", "video") != "video":
+            return
+        sanitized = yt_dlp.YoutubeDL.sanitize_info(copy.deepcopy(info), remove_private_keys=True)
+        with self._lock:
+            now = time.monotonic()
+            self._entries[video_id] = (now, sanitized)
+            self._entries.move_to_end(video_id)
+            self._url_ids[youtube_url] = video_id
+            self._remove({vid for vid, (stored_at, _) in self._entries.items() if self._expired(stored_at, now)})
+            if len(self._entries) > self.max_entries:
+                self._remove(set(list(self._entries)[: len(self._entries) - self.max_entries]))
+
+    def invalidate(self, youtube_url: str) -> None:
+        with self._lock:
+            video_id = self._video_id(youtube_url)
+            if video_id:
+                self._remove({video_id})
+
+    def remember_player_clients(self, player_clients: list[str]) -> None:
+        with self._lock:
+            self._player_clients = list(player_clients)
+
+    def with_player_clients(self, ydl_opts: dict) -> dict:
+        with self._lock:
+            player_clients = self._player_clients
+        if player_clients and not _has_explicit_player_client(ydl_opts):
+            return _with_player_clients(ydl_opts, player_clients)
+        return ydl_opts
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._url_ids.clear()
+            self._player_clients = None
+
+
+_session = ExtractionSession(
+    ttl_seconds=float(os.getenv("YTDLP_INFO_TTL", "1800")),
+    max_entries=int(os.getenv("YTDLP_INFO_MAX_ENTRIES", "256")),
+)
+
+
+def get_extraction_session() -> ExtractionSession:
+    return _session
 
-        if text:
-            norm = " ".join(text.split())
-            if norm == last_non_empty_norm:
-                continue
-            last_non_empty_norm = norm
-            cleaned_lines.append(text)
 
-    # Collapse multiple blank lines
-    output_lines: list[str] = []
-    for line in cleaned_lines:
-        if line == "" and (not output_lines or output_lines[-1] == ""):
-            continue
-        output_lines.append(line)
-
-    return "\n".join(output_lines).strip()
+def _clean_vtt_text(vtt_content: str) -> str:
+    """
+    Strip WEBVTT headers, timestamps, and tags; return plain text.
+    """
+    return clean_vtt_lines(vtt_content.splitlines())
 
 
 def _parse_cookies_from_browser_spec(raw: str) -> tuple[str, ...]:
@@ -171,76 +216,250 @@ def _apply_ytdlp_auth_and_extractor_opts(ydl_opts: dict) -> None:
         ydl_opts["remote_components"] = ["ejs:github"]
 
 
+def _apply_metrics_hooks(ydl_opts: dict) -> None:
+    """
+    Report downloaded bytes and ffmpeg post-processing time to the current metrics stage.
+    """
+    event = current_stage()
+    if event is None:
+        return
+    convert_started: dict[str, float] = {}
+
+    def _on_progress(status: dict) -> None:
+        if status.get("status") == "finished":
+            event.add(bytes_downloaded=int(status.get("total_bytes") or status.get("downloaded_bytes") or 0))
+
+    def _on_postprocess(status: dict) -> None:
+        name = status.get("postprocessor") or ""
+        if status.get("status") == "started":
+            convert_started[name] = time.monotonic()
+        elif status.get("status") == "finished" and name in convert_started:
+            event.add(convert_seconds=time.monotonic() - convert_started.pop(name))
+
+    ydl_opts["progress_hooks"] = [_on_progress]
+    ydl_opts["postprocessor_hooks"] = [_on_postprocess]
+
+
 def _extract_info_with_fallback(youtube_url: str, ydl_opts: dict, download: bool):
     """
-    Try extraction; on FormatNotAvailable, retry without extractor_args.
+    Try extraction; on HTTP 403 retry with fallback player clients, on FormatNotAvailable
+    retry without extractor_args. Metadata-only results are kept in the extraction session.
     """
+    first_opts = _session.with_player_clients(ydl_opts)
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            return ydl.extract_info(youtube_url, download=download)
+        with yt_dlp.YoutubeDL(first_opts) as ydl:
+            info = ydl.extract_info(youtube_url, download=download)
     except Exception as e:
         message = _strip_ansi(str(e))
+        info = None
         if "HTTP Error 403" in message and not _has_explicit_player_client(ydl_opts):
             last_exc = None
             for player_clients in _FALLBACK_PLAYER_CLIENTS_403:
                 try:
                     ydl_opts_retry = _with_player_clients(ydl_opts, player_clients)
                     with yt_dlp.YoutubeDL(ydl_opts_retry) as ydl:
-                        return ydl.extract_info(youtube_url, download=download)
+                        info = ydl.extract_info(youtube_url, download=download)
+                    _session.remember_player_clients(player_clients)
+                    break
                 except Exception as retry_exc:
                     last_exc = retry_exc
-            if last_exc is not None:
+            if info is None and last_exc is not None:
                 raise last_exc
-        if "Requested format is not available" in message and "extractor_args" in ydl_opts:
-            ydl_opts_fallback = dict(ydl_opts)
+        elif "Requested format is not available" in message and "extractor_args" in first_opts:
+            ydl_opts_fallback = dict(first_opts)
             ydl_opts_fallback.pop("extractor_args", None)
             with yt_dlp.YoutubeDL(ydl_opts_fallback) as ydl:
-                return ydl.extract_info(youtube_url, download=download)
-        raise
+                info = ydl.extract_info(youtube_url, download=download)
+        if info is None:
+            raise
+
+    if not download and info:
+        _session.store(youtube_url, info)
+    return info
+
+
+def _extract_or_reuse(youtube_url: str, ydl_opts: dict, download: bool):
+    """
+    Run a download from the session's cached info dict when available (no page or
+    player re-extraction); otherwise extract as usual.
+    """
+    cached_info = _session.get(youtube_url)
+    if cached_info is not None:
+        try:
+            with yt_dlp.YoutubeDL(_session.with_player_clients(ydl_opts)) as ydl:
+                return ydl.process_ie_result(cached_info, download=download)
+        except Exception as e:
+            if "HTTP Error 429" in _strip_ansi(str(e)):
+                raise
+            # Stale stream URLs or a player change: drop the entry and extract again
+            _session.invalidate(youtube_url)
+    return _extract_info_with_fallback(youtube_url, ydl_opts, download=download)
+
+
+# Containers the transcription API accepts as uploaded
+TRANSCRIBABLE_EXTENSIONS = (".webm", ".m4a", ".mp3", ".mp4", ".mpeg", ".mpga", ".ogg", ".oga", ".wav", ".flac")
+# Smallest speech-quality audio-only stream first: ~50-70 kbps opus (webm), then 48 kbps AAC (m4a)
+_NATIVE_AUDIO_FORMAT = (
+    "bestaudio[ext=webm][abr<=?80]/bestaudio[ext=m4a][abr<=?80]"
+    "/worstaudio[ext=webm]/worstaudio[ext=m4a]/bestaudio/best"
+)
+_REMUX_EXTENSIONS = {"opus": ".webm", "vorbis": ".webm", "mp4a": ".m4a", "aac": ".m4a", "mp3": ".mp3"}
+
+
+def _run_ffmpeg(args: list[str]) -> None:
+    subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def remux_audio(source: Path, target: Path) -> None:
+    """Copy the audio stream into another container without re-encoding."""
+    _run_ffmpeg(["-i", str(source), "-vn", "-c:a", "copy", str(target)])
+
+
+def downsample_audio(source: Path, target: Path) -> None:
+    """Re-encode to 16 kHz mono, enough for speech recognition and small to upload."""
+    _run_ffmpeg(["-i", str(source), "-vn", "-ac", "1", "-ar", "16000", "-b:a", "32k", str(target)])
+
+
+# Files that share "<id>." with the media in a video's directory: subtitles, metadata, partials
+_NON_MEDIA_SUFFIXES = (".part", ".ytdl", ".vtt", ".srt", ".srv1", ".srv2", ".srv3", ".ttml", ".json3", ".json", ".txt")
+
+
+def _downloaded_media(output_dir: Path, info: dict) -> Path | None:
+    """
+    The media file yt-dlp wrote for info. Subtitle tracks are saved in the same directory
+    under the same "<id>." prefix, so the recorded filepath is preferred over a glob.
+    """
+    for requested in info.get("requested_downloads") or []:
+        filepath = requested.get("filepath")
+        if filepath and Path(filepath).is_file():
+            return Path(filepath)
+    downloads = sorted(
+        p
+        for p in output_dir.glob(f"{info.get('id')}.*")
+        if p.suffix.lower() not in _NON_MEDIA_SUFFIXES and ".temp." not in p.name
+    )
+    return downloads[0] if downloads else None
+
+
+def _ensure_transcribable(output_dir: Path, info: dict) -> Path | None:
+    """
+    Leave the downloaded stream as-is when the API accepts its container; otherwise remux
+    its audio into an accepted container, or downsample it to 16 kHz mono mp3 as a last resort.
+    """
+    path = _downloaded_media(output_dir, info)
+    if path is None:
+        return None
+    has_video = info.get("vcodec") not in (None, "none")
+    if path.suffix.lower() in TRANSCRIBABLE_EXTENSIONS and not has_video:
+        return path
+
+    started = time.monotonic()
+    codec = (info.get("acodec") or "").split(".")[0].lower()
+    target = None
+    if codec in _REMUX_EXTENSIONS:
+        target = path.with_name(f"{path.stem}.audio{_REMUX_EXTENSIONS[codec]}")
+        try:
+            remux_audio(path, target)
+        except subprocess.CalledProcessError:
+            target.unlink(missing_ok=True)
+            target = None
+    if target is None:
+        target = path.with_name(f"{path.stem}.audio.mp3")
+        downsample_audio(path, target)
+    path.unlink(missing_ok=True)
+
+    event = current_stage()
+    if event is not None:
+        event.add(convert_seconds=time.monotonic() - started)
+    return target
+
+
+def find_audio_file(output_path: str, video_id: str) -> Path | None:
+    """
+    Return a finished, transcribable audio download for video_id in output_path, if any.
+    Partial (.part) downloads and ffmpeg temp files do not count.
+    """
+    candidates = sorted(
+        p
+        for p in Path(output_path).glob(f"{video_id}.*")
+        if p.suffix.lower() in TRANSCRIBABLE_EXTENSIONS and ".temp." not in p.name
+    )
+    # A converted "<id>.audio.<ext>" supersedes the download it was made from
+    converted = [p for p in candidates if p.name.startswith(f"{video_id}.audio.")]
+    return (converted or candidates or [None])[0]
 
 
 def download_audio(youtube_url: str, output_path: str) -> None:
     """
-    Downloads audio from YouTube and saves it as mp3.
+    Downloads the audio track for transcription into output_path.
+
+    With AUDIO_DOWNLOAD_MODE=native (default) the smallest speech-quality audio-only
+    stream is saved as-is and only remuxed or downsampled when the transcription API
+    would not accept it. AUDIO_DOWNLOAD_MODE=mp3 re-encodes bestaudio to 64 kbps mp3.
 
     :param youtube_url: YouTube video URL
-    :param output_path: directory to save the mp3
+    :param output_path: directory to save the audio file
     """
     output_dir = Path(output_path)
     output_dir.mkdir(parents=True, exist_ok=True)
+    native = os.getenv("AUDIO_DOWNLOAD_MODE", "native") != "mp3"
 
-    # Save as "<id>.mp3" in output_path (more stable and filesystem-safe)
+    # Save as "<id>.<ext>" in output_path (more stable and filesystem-safe)
     outtmpl = str(output_dir / "%(id)s.%(ext)s")
 
     ydl_opts = {
-        "format": "bestaudio/best",
+        "format": _NATIVE_AUDIO_FORMAT if native else "bestaudio/best",
         "outtmpl": outtmpl,
         "noplaylist": True,
         "restrictfilenames": True,
         "ignoreconfig": True,
-        "postprocessors": [
+        # Resume a .part file left by an interrupted run instead of starting over
+        "continuedl": True,
+    }
+    if not native:
+        ydl_opts["postprocessors"] = [
             {
                 "key": "FFmpegExtractAudio",
                 "preferredcodec": "mp3",
                 "preferredquality": "64",
             }
-        ],
-    }
+        ]
 
     _apply_ytdlp_auth_and_extractor_opts(ydl_opts)
+    _apply_metrics_hooks(ydl_opts)
 
-    # yt-dlp downloads and converts to mp3 (ffmpeg must be in PATH)
+    # ffmpeg must be in PATH for the mp3 mode and for remuxing/downsampling fallbacks
     try:
-        info = _extract_info_with_fallback(youtube_url, ydl_opts, download=True)
+        info = _extract_or_reuse(youtube_url, ydl_opts, download=True)
+        if native:
+            _ensure_transcribable(output_dir, info)
     except Exception as exc:
         raise RuntimeError(_format_ytdlp_error_message(exc)) from exc
     return info.get("title", "Unknown Title")
 
 
+def _video_info_fields(info: dict, youtube_url: str) -> dict:
+    return {
+        "title": info.get("title", "Unknown Title"),
+        "duration": info.get("duration", 0),
+        "id": info.get("id", "UnknownID"),
+        "webpage_url": info.get("webpage_url", youtube_url),
+    }
+
+
 def get_video_info(youtube_url: str) -> dict:
     """
     Retrieves video information (title, duration, id).
+    Reuses the extraction session's cached info when it is still fresh.
     """
+    cached_info = _session.get(youtube_url)
+    if cached_info is not None:
+        return _video_info_fields(cached_info, youtube_url)
+
     ydl_opts = {
         "quiet": True,
         "no_warnings": True,
@@ -262,27 +481,29 @@ def get_video_info(youtube_url: str) -> dict:
                 raise RuntimeError(_format_ytdlp_error_message(exc)) from exc
         else:
             raise RuntimeError(_format_ytdlp_error_message(e)) from e
-    return {
-        "title": info.get("title", "Unknown Title"),
-        "duration": info.get("duration", 0),
-        "id": info.get("id", "UnknownID"),
-        "webpage_url": info.get("webpage_url", youtube_url),
-    }
+    return _video_info_fields(info, youtube_url)
 
 
-def download_subtitles(youtube_url: str, output_dir: str, langs: list[str] | None = None) -> str:
+@dataclass(frozen=True)
+class SubtitleTrack:
+    lang: str
+    kind: str  # "manual" or "auto"
+    text: str
+
+
+def download_subtitle_tracks(youtube_url: str, output_dir: str, langs: list[str]) -> list[SubtitleTrack]:
     """
-    Downloads subtitles (auto or manual) and returns the content as text.
-    Returns None if no subtitles found.
+    Download every available track among langs (manual or automatic) in one extraction and
+    return them as clean text, in langs order. yt-dlp picks the manual track of a language
+    over its automatic captions.
     """
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    subtitles_langs = langs or ["en", "ru"]
     ydl_opts = {
         "skip_download": True,
         "writesubtitles": True,
         "writeautomaticsub": True,
-        "subtitleslangs": subtitles_langs,
+        "subtitleslangs": list(langs),
         "subtitlesformat": "vtt",
         "outtmpl": str(Path(output_dir) / "%(id)s"),
         "quiet": True,
@@ -292,24 +513,16 @@ def download_subtitles(youtube_url: str, output_dir: str, langs: list[str] | Non
     }
 
     _apply_ytdlp_auth_and_extractor_opts(ydl_opts)
+    _apply_metrics_hooks(ydl_opts)
 
     max_attempts = min(int(os.getenv("SUBS_RETRY_ATTEMPTS", "3")), 3)
     base_sleep = float(os.getenv("SUBS_RETRY_BASE_SLEEP", "5"))
 
+    info = None
     for attempt in range(1, max_attempts + 1):
         try:
-            info = _extract_info_with_fallback(youtube_url, ydl_opts, download=True)
-
-            # Find the downloaded subtitle file
-            # yt-dlp names it like {id}.en.vtt or {id}.ru.vtt
-            video_id = info.get("id")
-            for lang in subtitles_langs:
-                sub_files = list(Path(output_dir).glob(f"{video_id}.{lang}.vtt"))
-                if sub_files:
-                    # Read content
-                    with open(sub_files[0], "r", encoding="utf-8") as f:
-                        return _clean_vtt_text(f.read())
-            return None
+            info = _extract_or_reuse(youtube_url, ydl_opts, download=True)
+            break
         except Exception as e:
             message = _strip_ansi(str(e))
             if "HTTP Error 429" in message and attempt < max_attempts:
@@ -318,4 +531,60 @@ def download_subtitles(youtube_url: str, output_dir: str, langs: list[str] | Non
                 continue
             raise RuntimeError(_format_ytdlp_error_message(e)) from e
 
-    return None
+    if info is None:
+        return []
+
+    # yt-dlp names the files like {id}.en.vtt or {id}.ru.vtt
+    video_id = info.get("id")
+    manual_langs = info.get("subtitles") or {}
+    tracks: list[SubtitleTrack] = []
+    for lang in langs:
+        vtt_path = Path(output_dir) / f"{video_id}.{lang}.vtt"
+        if vtt_path.is_file():
+            kind = "manual" if lang in manual_langs else "auto"
+            tracks.append(SubtitleTrack(lang=lang, kind=kind, text=clean_vtt_file(vtt_path)))
+    return tracks
+
+
+def download_subtitles(youtube_url: str, output_dir: str, langs: list[str] | None = None) -> str:
+    """
+    Downloads subtitles (auto or manual) and returns the content of the first available
+    language in langs as text. Returns None if no subtitles found.
+    """
+    tracks = download_subtitle_tracks(youtube_url, output_dir, langs or ["en", "ru"])
+    return tracks[0].text if tracks else None
+
+
+def expand_playlist(playlist_url: str) -> list[str]:
+    """
+    Flat-extract a playlist or channel URL and return the video URLs it contains.
+    """
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": "in_playlist",
+        "ignoreconfig": True,
+    }
+
+    _apply_ytdlp_auth_and_extractor_opts(ydl_opts)
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(playlist_url, download=False)
+    except Exception as exc:
+        raise RuntimeError(_format_ytdlp_error_message(exc)) from exc
+
+    urls: list[str] = []
+    for entry in info.get("entries") or []:
+        if not entry:
+            continue
+        if entry.get("_type") == "playlist" or entry.get("ie_key") == "YoutubeTab":
+            # Channel tabs (videos, shorts, ...) nest one more playlist level
+            urls.extend(expand_playlist(entry["url"]))
+            continue
+        video_id = entry.get("id")
+        url = entry.get("url") or entry.get("webpage_url")
+        if video_id and (not url or not url.startswith("http")):
+            url = f"https://www.youtube.com/watch?v={video_id}"
+        if url:
+            urls.append(url)
+    return urls
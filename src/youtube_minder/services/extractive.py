@@ -0,0 +1,93 @@
+"""
+Local extractive summary: TextRank over TF-IDF sentence vectors, vectorized with NumPy.
+The sentence graph is never materialized; with the sparse sentence x term matrix X,
+each PageRank step multiplies by X Xᵀ as two bincount passes, so the cost grows with
+the transcript length rather than with the square of the sentence count. Used as an
+instant preview while the LLM summary runs and as a fallback when the API is unavailable.
+"""
+import re
+
+import numpy as np
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_RE = re.compile(r"[^.!?…\n]+(?:[.!?…]+|$)", re.MULTILINE)
+# Auto-captions have little punctuation; longer runs are cut into word windows
+_MAX_SENTENCE_WORDS = 40
+_WINDOW_WORDS = 25
+_MIN_SENTENCE_WORDS = 5
+_DAMPING = 0.85
+
+
+def split_sentences(text: str) -> list[str]:
+    sentences: list[str] = []
+    for match in _SENTENCE_RE.finditer(text):
+        words = match.group(0).split()
+        if len(words) <= _MAX_SENTENCE_WORDS:
+            if words:
+                sentences.append(" ".join(words))
+            continue
+        sentences.extend(" ".join(words[i : i + _WINDOW_WORDS]) for i in range(0, len(words), _WINDOW_WORDS))
+    return sentences
+
+
+def _tfidf(sentences: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sparse L2-normalized TF-IDF matrix as COO (rows, cols, values)."""
+    tokens = [_TOKEN_RE.findall(sentence.casefold()) for sentence in sentences]
+    lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+    if not lengths.sum():
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    terms, term_ids = np.unique(np.array([t for sentence in tokens for t in sentence]), return_inverse=True)
+    sentence_ids = np.repeat(np.arange(len(sentences)), lengths)
+
+    pairs, counts = np.unique(sentence_ids * len(terms) + term_ids, return_counts=True)
+    rows, cols = np.divmod(pairs, len(terms))
+    df = np.bincount(cols, minlength=len(terms))
+    values = (1 + np.log(counts)) * np.log((1 + len(sentences)) / (1 + df[cols]))
+    norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(sentences)))
+    return rows, cols, values / np.maximum(norms[rows], 1e-12)
+
+
+def rank_sentences(text: str, iterations: int = 30) -> tuple[list[str], np.ndarray]:
+    """Sentences of text and their TextRank scores (cosine-similarity graph, no self-loops)."""
+    sentences = split_sentences(text)
+    n = len(sentences)
+    if n == 0:
+        return [], np.zeros(0)
+    rows, cols, values = _tfidf(sentences)
+    vocab = int(cols.max()) + 1 if cols.size else 0
+
+    def _similarity_times(vector: np.ndarray) -> np.ndarray:
+        # (X Xᵀ - I) v; every non-empty row of X has unit norm, so the diagonal is 1
+        term_totals = np.bincount(cols, weights=values * vector[rows], minlength=vocab)
+        product = np.bincount(rows, weights=values * term_totals[cols], minlength=n)
+        return product - vector * (np.bincount(rows, minlength=n) > 0)
+
+    degree = _similarity_times(np.ones(n))
+    degree[degree <= 0] = 1.0
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - _DAMPING) / n + _DAMPING * _similarity_times(scores / degree)
+        converged = np.abs(updated - scores).sum() < 1e-6
+        scores = updated
+        if converged:
+            break
+    return sentences, scores
+
+
+def extractive_summary(text: str, max_sentences: int | None = None) -> str:
+    """
+    The highest-ranked sentences of text as a Markdown list, in transcript order. By default
+    one sentence per ~30 is kept, between 3 and 10.
+    """
+    sentences, scores = rank_sentences(text)
+    if not sentences:
+        return ""
+    if max_sentences is None:
+        max_sentences = min(10, max(3, len(sentences) // 30))
+    word_counts = np.array([len(sentence.split()) for sentence in sentences])
+    eligible = np.flatnonzero(word_counts >= _MIN_SENTENCE_WORDS)
+    if eligible.size == 0:
+        eligible = np.arange(len(sentences))
+    top = np.sort(eligible[np.argsort(-scores[eligible], kind="stable")[:max_sentences]])
+    return "\n".join(f"- {sentences[idx]}" for idx in top)
@@ -1,13 +1,40 @@
-from pathlib import Path
+import asyncio
+import functools
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from pathlib import Path
 
-import openai
+from youtube_minder.services.cache import CacheKey, ResultCache
+from youtube_minder.services.openai_client import get_async_openai_client, get_openai_client
+from youtube_minder.services.prompts import SYSTEM_PROMPT, transcript_messages
+from youtube_minder.utils.hashing import get_sha256_hash
+from youtube_minder.utils.metrics import bind_context, record_usage
+from youtube_minder.utils.text import estimate_tokens, split_text
 
 
+MODEL = "gpt-4o-mini"
 _TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "templates"
 _GUIDE_PATH = _TEMPLATES_DIR / "notes_guide.md"
 _BODY_RE = re.compile(r"<body[^>]*>(.*?)</body>", re.IGNORECASE | re.DOTALL)
 _WRAPPER_RE = re.compile(r"</?(html|head|body)[^>]*>", re.IGNORECASE)
+_HEADING_RE = re.compile(r"<h([1-3])[^>]*>(.*?)</h\1>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_NOTES_TEMPLATE = (
+    "Write clean, well-structured HTML study notes {lang} for the video transcript above.\n"
+    "{title_line}"
+    "Return HTML body only. Do not include <html>, <head>, <body>, <style>, or scripts.\n"
+    "Use clear sections, bullet lists, and short paragraphs.\n"
+)
+_SECTION_TEMPLATE = (
+    "This is part {index} of {total} of a video transcript. "
+    "Write clean, well-structured HTML study notes {lang} for this part only.\n"
+    "Return HTML body only. Do not include <html>, <head>, <body>, <style>, or scripts.\n"
+    "Start with one <h2> naming the main topic of this part; use <h3> for its subsections "
+    "and do not add an <h1>. Use bullet lists and short paragraphs.\n"
+)
+_CONTENTS_TITLE = {"en": "Contents", "ru": "Содержание"}
 
 
 def _load_notes_guide() -> str:
@@ -17,36 +44,174 @@ def _load_notes_guide() -> str:
         return ""
 
 
-def generate_notes_html(transcription_text: str, language: str = "en", title: str | None = None) -> str:
-    """
-    Generate HTML body for video notes based on a transcript.
-    """
-    client = openai.OpenAI()
-    lang_instruction = "in English" if language == "en" else "in Russian"
+def section_prompt_hash() -> str:
+    """Fingerprint of the per-section prompt, used to key cached sections."""
+    return get_sha256_hash("\x1f".join([SYSTEM_PROMPT, _SECTION_TEMPLATE, _load_notes_guide()]))
+
+
+def prompt_hash() -> str:
+    """Fingerprint of the notes prompts (including the guide), used to key cached notes."""
+    return get_sha256_hash("\x1f".join([SYSTEM_PROMPT, _NOTES_TEMPLATE, section_prompt_hash()]))
+
+
+def _lang_instruction(language: str) -> str:
+    return "in English" if language == "en" else "in Russian"
+
+
+def _with_guide(task: str, transcription_text: str) -> list[dict]:
     guide = _load_notes_guide()
+    if guide:
+        task += f"\nGuide:\n{guide}\n"
+    return transcript_messages(transcription_text, task)
+
+
+def _build_messages(transcription_text: str, language: str, title: str | None) -> list[dict]:
+    lang_instruction = _lang_instruction(language)
     title_line = f"Title: {title}\n\n" if title else ""
 
-    prompt = (
-        f"Write structured study notes {lang_instruction} for the video transcript.\n"
-        f"{title_line}"
-        "Return HTML body only. Do not include <html>, <head>, <body>, <style>, or scripts.\n"
-        "Use clear sections, bullet lists, and short paragraphs.\n"
-    )
-    if guide:
-        prompt += f"\nGuide:\n{guide}\n"
-    prompt += f"\nTranscript:\n{transcription_text}"
+    prompt = _NOTES_TEMPLATE.format(lang=lang_instruction, title_line=title_line)
+    return _with_guide(prompt, transcription_text)
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You write clean, well-structured HTML study notes."},
-            {"role": "user", "content": prompt},
-        ],
-    )
 
-    raw_html = response.choices[0].message.content or ""
+def _section_messages(section_text: str, index: int, total: int, language: str) -> list[dict]:
+    prompt = _SECTION_TEMPLATE.format(index=index + 1, total=total, lang=_lang_instruction(language))
+    return _with_guide(prompt, section_text)
+
+
+def _extract_body(raw_html: str) -> str:
     body_match = _BODY_RE.search(raw_html)
     if body_match:
         raw_html = body_match.group(1)
-    cleaned_html = _WRAPPER_RE.sub("", raw_html).strip()
-    return cleaned_html
+    return _WRAPPER_RE.sub("", raw_html).strip()
+
+
+def _section_key(video_id: str, section_text: str, index: int, total: int, language: str) -> CacheKey:
+    return CacheKey(
+        video_id=video_id,
+        stage="notes_section",
+        language=language,
+        model=MODEL,
+        prompt_hash=section_prompt_hash(),
+        input_hash=get_sha256_hash(f"{index}/{total}\x1f{section_text}"),
+    )
+
+
+def _section_limits() -> tuple[int, int]:
+    return int(os.getenv("NOTES_SECTION_TOKENS", "4000")), int(os.getenv("NOTES_MAX_WORKERS", "4"))
+
+
+def assemble_sections(sections: list[str], language: str = "en", title: str | None = None) -> str:
+    """
+    Join section HTML under an optional <h1> title and a table of contents linking to the
+    first heading of each section.
+    """
+    toc_items = []
+    bodies = []
+    for idx, section_html in enumerate(sections, start=1):
+        heading = _HEADING_RE.search(section_html)
+        label = _TAG_RE.sub("", heading.group(2)).strip() if heading else ""
+        if not label:
+            label = f"{idx}"
+            section_html = f"<h2>{label}</h2>\n{section_html}"
+        toc_items.append(f'<li><a href="#section-{idx}">{escape(label, quote=False)}</a></li>')
+        bodies.append(f'<section id="section-{idx}">\n{section_html}\n</section>')
+
+    parts = [f"<h1>{escape(title, quote=False)}</h1>"] if title else []
+    contents_title = _CONTENTS_TITLE.get(language, _CONTENTS_TITLE["en"])
+    parts.append(f'<nav class="toc">\n<h2>{contents_title}</h2>\n<ol>\n' + "\n".join(toc_items) + "\n</ol>\n</nav>")
+    parts.extend(bodies)
+    return "\n".join(parts)
+
+
+def _complete_section(client, section_text: str, index: int, total: int, language: str) -> str:
+    response = client.chat.completions.create(
+        model=MODEL,
+        messages=_section_messages(section_text, index, total, language),
+    )
+    record_usage(getattr(response, "usage", None))
+    return _extract_body(response.choices[0].message.content or "")
+
+
+def generate_notes_html(
+    transcription_text: str,
+    language: str = "en",
+    title: str | None = None,
+    cache: ResultCache | None = None,
+    video_id: str | None = None,
+) -> str:
+    """
+    Generate HTML body for video notes based on a transcript.
+
+    Transcripts over NOTES_SECTION_TOKENS are split into consecutive sections whose notes
+    are generated concurrently (NOTES_MAX_WORKERS) and joined with a table of contents.
+    With a cache and video_id each section is cached on its own, so only sections whose
+    text or prompt changed are regenerated.
+    """
+    client = get_openai_client()
+    max_tokens, max_workers = _section_limits()
+    if estimate_tokens(transcription_text) <= max_tokens:
+        response = client.chat.completions.create(
+            model=MODEL,
+            messages=_build_messages(transcription_text, language, title),
+        )
+        record_usage(getattr(response, "usage", None))
+        return _extract_body(response.choices[0].message.content or "")
+
+    sections = split_text(transcription_text, max_tokens)
+    total = len(sections)
+
+    def _section(item: tuple[int, str]) -> str:
+        index, section_text = item
+        compute = functools.partial(_complete_section, client, section_text, index, total, language)
+        if cache is None or video_id is None:
+            return compute()
+        return cache.get_or_compute(_section_key(video_id, section_text, index, total, language), compute)[0]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as pool:
+        section_html = list(pool.map(bind_context(_section), enumerate(sections)))
+    return assemble_sections(section_html, language, title)
+
+
+async def generate_notes_html_async(
+    transcription_text: str,
+    language: str = "en",
+    title: str | None = None,
+    cache: ResultCache | None = None,
+    video_id: str | None = None,
+) -> str:
+    """
+    Async variant of generate_notes_html built on openai.AsyncOpenAI.
+    """
+    client = get_async_openai_client()
+    max_tokens, max_workers = _section_limits()
+    if estimate_tokens(transcription_text) <= max_tokens:
+        response = await client.chat.completions.create(
+            model=MODEL,
+            messages=_build_messages(transcription_text, language, title),
+        )
+        record_usage(getattr(response, "usage", None))
+        return _extract_body(response.choices[0].message.content or "")
+
+    sections = split_text(transcription_text, max_tokens)
+    total = len(sections)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def _section(index: int, section_text: str) -> str:
+        key = _section_key(video_id, section_text, index, total, language) if cache and video_id else None
+        if key is not None:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                return cached
+        async with semaphore:
+            response = await client.chat.completions.create(
+                model=MODEL,
+                messages=_section_messages(section_text, index, total, language),
+            )
+        record_usage(getattr(response, "usage", None))
+        html = _extract_body(response.choices[0].message.content or "")
+        if key is not None and html:
+            await asyncio.to_thread(cache.set, key, html)
+        return html
+
+    section_html = await asyncio.gather(*(_section(idx, text) for idx, text in enumerate(sections)))
+    return assemble_sections(list(section_html), language, title)
@@ -0,0 +1,205 @@
+import asyncio
+import os
+import re
+import threading
+import time
+import weakref
+
+import httpx
+import openai
+
+from youtube_minder.utils.text import estimate_tokens
+
+
+# Errors left after the SDK's retries that mean the API is rate-limited or down right now
+API_UNAVAILABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def _parse_reset(raw: str | None) -> float | None:
+    """Parse x-ratelimit-reset-* values such as "1s", "6m0s" or "120ms" into seconds."""
+    if not raw:
+        return None
+    parts = _DURATION_PART_RE.findall(raw)
+    if not parts:
+        try:
+            return float(raw)
+        except ValueError:
+            return None
+    return sum(float(value) * _DURATION_UNITS[unit] for value, unit in parts)
+
+
+class _Bucket:
+    """
+    Token bucket refilled continuously over a one-minute window. take() always succeeds
+    and may drive the level negative; the caller then waits until its share is refilled,
+    so concurrent callers are served in order without a retry loop.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, amount: float, now: float) -> float:
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate) if self.rate else 0.0
+
+    def sync(self, limit: float | None, remaining: float | None, now: float) -> None:
+        self._refill(now)
+        if limit:
+            self.capacity = limit
+        if remaining is not None:
+            self.level = min(self.level, remaining)
+
+
+class RateLimiter:
+    """
+    Client-side requests-per-minute and tokens-per-minute limiter shared by every OpenAI
+    call in the process. Starts from configured limits and follows the x-ratelimit-*
+    headers of the responses; a 429 pauses all callers for its retry-after.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float) -> None:
+        self._lock = threading.Lock()
+        self._requests = _Bucket(requests_per_minute)
+        self._tokens = _Bucket(tokens_per_minute)
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens; return how long to wait before sending."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._requests.take(1, now), self._tokens.take(tokens, now))
+            return max(wait, self._paused_until - now)
+
+    def acquire(self, tokens: int) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def update(self, status_code: int, headers: httpx.Headers) -> None:
+        def _number(name: str) -> float | None:
+            try:
+                return float(headers[name])
+            except (KeyError, ValueError):
+                return None
+
+        with self._lock:
+            now = time.monotonic()
+            self._requests.sync(
+                _number("x-ratelimit-limit-requests"), _number("x-ratelimit-remaining-requests"), now
+            )
+            self._tokens.sync(_number("x-ratelimit-limit-tokens"), _number("x-ratelimit-remaining-tokens"), now)
+            if status_code == 429:
+                retry_after = _parse_reset(headers.get("retry-after")) or max(
+                    _parse_reset(headers.get("x-ratelimit-reset-requests")) or 0.0,
+                    _parse_reset(headers.get("x-ratelimit-reset-tokens")) or 0.0,
+                    1.0,
+                )
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+
+def _request_tokens(request: httpx.Request) -> int:
+    """Rough prompt size of a JSON request body; uploads (multipart) count as zero."""
+    if not request.headers.get("content-type", "").startswith("application/json"):
+        return 0
+    try:
+        return estimate_tokens(request.content.decode("utf-8", errors="ignore"))
+    except httpx.RequestNotRead:
+        return 0
+
+
+_limiter: RateLimiter | None = None
+_client: openai.OpenAI | None = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, openai.AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter configured by OPENAI_RPM_LIMIT and OPENAI_TPM_LIMIT."""
+    global _limiter
+    with _lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                requests_per_minute=float(os.getenv("OPENAI_RPM_LIMIT", "500")),
+                tokens_per_minute=float(os.getenv("OPENAI_TPM_LIMIT", "200000")),
+            )
+        return _limiter
+
+
+def _pool_limits() -> httpx.Limits:
+    max_connections = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=60,
+    )
+
+
+def _max_retries() -> int:
+    return int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+
+
+def get_openai_client() -> openai.OpenAI:
+    """
+    Process-wide OpenAI client: one keep-alive connection pool for all services. Every
+    attempt (including the SDK's jittered-backoff retries on 429/5xx) passes the limiter.
+    """
+    global _client
+    limiter = get_rate_limiter()
+    with _lock:
+        if _client is None:
+            http_client = openai.DefaultHttpxClient(
+                limits=_pool_limits(),
+                event_hooks={
+                    "request": [lambda request: limiter.acquire(_request_tokens(request))],
+                    "response": [lambda response: limiter.update(response.status_code, response.headers)],
+                },
+            )
+            _client = openai.OpenAI(http_client=http_client, max_retries=_max_retries())
+        return _client
+
+
+def get_async_openai_client() -> openai.AsyncOpenAI:
+    """
+    AsyncOpenAI counterpart of get_openai_client sharing the same limiter. httpx async
+    pools are bound to their event loop, so there is one client per running loop.
+    """
+    limiter = get_rate_limiter()
+    loop = asyncio.get_running_loop()
+
+    async def _on_request(request: httpx.Request) -> None:
+        await limiter.acquire_async(_request_tokens(request))
+
+    async def _on_response(response: httpx.Response) -> None:
+        limiter.update(response.status_code, response.headers)
+
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            http_client = openai.DefaultAsyncHttpxClient(
+                limits=_pool_limits(),
+                event_hooks={"request": [_on_request], "response": [_on_response]},
+            )
+            client = openai.AsyncOpenAI(http_client=http_client, max_retries=_max_retries())
+            _async_clients[loop] = client
+        return client
@@ -0,0 +1,20 @@
+"""
+Chat layout shared by summaries, notes and Q&A. OpenAI reuses the longest prompt prefix it
+has recently processed (from 1024 tokens on), so every request about a transcript starts
+with the same system message and the transcript itself, and the per-task instructions
+(language, title, questions) come last. Follow-up calls for a video, such as notes after
+the summary or more questions, then read the transcript from the provider's prompt cache.
+"""
+SYSTEM_PROMPT = (
+    "You work with video transcripts: you summarize them, write study notes and answer "
+    "questions about them. Follow the task given after the transcript."
+)
+
+
+def transcript_messages(transcript: str, task: str, label: str = "Transcript") -> list[dict]:
+    """System message, then the (cacheable) transcript, then the task."""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"{label}:\n{transcript}"},
+        {"role": "user", "content": task},
+    ]
@@ -1,27 +1,100 @@
-import openai
+from youtube_minder.services.openai_client import get_async_openai_client, get_openai_client
+from youtube_minder.services.prompts import SYSTEM_PROMPT, transcript_messages
+from youtube_minder.services.retrieval import TranscriptIndex
+from youtube_minder.utils.hashing import get_sha256_hash
+from youtube_minder.utils.metrics import record_usage
+
+
+MODEL = "gpt-4o-mini"
+_QA_TEMPLATE = (
+    "Answer the questions about the video transcript above. "
+    "Answer each question in the same language as the question. "
+    "If the transcript does not contain the answer, say so briefly.\n\n"
+    "Questions:\n{questions}"
+)
+_QA_RETRIEVAL_TEMPLATE = (
+    "Answer the questions about the video using the transcript excerpts above. "
+    "Answer each question in the same language as the question. "
+    "If the excerpts do not contain the answer, say so briefly.\n\n"
+    "Questions:\n{questions}"
+)
+
+
+def prompt_hash() -> str:
+    """Fingerprint of the Q&A prompt, used to key cached answers."""
+    return get_sha256_hash("\x1f".join([SYSTEM_PROMPT, _QA_TEMPLATE, _QA_RETRIEVAL_TEMPLATE]))
+
+
+def _questions_block(questions: list[str]) -> str:
+    return "\n".join(f"{idx + 1}. {q}" for idx, q in enumerate(questions))
+
+
+def _build_messages(transcription_text: str, questions: list[str]) -> list[dict]:
+    return transcript_messages(transcription_text, _QA_TEMPLATE.format(questions=_questions_block(questions)))
 
 
 def answer_questions(transcription_text: str, questions: list[str]) -> str:
     """
     Answer questions about a video transcript. Replies use the same language as each question.
     """
-    client = openai.OpenAI()
+    client = get_openai_client()
+    response = client.chat.completions.create(
+        model=MODEL,
+        messages=_build_messages(transcription_text, questions),
+    )
+    record_usage(getattr(response, "usage", None))
+    return response.choices[0].message.content
 
-    questions_block = "\n".join(f"{idx + 1}. {q}" for idx, q in enumerate(questions))
-    prompt = (
-        "Answer the questions about the video transcript. "
-        "Answer each question in the same language as the question. "
-        "If the transcript does not contain the answer, say so briefly.\n\n"
-        f"Questions:\n{questions_block}\n\n"
-        f"Transcript:\n{transcription_text}"
+
+async def answer_questions_async(transcription_text: str, questions: list[str]) -> str:
+    """
+    Async variant of answer_questions built on openai.AsyncOpenAI.
+    """
+    client = get_async_openai_client()
+    response = await client.chat.completions.create(
+        model=MODEL,
+        messages=_build_messages(transcription_text, questions),
     )
+    record_usage(getattr(response, "usage", None))
+    return response.choices[0].message.content
+
+
+def select_passages(index: TranscriptIndex, questions: list[str], top_k: int) -> list[int]:
+    """Union of the top_k chunks for each question, in transcript order."""
+    selected: set[int] = set()
+    for question in questions:
+        selected.update(index.search(question, top_k))
+    return sorted(selected)
+
 
+def _retrieval_messages(index: TranscriptIndex, questions: list[str], top_k: int) -> list[dict]:
+    excerpts = "\n\n".join(f"[{idx + 1}] {index.chunks[idx]}" for idx in select_passages(index, questions, top_k))
+    task = _QA_RETRIEVAL_TEMPLATE.format(questions=_questions_block(questions))
+    return transcript_messages(excerpts, task, label="Transcript excerpts (in video order)")
+
+
+def answer_questions_retrieval(index: TranscriptIndex, questions: list[str], top_k: int = 4) -> str:
+    """
+    Answer questions using only the transcript chunks retrieved for them from the index,
+    instead of sending the whole transcript.
+    """
+    client = get_openai_client()
     response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You answer questions about video transcripts."},
-            {"role": "user", "content": prompt},
-        ],
+        model=MODEL,
+        messages=_retrieval_messages(index, questions, top_k),
     )
+    record_usage(getattr(response, "usage", None))
+    return response.choices[0].message.content
+
 
+async def answer_questions_retrieval_async(index: TranscriptIndex, questions: list[str], top_k: int = 4) -> str:
+    """
+    Async variant of answer_questions_retrieval built on openai.AsyncOpenAI.
+    """
+    client = get_async_openai_client()
+    response = await client.chat.completions.create(
+        model=MODEL,
+        messages=_retrieval_messages(index, questions, top_k),
+    )
+    record_usage(getattr(response, "usage", None))
     return response.choices[0].message.content
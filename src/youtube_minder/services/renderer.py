@@ -1,37 +1,170 @@
+import functools
+import os
+import re
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
+
+from youtube_minder.config import PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES
+from youtube_minder.utils.hashing import get_sha256_hash
+
+
+_WRAPPER_PATH = Path(__file__).resolve().parents[1] / "templates" / "notes_wrapper.html"
+_STYLE_RE = re.compile(r"<style[^>]*>(.*?)</style>", re.IGNORECASE | re.DOTALL)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_weasyprint() -> SimpleNamespace:
+    """
+    Import WeasyPrint once per process and apply the pydyf compatibility patches once.
+    """
+    try:
+        import pydyf
+        from weasyprint import CSS, HTML
+        from weasyprint.text.fonts import FontConfiguration
+    except Exception as exc:
+        raise RuntimeError("WeasyPrint is required to render PDFs. Install weasyprint.") from exc
+
+    if not hasattr(pydyf.Stream, "transform") and hasattr(pydyf.Stream, "set_matrix"):
+        def _transform(self, a=1, b=0, c=0, d=1, e=0, f=0):
+            return self.set_matrix(a, b, c, d, e, f)
+
+        pydyf.Stream.transform = _transform
+
+    if not hasattr(pydyf.Stream, "text_matrix") and hasattr(pydyf.Stream, "set_text_matrix"):
+        def _text_matrix(self, a=1, b=0, c=0, d=1, e=0, f=0):
+            return self.set_text_matrix(a, b, c, d, e, f)
+
+        pydyf.Stream.text_matrix = _text_matrix
+
+    return SimpleNamespace(HTML=HTML, CSS=CSS, FontConfiguration=FontConfiguration)
 
 
 class HTMLRenderer:
-    def __init__(self, wrapper_path: Path) -> None:
+    """
+    Render HTML note bodies to PDF inside templates/notes_wrapper.html.
+
+    WeasyPrint is imported and patched once per process, the wrapper stylesheet is parsed
+    once per renderer, and with cache_dir set PDFs are cached by a hash of wrapper + body.
+    """
+
+    def __init__(self, wrapper_path: Path, cache_dir: Path | None = None, cache_max_bytes: int | None = None) -> None:
         self.wrapper_path = wrapper_path
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_max_bytes = cache_max_bytes
         self._wrapper_html: str | None = None
+        self._page_html: str | None = None
+        self._stylesheet = None
+        self._font_config = None
 
     def _load_wrapper(self) -> str:
         if self._wrapper_html is None:
             self._wrapper_html = self.wrapper_path.read_text(encoding="utf-8")
         return self._wrapper_html
 
-    def render(self, html_body: str) -> bytes:
+    def warm_up(self) -> None:
+        """Import WeasyPrint and pre-parse the wrapper stylesheet ahead of the first render."""
+        if self._stylesheet is not None:
+            return
+        weasy = _load_weasyprint()
         wrapper = self._load_wrapper()
-        full_html = wrapper.replace("{{CONTENT}}", html_body)
+        css_text = "\n".join(_STYLE_RE.findall(wrapper))
+        self._page_html = _STYLE_RE.sub("", wrapper)
+        self._font_config = weasy.FontConfiguration()
+        self._stylesheet = weasy.CSS(
+            string=css_text,
+            base_url=str(self.wrapper_path.parent),
+            font_config=self._font_config,
+        )
+
+    def _cache_path(self, html_body: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        digest = get_sha256_hash(f"{self._load_wrapper()}\x1f{html_body}")
+        return self.cache_dir / f"{digest}.pdf"
+
+    def _store(self, cache_path: Path, pdf: bytes) -> None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(pdf)
+        tmp_path.replace(cache_path)
+        if self.cache_max_bytes is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        files = sorted(self.cache_dir.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.cache_max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    def render(self, html_body: str) -> bytes:
+        cache_path = self._cache_path(html_body)
+        if cache_path is not None and cache_path.is_file():
+            cache_path.touch()
+            return cache_path.read_bytes()
+
+        self.warm_up()
+        weasy = _load_weasyprint()
+        full_html = self._page_html.replace("{{CONTENT}}", html_body)
+        doc = weasy.HTML(string=full_html, base_url=str(self.wrapper_path.parent)).render(
+            stylesheets=[self._stylesheet],
+            font_config=self._font_config,
+        )
+        pdf = doc.write_pdf()
+
+        if cache_path is not None:
+            self._store(cache_path, pdf)
+        return pdf
+
+
+_worker_renderer: HTMLRenderer | None = None
+
+
+def _init_worker(wrapper_path: Path, cache_dir: Path | None, cache_max_bytes: int | None) -> None:
+    global _worker_renderer
+    _worker_renderer = HTMLRenderer(wrapper_path, cache_dir=cache_dir, cache_max_bytes=cache_max_bytes)
+    _worker_renderer.warm_up()
+
+
+def _render_in_worker(html_body: str) -> bytes:
+    return _worker_renderer.render(html_body)
+
+
+class RenderPool:
+    """
+    Process pool of warm renderers so several PDFs can be laid out in parallel without
+    blocking the caller (submit returns a Future).
+    """
 
-        try:
-            import pydyf
-            from weasyprint import HTML
-        except Exception as exc:
-            raise RuntimeError("WeasyPrint is required to render PDFs. Install weasyprint.") from exc
+    def __init__(self, renderer: HTMLRenderer, processes: int | None = None) -> None:
+        self.renderer = renderer
+        self._pool = ProcessPoolExecutor(
+            max_workers=processes or int(os.getenv("PDF_RENDER_PROCESSES", "2")),
+            initializer=_init_worker,
+            initargs=(renderer.wrapper_path, renderer.cache_dir, renderer.cache_max_bytes),
+        )
 
-        if not hasattr(pydyf.Stream, "transform") and hasattr(pydyf.Stream, "set_matrix"):
-            def _transform(self, a=1, b=0, c=0, d=1, e=0, f=0):
-                return self.set_matrix(a, b, c, d, e, f)
+    def submit(self, html_body: str) -> Future:
+        cache_path = self.renderer._cache_path(html_body)
+        if cache_path is not None and cache_path.is_file():
+            # Cached PDFs are served without a round trip through the pool
+            future: Future = Future()
+            future.set_result(cache_path.read_bytes())
+            return future
+        return self._pool.submit(_render_in_worker, html_body)
 
-            pydyf.Stream.transform = _transform
+    def render_many(self, html_bodies: list[str]) -> list[bytes]:
+        return [future.result() for future in [self.submit(body) for body in html_bodies]]
 
-        if not hasattr(pydyf.Stream, "text_matrix") and hasattr(pydyf.Stream, "set_text_matrix"):
-            def _text_matrix(self, a=1, b=0, c=0, d=1, e=0, f=0):
-                return self.set_text_matrix(a, b, c, d, e, f)
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
 
-            pydyf.Stream.text_matrix = _text_matrix
 
-        doc = HTML(string=full_html, base_url=str(self.wrapper_path.parent)).render()
-        return doc.write_pdf()
+@functools.lru_cache(maxsize=1)
+def get_notes_renderer() -> HTMLRenderer:
+    """Process-wide renderer for the notes wrapper with the PDF cache in DATA_DIR."""
+    return HTMLRenderer(_WRAPPER_PATH, cache_dir=PDF_CACHE_DIR, cache_max_bytes=PDF_CACHE_MAX_BYTES)
@@ -0,0 +1,179 @@
+import json
+import re
+import uuid
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+from youtube_minder.services.openai_client import get_openai_client
+from youtube_minder.utils.metrics import record_usage
+from youtube_minder.utils.text import split_text
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def _tokenize(text: str) -> list[str]:
+    return [t.casefold() for t in _TOKEN_RE.findall(text)]
+
+
+class Scorer(Protocol):
+    """Relevance backend: fitted on transcript chunks, scores every chunk for a query."""
+
+    name: str
+
+    def fit(self, chunks: list[str]) -> None: ...
+
+    def score(self, query: str) -> np.ndarray: ...
+
+    def state(self) -> dict[str, np.ndarray]: ...
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None: ...
+
+
+class BM25Scorer:
+    """Okapi BM25 over a dense chunk x term frequency matrix."""
+
+    name = "bm25"
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.vocab: dict[str, int] = {}
+        self._weights = np.zeros((0, 0), dtype=np.float32)
+        self._idf = np.zeros(0, dtype=np.float32)
+
+    def fit(self, chunks: list[str]) -> None:
+        tokenized = [_tokenize(chunk) for chunk in chunks]
+        for tokens in tokenized:
+            for token in tokens:
+                self.vocab.setdefault(token, len(self.vocab))
+
+        tf = np.zeros((len(chunks), len(self.vocab)), dtype=np.float32)
+        for row, tokens in enumerate(tokenized):
+            ids, counts = np.unique([self.vocab[t] for t in tokens], return_counts=True) if tokens else ([], [])
+            tf[row, ids] = counts
+
+        doc_len = tf.sum(axis=1, keepdims=True)
+        avg_len = float(doc_len.mean()) if len(chunks) else 0.0
+        df = (tf > 0).sum(axis=0)
+        self._idf = np.log1p((len(chunks) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = self.k1 * (1 - self.b + self.b * doc_len / max(avg_len, 1e-9))
+        # Precompute the per-term BM25 weight so scoring a query is a column sum
+        self._weights = (tf * (self.k1 + 1) / (tf + norm)) * self._idf
+
+    def score(self, query: str) -> np.ndarray:
+        ids = sorted({self.vocab[t] for t in _tokenize(query) if t in self.vocab})
+        if not ids:
+            return np.zeros(self._weights.shape[0], dtype=np.float32)
+        return self._weights[:, ids].sum(axis=1)
+
+    def state(self) -> dict[str, np.ndarray]:
+        vocab = np.array(sorted(self.vocab, key=self.vocab.get), dtype=np.str_)
+        return {"weights": self._weights, "idf": self._idf, "vocab": vocab}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self._weights = state["weights"]
+        self._idf = state["idf"]
+        self.vocab = {term: idx for idx, term in enumerate(state["vocab"].tolist())}
+
+
+class OpenAIEmbeddingScorer:
+    """Cosine similarity over OpenAI embeddings (costs one embeddings call per query)."""
+
+    name = "openai-embeddings"
+
+    def __init__(self, model: str = _EMBEDDING_MODEL) -> None:
+        self.model = model
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        client = get_openai_client()
+        response = client.embeddings.create(model=self.model, input=texts)
+        record_usage(getattr(response, "usage", None))
+        vectors = np.array([item.embedding for item in response.data], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+    def fit(self, chunks: list[str]) -> None:
+        self._vectors = self._embed(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+
+    def score(self, query: str) -> np.ndarray:
+        if not self._vectors.size:
+            return np.zeros(0, dtype=np.float32)
+        return self._vectors @ self._embed([query])[0]
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {"vectors": self._vectors}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self._vectors = state["vectors"]
+
+
+_SCORERS = {
+    BM25Scorer.name: BM25Scorer,
+    OpenAIEmbeddingScorer.name: OpenAIEmbeddingScorer,
+}
+
+
+class TranscriptIndex:
+    """Chunked transcript plus a relevance scorer, persistable as a single .npz file."""
+
+    def __init__(self, chunks: list[str], scorer: Scorer) -> None:
+        self.chunks = chunks
+        self.scorer = scorer
+
+    @classmethod
+    def build(cls, text: str, chunk_tokens: int = 300, backend: str = BM25Scorer.name) -> "TranscriptIndex":
+        if backend not in _SCORERS:
+            raise ValueError(f"Unknown retrieval backend: {backend}")
+        chunks = split_text(text, chunk_tokens)
+        scorer = _SCORERS[backend]()
+        scorer.fit(chunks)
+        return cls(chunks, scorer)
+
+    def search(self, query: str, top_k: int) -> list[int]:
+        """Return indices of the top_k most relevant chunks (best first)."""
+        scores = self.scorer.score(query)
+        if not len(scores):
+            return []
+        top_k = min(top_k, len(scores))
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        return [int(i) for i in candidates[np.argsort(-scores[candidates], kind="stable")]]
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"backend": self.scorer.name, "chunks": self.chunks}
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp.npz")
+        np.savez(tmp_path, meta=np.array(json.dumps(meta)), **self.scorer.state())
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TranscriptIndex":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            state = {key: data[key] for key in data.files if key != "meta"}
+        scorer = _SCORERS[meta["backend"]]()
+        scorer.load_state(state)
+        return cls(meta["chunks"], scorer)
+
+
+def load_or_build_index(
+    text: str,
+    path: Path,
+    chunk_tokens: int = 300,
+    backend: str = BM25Scorer.name,
+) -> TranscriptIndex:
+    """Load a persisted index, or build and persist it on first use."""
+    path = Path(path)
+    if path.is_file():
+        try:
+            return TranscriptIndex.load(path)
+        except Exception:
+            pass
+    index = TranscriptIndex.build(text, chunk_tokens=chunk_tokens, backend=backend)
+    index.save(path)
+    return index
@@ -1,29 +1,234 @@
-import openai
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from youtube_minder.services.openai_client import get_async_openai_client, get_openai_client
+from youtube_minder.services.prompts import SYSTEM_PROMPT, transcript_messages
+from youtube_minder.utils.hashing import get_sha256_hash
+from youtube_minder.utils.metrics import bind_context, record_usage
+from youtube_minder.utils.text import estimate_tokens, split_text
+
+
+MODEL = "gpt-4o-mini"
+_SUMMARY_TEMPLATE = (
+    "Summarize the video transcription above {lang}. "
+    "Identify the main topic, key points, and conclusion."
+)
+_CHUNK_TEMPLATE = (
+    "This is part {index} of {total} of a video transcription. "
+    "Summarize this part {lang}. "
+    "Keep every key point, fact, and example; skip filler."
+)
+_REDUCE_TEMPLATE = (
+    "These are summaries of consecutive parts of one video transcription. "
+    "Write a single summary of the whole video {lang}. "
+    "Identify the main topic, key points, and conclusion."
+)
+_MERGE_TEMPLATE = (
+    "These are summaries of consecutive parts of one video transcription. "
+    "Merge them into one shorter summary {lang}, "
+    "keeping the key points in order."
+)
+
+
+def _lang_instruction(language: str) -> str:
+    return "in English" if language == "en" else "in Russian"
+
+
+def _summary_messages(text: str, language: str) -> list[dict]:
+    return transcript_messages(text, _SUMMARY_TEMPLATE.format(lang=_lang_instruction(language)))
+
+
+def _chunk_messages(chunk: str, index: int, total: int, language: str) -> list[dict]:
+    task = _CHUNK_TEMPLATE.format(index=index + 1, total=total, lang=_lang_instruction(language))
+    return transcript_messages(chunk, task)
+
+
+def prompt_hash() -> str:
+    """Fingerprint of the summary prompts, used to key cached summaries."""
+    return get_sha256_hash(
+        "\x1f".join([SYSTEM_PROMPT, _SUMMARY_TEMPLATE, _CHUNK_TEMPLATE, _REDUCE_TEMPLATE, _MERGE_TEMPLATE])
+    )
+
+
+def _complete(client, messages: list[dict]) -> str:
+    response = client.chat.completions.create(model=MODEL, messages=messages)
+    record_usage(getattr(response, "usage", None))
+    return response.choices[0].message.content
+
+
+async def _complete_async(client, messages: list[dict]) -> str:
+    response = await client.chat.completions.create(model=MODEL, messages=messages)
+    record_usage(getattr(response, "usage", None))
+    return response.choices[0].message.content
 
 
 def summarize_text(text: str, language: str = "en") -> str:
     """
     Summarizes the given text using gpt-4o-mini.
+    Transcripts larger than SUMMARY_CHUNK_TOKENS are summarized with summarize_text_chunked.
 
     :param text: The transcription text to summarize.
     :param language: The target language for the summary ('en' or 'ru').
     """
-    client = openai.OpenAI()
+    max_chunk_tokens = int(os.getenv("SUMMARY_CHUNK_TOKENS", "12000"))
+    if estimate_tokens(text) > max_chunk_tokens:
+        return summarize_text_chunked(text, language=language, max_chunk_tokens=max_chunk_tokens)
+
+    client = get_openai_client()
+    return _complete(client, _summary_messages(text, language))
+
+
+def _summarize_chunk(client, chunk: str, index: int, total: int, language: str) -> str:
+    return _complete(client, _chunk_messages(chunk, index, total, language))
 
-    lang_instruction = "in English" if language == "en" else "in Russian"
 
-    prompt = (
-        f"Summarize the following video transcription {lang_instruction}. "
-        "Identify the main topic, key points, and conclusion.\n\n"
-        f"{text}"
+def _reduce_messages(summaries: list[str], language: str, final: bool) -> list[dict]:
+    template = _REDUCE_TEMPLATE if final else _MERGE_TEMPLATE
+    return transcript_messages(
+        "\n\n".join(summaries), template.format(lang=_lang_instruction(language)), label="Part summaries"
     )
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that summarizes video transcriptions."},
-            {"role": "user", "content": prompt},
-        ],
+
+def _map_partials(client, chunks: list[str], language: str, max_chunk_tokens: int, max_workers: int) -> list[str]:
+    """
+    Summarize chunks concurrently and collapse the partial summaries until they fit
+    a single reduce prompt.
+    """
+    total = len(chunks)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as pool:
+        partials = list(
+            pool.map(
+                bind_context(lambda item: _summarize_chunk(client, item[1], item[0], total, language)),
+                enumerate(chunks),
+            )
+        )
+
+        # Very long inputs may produce more partial text than fits a single reduce prompt;
+        # collapse groups of partial summaries until the final pass fits the budget.
+        while len(partials) > 1 and estimate_tokens("\n\n".join(partials)) > max_chunk_tokens:
+            groups = split_text("\n\n".join(partials), max_chunk_tokens)
+            if len(groups) >= len(partials):
+                break
+            partials = list(
+                pool.map(
+                    bind_context(lambda group: _complete(client, _reduce_messages([group], language, final=False))),
+                    groups,
+                )
+            )
+    return partials
+
+
+def _resolve_chunking(max_chunk_tokens: int | None, max_workers: int | None) -> tuple[int, int]:
+    if max_chunk_tokens is None:
+        max_chunk_tokens = int(os.getenv("SUMMARY_CHUNK_TOKENS", "12000"))
+    if max_workers is None:
+        max_workers = int(os.getenv("SUMMARY_MAX_WORKERS", "4"))
+    return max_chunk_tokens, max_workers
+
+
+def summarize_text_chunked(
+    text: str,
+    language: str = "en",
+    max_chunk_tokens: int | None = None,
+    max_workers: int | None = None,
+) -> str:
+    """
+    Map-reduce summary: split the transcript on paragraph/sentence boundaries,
+    summarize chunks concurrently, then merge the partial summaries in one reduce pass.
+
+    :param text: The transcription text to summarize.
+    :param language: The target language for the summary ('en' or 'ru').
+    :param max_chunk_tokens: Token budget per chunk (default: SUMMARY_CHUNK_TOKENS).
+    :param max_workers: Parallel chunk requests (default: SUMMARY_MAX_WORKERS).
+    """
+    max_chunk_tokens, max_workers = _resolve_chunking(max_chunk_tokens, max_workers)
+
+    chunks = split_text(text, max_chunk_tokens)
+    client = get_openai_client()
+    if len(chunks) <= 1:
+        return _complete(client, _summary_messages(text, language))
+
+    partials = _map_partials(client, chunks, language, max_chunk_tokens, max_workers)
+    return _complete(client, _reduce_messages(partials, language, final=True))
+
+
+def _complete_stream(client, messages: list[dict]) -> Iterator[str]:
+    stream = client.chat.completions.create(
+        model=MODEL,
+        messages=messages,
+        stream=True,
+        stream_options={"include_usage": True},
     )
+    for chunk in stream:
+        if not chunk.choices:
+            # The final chunk carries only the usage of the whole request
+            if getattr(chunk, "usage", None) is not None:
+                record_usage(chunk.usage)
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
 
-    return response.choices[0].message.content
+
+def summarize_text_stream(
+    text: str,
+    language: str = "en",
+    max_chunk_tokens: int | None = None,
+    max_workers: int | None = None,
+) -> Iterator[str]:
+    """
+    Streaming variant of summarize_text: yields summary text deltas as they arrive.
+    Long transcripts are mapped in chunks first; only the final reduce pass is streamed.
+    """
+    max_chunk_tokens, max_workers = _resolve_chunking(max_chunk_tokens, max_workers)
+
+    client = get_openai_client()
+    if estimate_tokens(text) <= max_chunk_tokens:
+        yield from _complete_stream(client, _summary_messages(text, language))
+        return
+
+    chunks = split_text(text, max_chunk_tokens)
+    partials = _map_partials(client, chunks, language, max_chunk_tokens, max_workers)
+    yield from _complete_stream(client, _reduce_messages(partials, language, final=True))
+
+
+async def summarize_text_async(
+    text: str,
+    language: str = "en",
+    max_chunk_tokens: int | None = None,
+    max_workers: int | None = None,
+) -> str:
+    """
+    Async variant of summarize_text built on openai.AsyncOpenAI; chunk summaries of long
+    transcripts run concurrently (at most max_workers at a time) on the event loop.
+    """
+    max_chunk_tokens, max_workers = _resolve_chunking(max_chunk_tokens, max_workers)
+
+    client = get_async_openai_client()
+    if estimate_tokens(text) <= max_chunk_tokens:
+        return await _complete_async(client, _summary_messages(text, language))
+
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def _bounded(messages: list[dict]) -> str:
+        async with semaphore:
+            return await _complete_async(client, messages)
+
+    chunks = split_text(text, max_chunk_tokens)
+    total = len(chunks)
+    partials = await asyncio.gather(
+        *(
+            _bounded(_chunk_messages(chunk, idx, total, language))
+            for idx, chunk in enumerate(chunks)
+        )
+    )
+    while len(partials) > 1 and estimate_tokens("\n\n".join(partials)) > max_chunk_tokens:
+        groups = split_text("\n\n".join(partials), max_chunk_tokens)
+        if len(groups) >= len(partials):
+            break
+        partials = await asyncio.gather(
+            *(_bounded(_reduce_messages([group], language, final=False)) for group in groups)
+        )
+    return await _complete_async(client, _reduce_messages(list(partials), language, final=True))
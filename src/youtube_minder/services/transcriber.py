@@ -1,15 +1,325 @@
-import openai
+import functools
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Protocol
+
+from youtube_minder.services.openai_client import get_openai_client
+from youtube_minder.utils.metrics import bind_context, record_usage
+
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+_WORD_NORM_RE = re.compile(r"[^\w]+", re.UNICODE)
+_MAX_OVERLAP_WORDS = 40
 
 
 def transcribe_openai(file_path: str, model_name: str = "gpt-4o-mini-transcribe") -> str:
     """
     Transcribes an audio file using OpenAI Whisper API (gpt-4o-mini-transcribe).
     """
-    client = openai.OpenAI()
+    client = get_openai_client()
+    return _transcribe_file(client, file_path, model_name)
+
+
+def _transcribe_file(client, file_path: str, model_name: str) -> str:
     with open(file_path, "rb") as audio_file:
         transcription = client.audio.transcriptions.create(
             model=model_name,
             file=audio_file,
             response_format="text",
         )
+    record_usage(None)
     return transcription
+
+
+def _probe_duration(file_path: str) -> float:
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            file_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip())
+
+
+def _detect_silences(file_path: str, noise_db: int = -30, min_silence: float = 0.4) -> list[tuple[float, float]]:
+    """
+    Return (start, end) silence intervals reported by ffmpeg's silencedetect filter.
+    """
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            file_path,
+            "-af",
+            f"silencedetect=noise={noise_db}dB:d={min_silence}",
+            "-f",
+            "null",
+            "-",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    silences: list[tuple[float, float]] = []
+    start = None
+    for line in result.stderr.splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and start is not None:
+            silences.append((start, float(end_match.group(1))))
+            start = None
+    return silences
+
+
+def _plan_segments(
+    duration: float,
+    segment_seconds: float,
+    overlap_seconds: float,
+    silences: list[tuple[float, float]] | None = None,
+) -> list[tuple[float, float]]:
+    """
+    Plan (start, end) windows. Cuts snap to the middle of a nearby silence when one is
+    available (no overlap needed there); otherwise windows overlap by overlap_seconds.
+    """
+    silences = silences or []
+    tolerance = segment_seconds * 0.15
+    segments: list[tuple[float, float]] = []
+    start = 0.0
+    while start < duration:
+        target = start + segment_seconds
+        if target >= duration:
+            segments.append((start, duration))
+            break
+
+        candidates = [
+            (s + e) / 2 for s, e in silences if abs((s + e) / 2 - target) <= tolerance and (s + e) / 2 > start
+        ]
+        if candidates:
+            cut = min(candidates, key=lambda c: abs(c - target))
+            segments.append((start, cut))
+            start = cut
+        else:
+            segments.append((start, target))
+            start = target - overlap_seconds
+    return segments
+
+
+def _split_audio(file_path: str, output_dir: str, segments: list[tuple[float, float]]) -> list[str]:
+    suffix = Path(file_path).suffix or ".mp3"
+    paths: list[str] = []
+    for idx, (start, end) in enumerate(segments):
+        segment_path = str(Path(output_dir) / f"segment_{idx:04d}{suffix}")
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                "-ss",
+                f"{start:.3f}",
+                "-t",
+                f"{end - start:.3f}",
+                "-i",
+                file_path,
+                "-c",
+                "copy",
+                segment_path,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        paths.append(segment_path)
+    return paths
+
+
+def _normalize_word(word: str) -> str:
+    return _WORD_NORM_RE.sub("", word).lower()
+
+
+def _stitch_transcripts(parts: list[str]) -> str:
+    """
+    Join segment transcripts, dropping words repeated across overlapping boundaries.
+    """
+    words: list[str] = []
+    for part in parts:
+        new_words = part.split()
+        if not new_words:
+            continue
+        if words:
+            tail = [_normalize_word(w) for w in words[-_MAX_OVERLAP_WORDS:]]
+            head = [_normalize_word(w) for w in new_words[:_MAX_OVERLAP_WORDS]]
+            overlap = 0
+            for size in range(min(len(tail), len(head)), 1, -1):
+                if tail[-size:] == head[:size]:
+                    overlap = size
+                    break
+            new_words = new_words[overlap:]
+        words.extend(new_words)
+    return " ".join(words)
+
+
+def transcribe_openai_segmented(
+    file_path: str,
+    model_name: str = "gpt-4o-mini-transcribe",
+    segment_seconds: float | None = None,
+    overlap_seconds: float | None = None,
+    max_workers: int | None = None,
+) -> str:
+    """
+    Transcribes long audio by cutting it into segments (at silences where possible,
+    fixed overlapping windows otherwise), transcribing them concurrently and stitching
+    the results. Short files go through a single request. Requires ffmpeg/ffprobe in PATH.
+    """
+    if segment_seconds is None:
+        segment_seconds = float(os.getenv("TRANSCRIBE_SEGMENT_SECONDS", "300"))
+    if overlap_seconds is None:
+        overlap_seconds = float(os.getenv("TRANSCRIBE_OVERLAP_SECONDS", "2"))
+    if max_workers is None:
+        max_workers = int(os.getenv("TRANSCRIBE_MAX_WORKERS", "4"))
+    # Windows advance by segment - overlap; anything else would never reach the end
+    if segment_seconds <= 0 or not 0 <= overlap_seconds < segment_seconds / 2:
+        raise ValueError(
+            "TRANSCRIBE_OVERLAP_SECONDS must be non-negative and less than half of TRANSCRIBE_SEGMENT_SECONDS "
+            f"(got overlap {overlap_seconds:g}s, segment {segment_seconds:g}s)."
+        )
+
+    duration = _probe_duration(file_path)
+    if duration <= segment_seconds:
+        return transcribe_openai(file_path, model_name=model_name)
+
+    segments = _plan_segments(duration, segment_seconds, overlap_seconds, _detect_silences(file_path))
+    client = get_openai_client()
+    with tempfile.TemporaryDirectory(dir=Path(file_path).parent) as tmp_dir:
+        segment_paths = _split_audio(file_path, tmp_dir, segments)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(segment_paths)))) as pool:
+            parts = list(pool.map(bind_context(lambda path: _transcribe_file(client, path, model_name)), segment_paths))
+    return _stitch_transcripts(parts)
+
+
+class TranscriptionEngine(Protocol):
+    name: str
+    description: str
+
+    def transcribe(self, file_path: str) -> str: ...
+
+
+class OpenAITranscriptionEngine:
+    """The OpenAI transcription API, with long files cut into concurrent segments."""
+
+    name = "openai"
+
+    def __init__(self, model_name: str = "gpt-4o-mini-transcribe") -> None:
+        self.model_name = model_name
+        self.description = model_name
+
+    def transcribe(self, file_path: str) -> str:
+        return transcribe_openai_segmented(file_path, model_name=self.model_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_faster_whisper():
+    try:
+        from faster_whisper import WhisperModel
+    except Exception as exc:
+        raise RuntimeError(
+            "faster-whisper is required for TRANSCRIBE_ENGINE=local. "
+            "Install the local extra: uv sync --extra local (or pip install 'youtube-minder[local]')."
+        ) from exc
+    return WhisperModel
+
+
+class LocalWhisperEngine:
+    """
+    Local CPU speech-to-text with faster-whisper (CTranslate2). The model is loaded on first
+    use and stays resident for the process; cpu_threads bounds the threads per transcription
+    and num_workers how many transcriptions run in parallel.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        model_size: str = "small",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        beam_size: int = 1,
+    ) -> None:
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads or os.cpu_count() or 1
+        self.num_workers = num_workers
+        self.beam_size = beam_size
+        self.description = f"faster-whisper {model_size} ({compute_type}, {self.cpu_threads} threads)"
+        self._model = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self._model is None:
+                WhisperModel = _load_faster_whisper()
+                self._model = WhisperModel(
+                    self.model_size,
+                    device="cpu",
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.num_workers,
+                )
+            return self._model
+
+    def transcribe(self, file_path: str) -> str:
+        segments, _info = self.load().transcribe(file_path, beam_size=self.beam_size, vad_filter=True)
+        return " ".join(segment.text.strip() for segment in segments if segment.text.strip())
+
+
+_engines: dict[str, TranscriptionEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def _create_engine(name: str) -> TranscriptionEngine:
+    if name == "openai":
+        return OpenAITranscriptionEngine()
+    if name == "local":
+        return LocalWhisperEngine(
+            model_size=os.getenv("LOCAL_STT_MODEL", "small"),
+            compute_type=os.getenv("LOCAL_STT_COMPUTE_TYPE", "int8"),
+            cpu_threads=int(os.getenv("LOCAL_STT_THREADS", "0")),
+            num_workers=int(os.getenv("LOCAL_STT_WORKERS", "1")),
+            beam_size=int(os.getenv("LOCAL_STT_BEAM_SIZE", "1")),
+        )
+    raise ValueError(f"Unknown transcription engine: {name!r} (expected 'openai' or 'local').")
+
+
+def transcription_engine_name(name: str | None = None) -> str:
+    """name, or the default engine from TRANSCRIBE_ENGINE ("openai")."""
+    return name or os.getenv("TRANSCRIBE_ENGINE", "openai")
+
+
+def get_transcription_engine(name: str | None = None) -> TranscriptionEngine:
+    """Process-wide engine by name (default: TRANSCRIBE_ENGINE, "openai"); local models stay loaded."""
+    name = transcription_engine_name(name)
+    with _engines_lock:
+        engine = _engines.get(name)
+        if engine is None:
+            engine = _engines[name] = _create_engine(name)
+        return engine
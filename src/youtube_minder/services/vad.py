@@ -0,0 +1,177 @@
+"""
+Voice activity detection before transcription. Audio is decoded by ffmpeg to 16 kHz mono
+PCM in chunks and scored per 30 ms NumPy frame: regions louder than the adaptive noise floor
+count as speech when they have the frequent energy dips of syllables (steady music beds and
+tones have few). Only speech regions are re-encoded for transcription, and a SpeechMap
+translates times in that audio back to the original.
+"""
+import bisect
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+_FRAME_SAMPLES = int(SAMPLE_RATE * FRAME_SECONDS)
+_CHUNK_SAMPLES = _FRAME_SAMPLES * 2000  # one minute of audio per read
+_SILENCE_FLOOR_DB = -55.0
+
+
+@dataclass(frozen=True)
+class SpeechMap:
+    """Speech regions (start, end) of the original audio, in the order they were concatenated."""
+
+    regions: tuple[tuple[float, float], ...]
+    duration: float
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.regions)
+
+    @property
+    def removed_fraction(self) -> float:
+        return 1 - self.speech_seconds / self.duration if self.duration else 0.0
+
+    def to_original(self, seconds: float) -> float:
+        """Map a time in the speech-only audio to the same moment in the original."""
+        offsets = np.cumsum([0.0] + [end - start for start, end in self.regions]).tolist()
+        index = min(max(bisect.bisect_right(offsets, seconds) - 1, 0), len(self.regions) - 1)
+        start, end = self.regions[index]
+        return min(start + seconds - offsets[index], end)
+
+    def as_dict(self) -> dict:
+        return {"regions": [list(region) for region in self.regions], "duration": self.duration}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SpeechMap":
+        return cls(tuple((float(s), float(e)) for s, e in data["regions"]), float(data["duration"]))
+
+
+def _decode_pcm(file_path: str) -> Iterator[np.ndarray]:
+    """Yield 16 kHz mono int16 samples of file_path, a minute at a time."""
+    proc = subprocess.Popen(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", file_path,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        while data := proc.stdout.read(_CHUNK_SAMPLES * 2):
+            yield np.frombuffer(data, dtype="<i2")
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, "ffmpeg", stderr=stderr)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+def frame_powers(samples: np.ndarray) -> np.ndarray:
+    """Mean power of each full 30 ms frame of int16 samples."""
+    count = len(samples) // _FRAME_SAMPLES
+    frames = samples[: count * _FRAME_SAMPLES].reshape(count, _FRAME_SAMPLES).astype(np.float32) / 32768
+    return np.mean(frames * frames, axis=1)
+
+
+def _runs(mask: np.ndarray) -> list[tuple[int, int]]:
+    """[start, end) index runs where mask is True."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def _moving_average(values: np.ndarray, width: int) -> np.ndarray:
+    return np.convolve(values, np.ones(width) / width, mode="same")
+
+
+def detect_speech(
+    powers: np.ndarray,
+    margin_db: float = 12.0,
+    min_low_energy_ratio: float = 0.1,
+    min_speech: float = 0.25,
+    min_silence: float = 0.6,
+    padding: float = 0.2,
+) -> list[tuple[float, float]]:
+    """
+    Speech regions (seconds) from per-frame powers. Frames margin_db above the noise floor
+    (10th percentile) are active; gaps shorter than min_silence are bridged. An active region
+    is kept when it lasts min_speech and at least min_low_energy_ratio of its frames fall
+    below half the power of the surrounding second, then padded on both sides.
+    """
+    if powers.size == 0:
+        return []
+    energy_db = 10 * np.log10(powers + 1e-10)
+    threshold = max(float(np.percentile(energy_db, 10)) + margin_db, _SILENCE_FLOOR_DB)
+    active = energy_db > threshold
+    for start, end in _runs(~active):
+        if 0 < start and end < len(active) and (end - start) * FRAME_SECONDS < min_silence:
+            active[start:end] = True
+
+    low_energy = powers < 0.5 * _moving_average(powers, max(1, round(1.0 / FRAME_SECONDS)))
+    duration = len(powers) * FRAME_SECONDS
+    regions: list[tuple[float, float]] = []
+    for start, end in _runs(active):
+        if (end - start) * FRAME_SECONDS < min_speech or low_energy[start:end].mean() < min_low_energy_ratio:
+            continue
+        region_start = max(0.0, start * FRAME_SECONDS - padding)
+        region_end = min(duration, end * FRAME_SECONDS + padding)
+        if regions and region_start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], region_end)
+        else:
+            regions.append((region_start, region_end))
+    return [(round(start, 3), round(end, 3)) for start, end in regions]
+
+
+def _write_regions(file_path: str, target: Path, regions: list[tuple[float, float]]) -> None:
+    """Decode file_path again and re-encode only the regions to 16 kHz mono mp3."""
+    bounds = [(round(start * SAMPLE_RATE), round(end * SAMPLE_RATE)) for start, end in regions]
+    encoder = subprocess.Popen(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-i", "-", "-b:a", "32k", str(target)],
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        offset = 0
+        for chunk in _decode_pcm(file_path):
+            chunk_end = offset + len(chunk)
+            for start, end in bounds:
+                if start < chunk_end and end > offset:
+                    encoder.stdin.write(chunk[max(start, offset) - offset : min(end, chunk_end) - offset].tobytes())
+            offset = chunk_end
+    finally:
+        encoder.stdin.close()
+        stderr = encoder.stderr.read()
+        encoder.stderr.close()
+    if encoder.wait() != 0:
+        raise subprocess.CalledProcessError(encoder.returncode, "ffmpeg", stderr=stderr)
+
+
+def extract_speech(file_path: str, target: Path, min_removed: float | None = None) -> SpeechMap:
+    """
+    Detect speech in file_path and, when that drops at least min_removed of the audio
+    (VAD_MIN_REMOVED, default 5%), write only the speech to target. Returns the map either
+    way; target is left absent when the original should be transcribed as-is.
+    """
+    if min_removed is None:
+        min_removed = float(os.getenv("VAD_MIN_REMOVED", "0.05"))
+    powers = np.concatenate([frame_powers(chunk) for chunk in _decode_pcm(file_path)] or [np.zeros(0)])
+    regions = detect_speech(powers, margin_db=float(os.getenv("VAD_MARGIN_DB", "12")))
+    speech_map = SpeechMap(tuple(regions), round(len(powers) * FRAME_SECONDS, 3))
+    if not regions or speech_map.removed_fraction < min_removed:
+        return speech_map
+
+    partial = target.with_name(f"{target.stem}.partial{target.suffix}")
+    try:
+        _write_regions(file_path, partial, regions)
+        os.replace(partial, target)
+    finally:
+        partial.unlink(missing_ok=True)
+    return speech_map
@@ -0,0 +1,155 @@
+import html
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+_CUE_TIMING_RE = re.compile(
+    r"^((?:\d+:)?\d{2}:\d{2}\.\d{3})\s+-->\s+((?:\d+:)?\d{2}:\d{2}\.\d{3})"
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_HEADER_PREFIXES = ("WEBVTT", "Kind:", "Language:")
+_BLOCK_PREFIXES = ("NOTE", "STYLE", "REGION")
+# Rolling captions repeat the previous line; a 1-word match is too weak to treat as overlap
+_MIN_OVERLAP_WORDS = 2
+_OVERLAP_WINDOW_WORDS = 64
+
+
+@dataclass
+class VttCue:
+    start: float
+    end: float
+    text: str
+    # True when the text continues the previous cue (rolling-caption overlap was removed)
+    continues_previous: bool = False
+
+
+def _parse_timestamp(raw: str) -> float:
+    parts = raw.split(":")
+    seconds = float(parts[-1])
+    minutes = int(parts[-2]) if len(parts) >= 2 else 0
+    hours = int(parts[-3]) if len(parts) >= 3 else 0
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _clean_line(raw: str) -> str:
+    text = html.unescape(_TAG_RE.sub("", raw))
+    return " ".join(text.split())
+
+
+def iter_vtt_cues(lines: Iterable[str]) -> Iterator[VttCue]:
+    """
+    Parse WebVTT line by line (e.g. straight from a file handle) and yield cues with
+    plain text. Headers, NOTE/STYLE/REGION blocks, cue ids and tags are dropped.
+    """
+    in_block = False
+    start = end = 0.0
+    cue_lines: list[str] = []
+    in_cue = False
+    pending: str | None = None  # possible cue identifier, known only once the next line is read
+
+    def _flush() -> Iterator[VttCue]:
+        text = " ".join(line for line in cue_lines if line)
+        cue_lines.clear()
+        if text:
+            yield VttCue(start=start, end=end, text=text)
+
+    for line in lines:
+        raw = line.strip()
+
+        if not raw:
+            if pending is not None:
+                cue_lines.append(_clean_line(pending))
+                pending = None
+            yield from _flush()
+            in_block = False
+            in_cue = False
+            continue
+
+        if in_block:
+            continue
+
+        timing = _CUE_TIMING_RE.match(raw)
+        if timing:
+            pending = None
+            yield from _flush()
+            start = _parse_timestamp(timing.group(1))
+            end = _parse_timestamp(timing.group(2))
+            in_cue = True
+            continue
+
+        if in_cue:
+            cue_lines.append(_clean_line(raw))
+            continue
+
+        if raw.startswith(_HEADER_PREFIXES):
+            continue
+        if raw.startswith(_BLOCK_PREFIXES):
+            in_block = True
+            continue
+        if raw.isdigit():
+            continue
+
+        # Text outside a cue: either a cue identifier (if a timing line follows) or stray text
+        if pending is not None:
+            cue_lines.append(_clean_line(pending))
+        pending = raw
+
+    if pending is not None:
+        cue_lines.append(_clean_line(pending))
+    yield from _flush()
+
+
+def _fold(word: str) -> str:
+    return word.casefold()
+
+
+def merge_rolling_cues(cues: Iterable[VttCue]) -> Iterator[VttCue]:
+    """
+    Remove rolling-caption repetition: cues whose text is already the tail of what was
+    emitted are dropped, and cues starting with that tail keep only their new words.
+    """
+    tail: list[str] = []
+    for cue in cues:
+        words = cue.text.split()
+        folded = [_fold(w) for w in words]
+
+        overlap = 0
+        for size in range(min(len(tail), len(folded)), 0, -1):
+            if tail[-size] == folded[0] and tail[-size:] == folded[:size]:
+                overlap = size
+                break
+
+        if overlap == len(folded):
+            continue
+        if overlap < _MIN_OVERLAP_WORDS:
+            overlap = 0
+
+        new_words = words[overlap:]
+        tail = (tail + folded[overlap:])[-_OVERLAP_WINDOW_WORDS:] if overlap else folded[-_OVERLAP_WINDOW_WORDS:]
+        yield VttCue(start=cue.start, end=cue.end, text=" ".join(new_words), continues_previous=overlap > 0)
+
+
+def clean_vtt_lines(lines: Iterable[str]) -> str:
+    """
+    Stream VTT lines into plain text: one paragraph per cue, rolling captions merged
+    into running text.
+    """
+    parts: list[str] = []
+    for cue in merge_rolling_cues(iter_vtt_cues(lines)):
+        if parts:
+            parts.append(" " if cue.continues_previous else "\n\n")
+        parts.append(cue.text)
+    return "".join(parts)
+
+
+def parse_vtt_file(path: str | Path) -> list[VttCue]:
+    """Parse a VTT file into merged cues with timestamps."""
+    with open(path, "r", encoding="utf-8") as handle:
+        return list(merge_rolling_cues(iter_vtt_cues(handle)))
+
+
+def clean_vtt_file(path: str | Path) -> str:
+    with open(path, "r", encoding="utf-8") as handle:
+        return clean_vtt_lines(handle)
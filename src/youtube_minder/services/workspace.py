@@ -0,0 +1,145 @@
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from youtube_minder.config import DOWNLOADS_DIR, DOWNLOADS_MAX_BYTES, LOCKS_DIR
+from youtube_minder.utils.singleflight import file_lock
+
+
+_UNSAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def _tree_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _last_used(path: Path) -> float:
+    return max([path.stat().st_mtime, *(p.stat().st_mtime for p in path.iterdir())])
+
+
+class DownloadWorkspace:
+    """
+    Per-video download directories (subtitles, partial and finished audio) that outlive a
+    run, so a retry after a transcription or summary failure reuses the media or resumes
+    it. Kept under max_bytes by evicting the least recently used directories not in use.
+
+    A directory in use is pinned with a shared lock under lock_dir, so processes never
+    evict each other's active downloads.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, lock_dir: Path) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.lock_dir = Path(lock_dir)
+        self._lock = threading.Lock()
+        self._pins: dict[str, tuple[int, object]] = {}
+
+    def path_for(self, video_id: str) -> Path:
+        return self.root / (_UNSAFE_CHARS_RE.sub("_", video_id) or "_")
+
+    def _lock_path(self, name: str, suffix: str = "") -> Path:
+        return self.lock_dir / f"workspace-{name}{suffix}.lock"
+
+    def acquire(self, video_id: str) -> Path:
+        """Create (or reuse) the video's directory and pin it until release()."""
+        path = self.path_for(video_id)
+        with self._lock:
+            count, handle = self._pins.get(path.name, (0, None))
+            if handle is None:
+                self.lock_dir.mkdir(parents=True, exist_ok=True)
+                handle = open(self._lock_path(path.name), "a+")
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_SH)
+            self._pins[path.name] = (count + 1, handle)
+        path.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        return path
+
+    def release(self, video_id: str) -> None:
+        """Unpin the directory, keeping its files, and enforce the disk quota."""
+        path = self.path_for(video_id)
+        with self._lock:
+            count, handle = self._pins.pop(path.name, (0, None))
+            if count > 1:
+                self._pins[path.name] = (count - 1, handle)
+            elif handle is not None:
+                handle.close()  # drops the shared lock
+        if path.is_dir():
+            path.touch()
+        self.evict()
+
+    @contextmanager
+    def use(self, video_id: str) -> Iterator[Path]:
+        path = self.acquire(video_id)
+        try:
+            yield path
+        finally:
+            self.release(video_id)
+
+    @contextmanager
+    def download_lock(self, video_id: str) -> Iterator[None]:
+        """Serialize downloads into one video's directory across threads and processes."""
+        with file_lock(self._lock_path(self.path_for(video_id).name, ".download")):
+            yield
+
+    def _try_lock_exclusive(self, name: str):
+        handle = open(self._lock_path(name), "a+")
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                return None
+        return handle
+
+    def evict(self) -> list[Path]:
+        """Remove least recently used unpinned directories until the total fits max_bytes."""
+        if not self.root.is_dir():
+            return []
+        entries = []
+        for path in self.root.iterdir():
+            if path.is_dir():
+                try:
+                    entries.append((_last_used(path), path, _tree_size(path)))
+                except FileNotFoundError:
+                    continue  # removed concurrently
+        total = sum(size for _, _, size in entries)
+        removed: list[Path] = []
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with self._lock:
+                if path.name in self._pins:
+                    continue
+                handle = self._try_lock_exclusive(path.name)
+                if handle is None:
+                    continue
+                try:
+                    shutil.rmtree(path, ignore_errors=True)
+                finally:
+                    handle.close()
+            total -= size
+            removed.append(path)
+        return removed
+
+
+_default_workspace: DownloadWorkspace | None = None
+_default_workspace_lock = threading.Lock()
+
+
+def get_download_workspace() -> DownloadWorkspace:
+    """Process-wide workspace in DOWNLOADS_DIR, limited by DOWNLOADS_MAX_BYTES."""
+    global _default_workspace
+    with _default_workspace_lock:
+        if _default_workspace is None:
+            _default_workspace = DownloadWorkspace(DOWNLOADS_DIR, DOWNLOADS_MAX_BYTES, LOCKS_DIR)
+        return _default_workspace
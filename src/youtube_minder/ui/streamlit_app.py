@@ -1,5 +1,6 @@
 import re
 import sys
+import time
 from pathlib import Path
 from typing import List, Tuple
 
@@ -9,11 +10,15 @@ SRC_ROOT = Path(__file__).resolve().parents[2]
 if str(SRC_ROOT) not in sys.path:
     sys.path.insert(0, str(SRC_ROOT))
 
+from youtube_minder.config import AUDIO_MAX_DURATION, METRICS_PORT
 from youtube_minder.services.downloader import get_video_info
-from youtube_minder.workflows.processor import ProcessingError, process_video
+from youtube_minder.utils.metrics import serve_metrics
+from youtube_minder.workflows.jobs import get_job_queue
+from youtube_minder.workflows.prefetch import get_prefetcher
 
 
 URL_PATTERN = re.compile(r"(https?://)?(www\.)?(youtube\.com|youtu\.be)/")
+JOB_POLL_INTERVAL = 1.0
 
 
 def _is_valid_url(url: str) -> bool:
@@ -21,7 +26,7 @@ def _is_valid_url(url: str) -> bool:
 
 
 def _reset_state() -> None:
-    for key in ("video_info", "last_result", "log_messages"):
+    for key in ("video_info", "last_result", "last_stages", "job_id"):
         if key in st.session_state:
             del st.session_state[key]
 
@@ -36,8 +41,32 @@ def _render_logs(messages: List[Tuple[str, str]]) -> None:
             st.info(message)
 
 
+def _render_stages(stages: List[dict]) -> None:
+    if not stages:
+        return
+    with st.expander("Run breakdown"):
+        st.table(
+            [
+                {
+                    "stage": stage["stage"] + (" (cached)" if stage["cached"] else ""),
+                    "seconds": round(stage["duration"], 2),
+                    "downloaded MB": round(stage["bytes_downloaded"] / 1e6, 2),
+                    "ffmpeg s": round(stage["convert_seconds"], 2),
+                    "audio s": stage["audio_seconds"],
+                    "requests": stage["requests"],
+                    "prompt tokens": stage["prompt_tokens"],
+                    "cached tokens": stage.get("cached_tokens", 0),
+                    "completion tokens": stage["completion_tokens"],
+                }
+                for stage in stages
+            ]
+        )
+
+
 def main() -> None:
     st.set_page_config(page_title="YouTube Minder", page_icon="🎬", layout="centered")
+    if METRICS_PORT:
+        serve_metrics(METRICS_PORT)
 
     st.title("YouTube Minder")
     st.write("Summarize YouTube videos via subtitles or audio transcription.")
@@ -61,6 +90,8 @@ def main() -> None:
                     except Exception as exc:
                         st.error(f"Error fetching video info: {exc}")
                         st.stop()
+                # Subtitles (or a short video's audio) download while the options are chosen
+                get_prefetcher().start(url, st.session_state.video_info, ["en", "ru"])
 
     video_info = st.session_state.get("video_info")
     if video_info:
@@ -74,8 +105,8 @@ def main() -> None:
 
     method = None
     if video_info:
-        if video_info.get("duration", 0) > 1400:
-            st.info("Video is longer than 1400 seconds. Only subtitles are available.")
+        if video_info.get("duration", 0) > AUDIO_MAX_DURATION:
+            st.info(f"Video is longer than {AUDIO_MAX_DURATION} seconds. Only subtitles are available.")
             st.radio(
                 "Processing method",
                 ["Subtitles (faster)"],
@@ -100,35 +131,50 @@ def main() -> None:
             st.error("Please click 'Fetch video info' first.")
             st.stop()
 
-        if "log_messages" not in st.session_state:
-            st.session_state.log_messages = []
+        st.session_state.pop("last_result", None)
+        st.session_state.pop("last_stages", None)
+        st.session_state.job_id = get_job_queue().submit(
+            url=url,
+            language=language_code,
+            method=method,
+            video_info=video_info,
+        )
+
+    job_id = st.session_state.get("job_id")
+    if job_id:
+        job = get_job_queue().get(job_id)
+        if job is None:
+            del st.session_state["job_id"]
         else:
-            st.session_state.log_messages.clear()
-
-        log_placeholder = st.empty()
-
-        def on_update(message: str, level: str = "info") -> None:
-            st.session_state.log_messages.append((level, message))
-            with log_placeholder.container():
-                _render_logs(st.session_state.log_messages)
-
-        with st.spinner("Processing video..."):
-            try:
-                result = process_video(
-                    url=url,
-                    language=language_code,
-                    method=method,
-                    on_update=on_update,
-                    video_info=video_info,
-                )
-                st.session_state.last_result = result
-            except ProcessingError as exc:
-                on_update(str(exc), level="error")
-                st.stop()
+            _render_logs([(event.level, event.message) for event in job.events])
+            if job.status == "succeeded":
+                st.session_state.last_result = job.result
+                st.session_state.last_stages = job.stages
+                del st.session_state["job_id"]
+            elif job.status == "failed":
+                st.error(job.error or "Processing failed.")
+                del st.session_state["job_id"]
+            elif job.partial_summary:
+                st.subheader("Summary")
+                st.write_stream(get_job_queue().iter_summary(job_id))
+                st.rerun()
+            elif job.preview:
+                # Replaced by the streamed summary once its first delta arrives
+                st.subheader("Summary")
+                st.caption("Preview: key sentences from the transcript. The full summary is on its way...")
+                st.markdown(job.preview)
+                time.sleep(JOB_POLL_INTERVAL)
+                st.rerun()
+            else:
+                st.caption("Processing video..." if job.status == "running" else "Waiting for a free worker...")
+                time.sleep(JOB_POLL_INTERVAL)
+                st.rerun()
 
     result = st.session_state.get("last_result")
     if result:
         st.subheader("Summary")
+        if result.summary_is_fallback:
+            st.caption("OpenAI API was unavailable: key sentences from the transcript instead of a summary.")
         st.markdown(result.summary)
 
         st.subheader("Transcription")
@@ -140,6 +186,8 @@ def main() -> None:
         )
         st.caption("Generated file is cached in data/transcriptions.")
 
+        _render_stages(st.session_state.get("last_stages", []))
+
 
 if __name__ == "__main__":
     main()
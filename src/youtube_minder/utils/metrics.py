@@ -0,0 +1,237 @@
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator, TypeVar
+
+
+T = TypeVar("T")
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+@dataclass
+class StageEvent:
+    """One timed pipeline stage with what it consumed."""
+
+    stage: str
+    started_at: float
+    ended_at: float | None = None
+    status: str = "ok"
+    error: str | None = None
+    video_id: str | None = None
+    cached: bool = False
+    bytes_downloaded: int = 0
+    audio_seconds: float = 0.0
+    convert_seconds: float = 0.0
+    requests: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def duration(self) -> float:
+        return (self.ended_at or time.time()) - self.started_at
+
+    def add(self, **amounts: float) -> None:
+        # Chunk summaries, segment transcriptions and yt-dlp hooks report from worker threads
+        with self._lock:
+            for name, amount in amounts.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self) -> dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self) if not f.name.startswith("_")}
+        data["duration"] = round(self.duration, 4)
+        return data
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels) + "}"
+
+
+class MetricsRegistry:
+    """
+    In-process Prometheus-style counters and a stage duration histogram, fed by
+    finished StageEvents. Optionally appends every event as a JSON line to log_path.
+    """
+
+    def __init__(self, log_path: str | None = None, buckets: tuple[float, ...] = DURATION_BUCKETS) -> None:
+        self.log_path = log_path
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[tuple, tuple[list[int], float]] = {}
+
+    def _inc(self, name: str, labels: dict, value: float = 1) -> None:
+        series = self._counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0) + value
+
+    def record(self, event: StageEvent) -> None:
+        with self._lock:
+            self._inc("ym_stage_runs_total", {"stage": event.stage, "status": event.status})
+            if event.cached:
+                self._inc("ym_stage_cache_hits_total", {"stage": event.stage})
+            if event.bytes_downloaded:
+                self._inc("ym_downloaded_bytes_total", {"stage": event.stage}, event.bytes_downloaded)
+            if event.audio_seconds:
+                self._inc("ym_audio_seconds_total", {"stage": event.stage}, event.audio_seconds)
+            if event.convert_seconds:
+                self._inc("ym_convert_seconds_total", {"stage": event.stage}, event.convert_seconds)
+            if event.requests:
+                self._inc("ym_openai_requests_total", {"stage": event.stage}, event.requests)
+            for kind, tokens in (
+                ("prompt", event.prompt_tokens),
+                ("cached", event.cached_tokens),
+                ("completion", event.completion_tokens),
+            ):
+                if tokens:
+                    self._inc("ym_tokens_total", {"stage": event.stage, "kind": kind}, tokens)
+
+            key = (("stage", event.stage),)
+            counts, total = self._histograms.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, event.duration)] += 1
+            self._histograms[key] = (counts, total + event.duration)
+
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(event.as_dict()) + "\n")
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+            name = "ym_stage_duration_seconds"
+            lines.append(f"# TYPE {name} histogram")
+            for labels, (counts, total) in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{name}_bucket{_format_labels((*labels, ('le', le)))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+_registry: MetricsRegistry | None = None
+_registry_lock = threading.Lock()
+_current_stage: contextvars.ContextVar[StageEvent | None] = contextvars.ContextVar("ym_stage", default=None)
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide registry; METRICS_LOG_PATH enables the JSON-lines event log."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry(log_path=os.getenv("METRICS_LOG_PATH") or None)
+        return _registry
+
+
+def current_stage() -> StageEvent | None:
+    return _current_stage.get()
+
+
+@contextmanager
+def stage(
+    name: str,
+    on_event: Callable[[StageEvent], None] | None = None,
+    video_id: str | None = None,
+) -> Iterator[StageEvent]:
+    """
+    Time a pipeline stage. OpenAI usage recorded while it runs (record_usage) is added to
+    the yielded event; on exit the event goes to the registry and to on_event.
+    """
+    event = StageEvent(stage=name, started_at=time.time(), video_id=video_id)
+    token = _current_stage.set(event)
+    try:
+        yield event
+    except BaseException as exc:
+        event.status = "error"
+        event.error = str(exc) or exc.__class__.__name__
+        raise
+    finally:
+        _current_stage.reset(token)
+        event.ended_at = time.time()
+        get_metrics_registry().record(event)
+        if on_event:
+            on_event(event)
+
+
+def record_usage(usage) -> None:
+    """
+    Count one OpenAI request and its response.usage tokens (None for responses without
+    usage, e.g. text transcriptions) against the current stage, if any. cached_tokens is
+    the part of the prompt served from the provider's prompt cache.
+    """
+    event = _current_stage.get()
+    if event is None:
+        return
+    event.add(
+        requests=1,
+        prompt_tokens=getattr(usage, "prompt_tokens", None) or 0,
+        cached_tokens=getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", None) or 0,
+    )
+
+
+def bind_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Carry the caller's context (and so the current stage) into thread pool workers.
+    Each call runs in its own copy, so the wrapper is safe to use from many threads.
+    """
+    ctx = contextvars.copy_context()
+
+    def _run(*args, **kwargs) -> T:
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return _run
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_metrics_registry().render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_server: ThreadingHTTPServer | None = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Start (once per process) a background HTTP server exposing GET /metrics."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from youtube_minder.utils.hashing import get_sha256_hash
+
+
+T = TypeVar("T")
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Exclusive advisory lock shared between processes (no-op where fcntl is unavailable).
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution.
+
+    Callers in the same process wait on the leader's result. Across processes the leader
+    holds a file lock under lock_dir, so other processes run only after it finishes and
+    can pick its output up from the on-disk caches.
+    """
+
+    def __init__(self, lock_dir: Path) -> None:
+        self.lock_dir = Path(lock_dir)
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+
+    def is_inflight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._inflight
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            with file_lock(self.lock_dir / f"{get_sha256_hash(key)}.lock"):
+                result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
@@ -0,0 +1,75 @@
+import re
+
+
+# Rough chars-per-token ratio for gpt-4o family models on English/Russian text.
+_CHARS_PER_TOKEN = 4
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate used for chunking budgets (no tokenizer dependency).
+    """
+    if not text:
+        return 0
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+def _split_oversized(unit: str, max_tokens: int) -> list[str]:
+    """
+    Split a paragraph that exceeds the budget on sentences, then lines, then whitespace.
+    """
+    pieces = [s for s in _SENTENCE_SPLIT_RE.split(unit) if s.strip()]
+    if len(pieces) <= 1:
+        pieces = [s for s in unit.splitlines() if s.strip()]
+
+    result: list[str] = []
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    for piece in pieces:
+        if estimate_tokens(piece) <= max_tokens:
+            result.append(piece)
+            continue
+        # No natural boundary left: cut on whitespace close to the char budget
+        start = 0
+        while start < len(piece):
+            end = min(start + max_chars, len(piece))
+            if end < len(piece):
+                space = piece.rfind(" ", start, end)
+                if space > start:
+                    end = space
+            result.append(piece[start:end].strip())
+            start = end
+    return [p for p in result if p]
+
+
+def split_text(text: str, max_tokens: int) -> list[str]:
+    """
+    Split text into chunks of at most ~max_tokens, cutting on paragraph or
+    sentence boundaries whenever possible.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive.")
+
+    units: list[tuple[str, str]] = []
+    for paragraph in _PARAGRAPH_SPLIT_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            units.append((paragraph, "\n\n"))
+        else:
+            units.extend((piece, " ") for piece in _split_oversized(paragraph, max_tokens))
+
+    chunks: list[str] = []
+    current = ""
+    for unit, separator in units:
+        candidate = f"{current}{separator}{unit}" if current else unit
+        if current and estimate_tokens(candidate) > max_tokens:
+            chunks.append(current)
+            current = unit
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,229 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Literal, TypeVar
+
+from youtube_minder.services import notes, qa, summarizer
+from youtube_minder.services.cache import CacheKey, get_result_cache
+from youtube_minder.services.downloader import get_video_info
+from youtube_minder.services.extractive import extractive_summary
+from youtube_minder.services.openai_client import API_UNAVAILABLE_ERRORS
+from youtube_minder.utils import metrics
+from youtube_minder.workflows.prefetch import claim_prefetch
+from youtube_minder.workflows.processor import (
+    OnEvent,
+    ProcessingError,
+    ProcessingResult,
+    StatusLevel,
+    _emit,
+    _single_flight,
+    build_result,
+    notes_cache_key,
+    prepare_source,
+    processing_flight_key,
+    qa_cache_key,
+    qa_retrieval_cache_key,
+    qa_retrieval_top_k,
+    summary_cache_key,
+    transcribe_source,
+    transcript_index,
+)
+from youtube_minder.workflows.sources import acquire_download_dir, release_download_dir, setup_directories
+
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class AsyncProcessingResult:
+    result: ProcessingResult
+    notes_html: str | None = None
+    answers: str | None = None
+
+
+def _blocking_executor() -> ThreadPoolExecutor:
+    """Shared pool for blocking work (yt-dlp, ffmpeg, SQLite) used by the async path."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("ASYNC_BLOCKING_WORKERS", "16")),
+                thread_name_prefix="ym-blocking",
+            )
+        return _executor
+
+
+async def _run_blocking(fn: Callable[..., T], *args, **kwargs) -> T:
+    loop = asyncio.get_running_loop()
+    # run_in_executor does not carry contextvars over; bind them so stages see usage
+    call = metrics.bind_context(functools.partial(fn, *args, **kwargs))
+    return await loop.run_in_executor(_blocking_executor(), call)
+
+
+async def _cached(
+    stage: str,
+    key: CacheKey,
+    compute: Callable[[], Awaitable[str]],
+    on_event: OnEvent | None,
+) -> str:
+    cache = get_result_cache()
+    with metrics.stage(stage, on_event, key.video_id) as event:
+        cached = await _run_blocking(cache.get, key)
+        event.cached = cached is not None
+        if cached is not None:
+            return cached
+        value = await compute()
+    if value:
+        await _run_blocking(cache.set, key, value)
+    return value
+
+
+async def _summary_or_fallback(
+    key: CacheKey,
+    text: str,
+    language: str,
+    on_update: Callable[[str, StatusLevel], None] | None,
+    on_event: OnEvent | None,
+    on_preview: Callable[[str], None] | None,
+) -> tuple[str, bool]:
+    """
+    Cached LLM summary, or (uncached) the extractive summary while the API is unavailable;
+    the flag tells which. Mirrors summarize_transcript, including the preview.
+    """
+    cache = get_result_cache()
+    preview = None
+    with metrics.stage("summary", on_event, key.video_id) as event:
+        summary = await _run_blocking(cache.get, key)
+        event.cached = summary is not None
+        if summary is not None:
+            return summary, False
+        if on_preview:
+            preview = await _run_blocking(extractive_summary, text)
+            on_preview(preview)
+        try:
+            summary = await summarizer.summarize_text_async(text, language=language)
+        except API_UNAVAILABLE_ERRORS as exc:
+            event.status = "fallback"
+            event.error = str(exc) or exc.__class__.__name__
+            _emit(
+                on_update,
+                "OpenAI API is unavailable; showing key sentences from the transcript instead of a summary.",
+                "warning",
+            )
+            return (preview if preview is not None else await _run_blocking(extractive_summary, text)), True
+    if summary:
+        await _run_blocking(cache.set, key, summary)
+    return summary, False
+
+
+def _load_transcript(
+    url: str,
+    language: str,
+    method: Literal["subs", "audio"],
+    video_info: dict,
+    on_update: Callable[[str, StatusLevel], None] | None,
+    on_event: OnEvent | None,
+    engine: str | None = None,
+):
+    flight_key = processing_flight_key(video_info["id"], method, language, engine)
+
+    def _run():
+        download_dir = acquire_download_dir(video_info["id"])
+        claim_prefetch(video_info["id"])
+        try:
+            source = prepare_source(url, language, method, video_info, download_dir, on_update, on_event, engine)
+            transcribe_source(source, on_update, on_event, engine)
+            return source
+        finally:
+            release_download_dir(video_info["id"])
+
+    return _single_flight.do(f"{flight_key}|transcript", _run)
+
+
+async def _answers(video_id: str, text: str, questions: list[str], on_event: OnEvent | None) -> str:
+    """Mirrors answer_video_questions: long transcripts are answered from retrieved passages."""
+    top_k = qa_retrieval_top_k(text)
+    if top_k is None:
+        return await _cached(
+            "qa", qa_cache_key(video_id, text, questions), lambda: qa.answer_questions_async(text, questions), on_event
+        )
+
+    async def _compute() -> str:
+        index = await _run_blocking(transcript_index, video_id, text)
+        return await qa.answer_questions_retrieval_async(index, questions, top_k=top_k)
+
+    return await _cached("qa", qa_retrieval_cache_key(video_id, text, questions, top_k), _compute, on_event)
+
+
+async def process_video_async(
+    url: str,
+    language: str,
+    method: Literal["subs", "audio"],
+    on_update: Callable[[str, StatusLevel], None] | None = None,
+    video_info: dict | None = None,
+    with_notes: bool = False,
+    questions: list[str] | None = None,
+    on_event: OnEvent | None = None,
+    engine: str | None = None,
+    on_preview: Callable[[str], None] | None = None,
+) -> AsyncProcessingResult:
+    """
+    Async counterpart of process_video. yt-dlp, ffmpeg and file I/O run in a thread pool;
+    summary, notes and Q&A for the transcript are generated concurrently with AsyncOpenAI.
+    """
+    if not url:
+        raise ProcessingError("Missing YouTube URL.")
+
+    try:
+        await _run_blocking(setup_directories)
+        if video_info is None:
+            _emit(on_update, "Fetching video info...")
+            with metrics.stage("metadata", on_event):
+                video_info = await _run_blocking(get_video_info, url)
+
+        source = await _run_blocking(
+            _load_transcript, url, language, method, video_info, on_update, on_event, engine
+        )
+        text = source.transcription_text or ""
+        video_id = video_info["id"]
+
+        _emit(on_update, "Summarizing...")
+        tasks: list[Awaitable] = [
+            _summary_or_fallback(
+                summary_cache_key(video_id, text, language), text, language, on_update, on_event, on_preview
+            )
+        ]
+        if with_notes:
+            tasks.append(
+                _cached(
+                    "notes",
+                    notes_cache_key(video_info, text, language),
+                    lambda: notes.generate_notes_html_async(
+                        text, language=language, title=video_info["title"], cache=get_result_cache(), video_id=video_id
+                    ),
+                    on_event,
+                )
+            )
+        if questions:
+            tasks.append(_answers(video_id, text, questions, on_event))
+        outputs = await asyncio.gather(*tasks)
+    except ProcessingError:
+        raise
+    except Exception as exc:
+        raise ProcessingError(str(exc)) from exc
+
+    outputs = list(outputs)
+    summary, summary_is_fallback = outputs.pop(0)
+    notes_html = outputs.pop(0) if with_notes else None
+    answers = outputs.pop(0) if questions else None
+    return AsyncProcessingResult(
+        result=build_result(source, summary, summary_is_fallback),
+        notes_html=notes_html,
+        answers=answers,
+    )
@@ -0,0 +1,314 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Literal
+
+from youtube_minder.services.downloader import expand_playlist, extract_video_id, get_video_info
+from youtube_minder.workflows.processor import (
+    SourceMaterial,
+    prepare_source,
+    summarize_transcript,
+    transcribe_source,
+)
+from youtube_minder.workflows.sources import acquire_download_dir, release_download_dir, setup_directories
+
+
+REPORT_FIELDS = [
+    "index",
+    "url",
+    "video_id",
+    "title",
+    "status",
+    "failed_stage",
+    "error",
+    "used_cache",
+    "transcription_path",
+    "summary",
+    "summary_is_fallback",
+    "elapsed_seconds",
+]
+
+
+@dataclass
+class StageLimits:
+    """Per-stage concurrency limits for the batch pipeline."""
+
+    metadata: int = 4
+    fetch: int = 2
+    transcribe: int = 2
+    summarize: int = 4
+
+    @classmethod
+    def from_env(cls) -> "StageLimits":
+        return cls(
+            metadata=int(os.getenv("BATCH_METADATA_WORKERS", "4")),
+            fetch=int(os.getenv("BATCH_FETCH_WORKERS", "2")),
+            transcribe=int(os.getenv("BATCH_TRANSCRIBE_WORKERS", "2")),
+            summarize=int(os.getenv("BATCH_SUMMARIZE_WORKERS", "4")),
+        )
+
+
+@dataclass
+class BatchItem:
+    index: int
+    url: str
+    video_info: dict | None = None
+    source: SourceMaterial | None = None
+    transcription_text: str | None = None
+    summary: str | None = None
+    summary_is_fallback: bool = False
+    failed_stage: str | None = None
+    error: str | None = None
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+
+    def to_row(self) -> dict:
+        info = self.video_info or {}
+        return {
+            "index": self.index,
+            "url": self.url,
+            "video_id": info.get("id", ""),
+            "title": info.get("title", ""),
+            "status": "failed" if self.error else "ok",
+            "failed_stage": self.failed_stage or "",
+            "error": self.error or "",
+            "used_cache": bool(self.source and self.source.used_cache),
+            "transcription_path": str(self.source.cache_path) if self.source else "",
+            "summary": self.summary or "",
+            "summary_is_fallback": self.summary_is_fallback,
+            "elapsed_seconds": round((self.finished_at or time.monotonic()) - self.started_at, 3),
+        }
+
+
+def _read_sources(sources: list[str]) -> list[str]:
+    """Flatten URL arguments and files containing one URL per line (# comments allowed)."""
+    urls: list[str] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_file():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    urls.append(line)
+        else:
+            urls.append(source)
+    return urls
+
+
+def expand_sources(sources: list[str]) -> list[str]:
+    """
+    Resolve URLs, URL files, playlists and channels into a de-duplicated list of video URLs.
+    URLs without a video id are treated as playlists/channels and flat-extracted.
+    """
+    urls: list[str] = []
+    seen: set[str] = set()
+    for url in _read_sources(sources):
+        expanded = [url] if extract_video_id(url) else expand_playlist(url)
+        for video_url in expanded:
+            key = extract_video_id(video_url) or video_url
+            if key not in seen:
+                seen.add(key)
+                urls.append(video_url)
+    return urls
+
+
+class ReportWriter:
+    """Thread-safe JSONL or CSV report, chosen by file extension."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._is_csv = self.path.suffix.lower() == ".csv"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, "w", encoding="utf-8", newline="")
+        self._csv = None
+        if self._is_csv:
+            self._csv = csv.DictWriter(self._handle, fieldnames=REPORT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, row: dict) -> None:
+        with self._lock:
+            if self._csv is not None:
+                self._csv.writerow(row)
+            else:
+                self._handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+
+class _Pipeline:
+    """
+    Run items through stages, each with its own bounded thread pool. An item moves to the
+    next stage as soon as it leaves the previous one, so the slowest stage sets throughput.
+    """
+
+    def __init__(
+        self,
+        stages: list[tuple[str, Callable[[BatchItem], None], int]],
+        on_done: Callable[[BatchItem], None],
+    ) -> None:
+        self.stages = stages
+        self.on_done = on_done
+        self._pools = [
+            ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"batch-{name}")
+            for name, _, workers in stages
+        ]
+        self._remaining = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+
+    def run(self, items: list[BatchItem]) -> None:
+        if not items:
+            return
+        self._remaining = len(items)
+        try:
+            for item in items:
+                self._advance(item, 0)
+            self._finished.wait()
+        finally:
+            for pool in self._pools:
+                pool.shutdown(wait=True)
+
+    def _advance(self, item: BatchItem, stage_idx: int) -> None:
+        if item.error or stage_idx >= len(self.stages):
+            item.finished_at = time.monotonic()
+            try:
+                self.on_done(item)
+            finally:
+                with self._lock:
+                    self._remaining -= 1
+                    if self._remaining == 0:
+                        self._finished.set()
+            return
+        self._pools[stage_idx].submit(self._run_stage, item, stage_idx)
+
+    def _run_stage(self, item: BatchItem, stage_idx: int) -> None:
+        name, fn, _ = self.stages[stage_idx]
+        try:
+            fn(item)
+        except Exception as exc:
+            item.failed_stage = name
+            item.error = str(exc) or exc.__class__.__name__
+        self._advance(item, stage_idx + 1)
+
+
+def process_batch(
+    sources: list[str],
+    report_path: Path,
+    language: str = "en",
+    method: Literal["subs", "audio"] = "subs",
+    limits: StageLimits | None = None,
+    on_item_done: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """
+    Process every video from the given URLs/files/playlists through a staged pipeline
+    (metadata -> fetch -> transcription -> summary) and write one report row per video.
+    Per-item failures are recorded in the report instead of stopping the batch.
+    """
+    setup_directories()
+    limits = limits or StageLimits.from_env()
+    urls = expand_sources(sources)
+    items = [BatchItem(index=idx, url=url) for idx, url in enumerate(urls)]
+
+    def _metadata(item: BatchItem) -> None:
+        item.video_info = get_video_info(item.url)
+
+    def _fetch(item: BatchItem) -> None:
+        download_dir = acquire_download_dir(item.video_info["id"])
+        try:
+            item.source = prepare_source(item.url, language, method, item.video_info, download_dir)
+        except Exception:
+            release_download_dir(item.video_info["id"])
+            raise
+
+    def _transcribe(item: BatchItem) -> None:
+        try:
+            item.transcription_text = transcribe_source(item.source)
+        finally:
+            release_download_dir(item.video_info["id"])
+
+    def _summarize(item: BatchItem) -> None:
+        item.summary = summarize_transcript(
+            item.video_info["id"],
+            item.transcription_text,
+            language,
+            on_fallback=lambda: setattr(item, "summary_is_fallback", True),
+        )
+
+    rows: list[dict] = []
+    writer = ReportWriter(report_path)
+
+    def _done(item: BatchItem) -> None:
+        row = item.to_row()
+        rows.append(row)
+        writer.write(row)
+        if on_item_done:
+            on_item_done(row)
+
+    pipeline = _Pipeline(
+        [
+            ("metadata", _metadata, limits.metadata),
+            ("fetch", _fetch, limits.fetch),
+            ("transcribe", _transcribe, limits.transcribe),
+            ("summarize", _summarize, limits.summarize),
+        ],
+        on_done=_done,
+    )
+    try:
+        pipeline.run(items)
+    finally:
+        writer.close()
+    return sorted(rows, key=lambda row: row["index"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize many YouTube videos (URLs, URL files, playlists).")
+    parser.add_argument("sources", nargs="+", help="Video/playlist/channel URLs or files with one URL per line.")
+    parser.add_argument("--report", default="batch_report.jsonl", help="Report path (.jsonl or .csv).")
+    parser.add_argument("--language", choices=["en", "ru"], default="en")
+    parser.add_argument("--method", choices=["subs", "audio"], default="subs")
+    defaults = StageLimits.from_env()
+    parser.add_argument("--metadata-workers", type=int, default=defaults.metadata)
+    parser.add_argument("--fetch-workers", type=int, default=defaults.fetch)
+    parser.add_argument("--transcribe-workers", type=int, default=defaults.transcribe)
+    parser.add_argument("--summarize-workers", type=int, default=defaults.summarize)
+    args = parser.parse_args(argv)
+
+    limits = StageLimits(
+        metadata=args.metadata_workers,
+        fetch=args.fetch_workers,
+        transcribe=args.transcribe_workers,
+        summarize=args.summarize_workers,
+    )
+
+    def _print_row(row: dict) -> None:
+        status = row["status"] if row["status"] == "ok" else f"failed at {row['failed_stage']}: {row['error']}"
+        if row["summary_is_fallback"]:
+            status += " (API unavailable: extractive summary)"
+        print(f"[{row['index']}] {row['url']} -> {status}", file=sys.stderr)
+
+    rows = process_batch(
+        args.sources,
+        Path(args.report),
+        language=args.language,
+        method=args.method,
+        limits=limits,
+        on_item_done=_print_row,
+    )
+    failed = sum(1 for row in rows if row["status"] == "failed")
+    print(f"Processed {len(rows)} videos, {failed} failed. Report: {args.report}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
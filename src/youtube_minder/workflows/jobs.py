@@ -0,0 +1,343 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator, Literal
+
+from youtube_minder.config import JOB_STALE_SECONDS, JOB_WORKERS, JOBS_DB_PATH
+from youtube_minder.utils.metrics import StageEvent
+from youtube_minder.workflows.processor import ProcessingError, ProcessingResult, process_video
+
+
+logger = logging.getLogger(__name__)
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT,
+    partial_summary TEXT,
+    preview TEXT,
+    stages TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created_at ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_job_id ON job_events (job_id, id);
+"""
+
+
+@dataclass
+class JobEvent:
+    created_at: float
+    level: str
+    message: str
+
+
+@dataclass
+class Job:
+    id: str
+    status: JobStatus
+    params: dict
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: ProcessingResult | None = None
+    partial_summary: str = ""
+    preview: str = ""
+    stages: list[dict] = field(default_factory=list)
+    error: str | None = None
+    events: list[JobEvent] = field(default_factory=list)
+
+    @property
+    def is_done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+
+def _result_to_json(result: ProcessingResult) -> str:
+    data = asdict(result)
+    data["transcription_path"] = str(result.transcription_path)
+    return json.dumps(data)
+
+
+def _result_from_json(raw: str) -> ProcessingResult:
+    data = json.loads(raw)
+    data["transcription_path"] = Path(data["transcription_path"])
+    return ProcessingResult(**data)
+
+
+class JobQueue:
+    """
+    Video processing jobs persisted in SQLite and executed by a pool of worker threads.
+
+    Several processes may share one database: workers claim queued jobs atomically, so
+    the total concurrency is the sum of the pools and can be capped against API limits.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        workers: int,
+        poll_interval: float = 1.0,
+        summary_flush_interval: float = 0.2,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.summary_flush_interval = summary_flush_interval
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._requeue_stale()
+            self._stop.clear()
+            for idx in range(max(1, self.workers)):
+                thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{idx}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, url: str, language: str, method: str, video_info: dict | None = None) -> str:
+        job_id = uuid.uuid4().hex
+        params = {"url": url, "language": language, "method": method, "video_info": video_info}
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO jobs (id, status, params, created_at) VALUES (?, 'queued', ?, ?)",
+                (job_id, json.dumps(params), time.time()),
+            )
+        finally:
+            conn.close()
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Job | None:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            events = conn.execute(
+                "SELECT created_at, level, message FROM job_events WHERE job_id = ? ORDER BY id", (job_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return Job(
+            id=row["id"],
+            status=row["status"],
+            params=json.loads(row["params"]),
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            result=_result_from_json(row["result"]) if row["result"] else None,
+            partial_summary=row["partial_summary"] or "",
+            preview=row["preview"] or "",
+            stages=json.loads(row["stages"]) if row["stages"] else [],
+            error=row["error"],
+            events=[JobEvent(e["created_at"], e["level"], e["message"]) for e in events],
+        )
+
+    def add_event(self, job_id: str, message: str, level: str = "info") -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO job_events (job_id, created_at, level, message) VALUES (?, ?, ?, ?)",
+                (job_id, time.time(), level, message),
+            )
+        finally:
+            conn.close()
+
+    def iter_summary(self, job_id: str, poll_interval: float = 0.1) -> Iterator[str]:
+        """
+        Yield the job's summary text as it is streamed in, until the job finishes.
+        """
+        sent = 0
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                return
+            text = job.result.summary if job.result else job.partial_summary
+            if len(text) > sent:
+                yield text[sent:]
+                sent = len(text)
+            if job.is_done:
+                return
+            time.sleep(poll_interval)
+
+    def _set_partial_summary(self, job_id: str, text: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE jobs SET partial_summary = ? WHERE id = ?", (text, job_id))
+        finally:
+            conn.close()
+
+    def _set_preview(self, job_id: str, text: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE jobs SET preview = ? WHERE id = ?", (text, job_id))
+        finally:
+            conn.close()
+
+    def _set_stages(self, job_id: str, stages: list[dict]) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE jobs SET stages = ? WHERE id = ?", (json.dumps(stages), job_id))
+        finally:
+            conn.close()
+
+    def _requeue_stale(self) -> None:
+        """Put back jobs left running by a worker process that died."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running' AND started_at < ?",
+                (time.time() - JOB_STALE_SECONDS,),
+            )
+        finally:
+            conn.close()
+
+    def _claim_next(self) -> Job | None:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (time.time(), row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return self.get(row["id"])
+
+    def _finish(self, job_id: str, status: JobStatus, result: str | None = None, error: str | None = None) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+        finally:
+            conn.close()
+
+    def _run(self, job: Job) -> None:
+        params = job.params
+        summary_parts: list[str] = []
+        last_flush = 0.0
+
+        def on_summary_delta(delta: str) -> None:
+            nonlocal last_flush
+            summary_parts.append(delta)
+            now = time.monotonic()
+            if now - last_flush >= self.summary_flush_interval:
+                last_flush = now
+                self._set_partial_summary(job.id, "".join(summary_parts))
+
+        stages: list[dict] = []
+
+        def on_event(event: StageEvent) -> None:
+            stages.append(event.as_dict())
+            self._set_stages(job.id, stages)
+
+        try:
+            result = process_video(
+                url=params["url"],
+                language=params["language"],
+                method=params["method"],
+                on_update=lambda message, level="info": self.add_event(job.id, message, level),
+                video_info=params.get("video_info"),
+                on_summary_delta=on_summary_delta,
+                on_event=on_event,
+                on_preview=lambda text: self._set_preview(job.id, text),
+            )
+        except ProcessingError as exc:
+            self._finish(job.id, "failed", error=str(exc))
+        except Exception as exc:
+            self._finish(job.id, "failed", error=f"Unexpected error: {exc}")
+        else:
+            self._finish(job.id, "succeeded", result=_result_to_json(result))
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            job = None
+            try:
+                job = self._claim_next()
+                if job is None:
+                    self._wakeup.wait(self.poll_interval)
+                    self._wakeup.clear()
+                    continue
+                self._run(job)
+            except Exception as exc:
+                # A database error must not kill the worker; back off and keep serving jobs
+                logger.exception("Job worker error%s", f" while running job {job.id}" if job else "")
+                if job is not None:
+                    self._fail_after_worker_error(job.id, exc)
+                self._stop.wait(self.poll_interval)
+
+    def _fail_after_worker_error(self, job_id: str, exc: Exception) -> None:
+        """Mark the job failed; if even that fails, it is requeued once stale (JOB_STALE_SECONDS)."""
+        try:
+            self._finish(job_id, "failed", error=f"Unexpected error: {exc}")
+        except Exception:
+            logger.exception("Could not mark job %s failed", job_id)
+
+
+_default_queue: JobQueue | None = None
+_default_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue stored in DATA_DIR, started on first use."""
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue(JOBS_DB_PATH, JOB_WORKERS)
+            _default_queue.start()
+        return _default_queue
@@ -0,0 +1,127 @@
+"""
+Speculative fetch started as soon as a video's metadata is known, so the subtitle download
+and VTT cleaning (or, for a short video without subtitles, the audio download) overlap the
+time the user spends choosing options. Results land where process_video looks for them: the
+subtitle cache and the video's download directory. prepare_source takes the same download
+lock, so a run started mid-prefetch waits for it instead of fetching twice.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from youtube_minder.config import AUDIO_MAX_DURATION, PREFETCH_AUDIO_MAX_DURATION, PREFETCH_TTL_SECONDS
+from youtube_minder.services.downloader import download_audio, download_subtitle_tracks, find_audio_file
+from youtube_minder.utils import metrics
+from youtube_minder.workflows.sources import (
+    acquire_download_dir,
+    download_lock,
+    load_cached_subtitles,
+    release_download_dir,
+    setup_directories,
+    store_subtitles,
+    subtitle_langs,
+)
+
+
+@dataclass
+class _Prefetch:
+    future: Future
+    timer: threading.Timer
+
+
+def prefetch_source(url: str, video_info: dict, langs: list[str], audio_max_duration: int) -> str:
+    """
+    Fetch what a run for video_info will need into its download directory, which stays
+    pinned for the caller to release. Returns "subs", "audio" or "none" for what is now local.
+    """
+    video_id = video_info["id"]
+    duration = video_info.get("duration") or 0
+    download_dir = acquire_download_dir(video_id)
+    with metrics.stage("prefetch", video_id=video_id):
+        with download_lock(video_id):
+            if load_cached_subtitles(video_id, langs) is not None:
+                return "subs"
+            tracks = download_subtitle_tracks(url, download_dir, langs)
+            store_subtitles(video_id, langs, tracks)
+            if tracks:
+                return "subs"
+            if not 0 < duration <= min(audio_max_duration, AUDIO_MAX_DURATION):
+                return "none"
+            if find_audio_file(download_dir, video_id) is None:
+                download_audio(url, download_dir)
+            return "audio"
+
+
+class Prefetcher:
+    """
+    Background prefetches keyed by video id. Each pins the video's download directory until
+    it is claimed by the run that uses it or ttl seconds pass, whichever comes first; after
+    that the files are ordinary workspace entries the LRU eviction may remove.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        ttl: float = PREFETCH_TTL_SECONDS,
+        audio_max_duration: int = PREFETCH_AUDIO_MAX_DURATION,
+    ) -> None:
+        self.ttl = ttl
+        self.audio_max_duration = audio_max_duration
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ym-prefetch")
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Prefetch] = {}
+
+    def start(self, url: str, video_info: dict, languages: list[str]) -> Future:
+        """Prefetch subtitles in every summary language the user may pick (no-op if already started)."""
+        video_id = video_info["id"]
+        langs = list(dict.fromkeys(lang for language in languages for lang in subtitle_langs(language)))
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is not None:
+                return entry.future
+            setup_directories()
+            future = self._pool.submit(prefetch_source, url, video_info, langs, self.audio_max_duration)
+            timer = threading.Timer(self.ttl, self._drop, args=(video_id,))
+            timer.daemon = True
+            self._entries[video_id] = _Prefetch(future, timer)
+        timer.start()
+        return future
+
+    def claim(self, video_id: str) -> bool:
+        """
+        Hand the prefetch over to a run that has pinned the directory itself: a prefetch still
+        queued is cancelled (the run fetches for itself), one in progress finishes under the
+        download lock the run waits on. Returns whether there was a prefetch for the video.
+        """
+        return self._drop(video_id)
+
+    def _drop(self, video_id: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(video_id, None)
+        if entry is None:
+            return False
+        entry.timer.cancel()
+        if not entry.future.cancel():
+            # Unpin once it has finished; runs immediately when it already has
+            entry.future.add_done_callback(lambda _: release_download_dir(video_id))
+        return True
+
+
+_default_prefetcher: Prefetcher | None = None
+_default_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher:
+    """Process-wide prefetcher, with PREFETCH_TTL_SECONDS and PREFETCH_AUDIO_MAX_DURATION."""
+    global _default_prefetcher
+    with _default_prefetcher_lock:
+        if _default_prefetcher is None:
+            _default_prefetcher = Prefetcher()
+        return _default_prefetcher
+
+
+def claim_prefetch(video_id: str) -> bool:
+    """Prefetcher.claim on the process-wide prefetcher, if one was ever started."""
+    with _default_prefetcher_lock:
+        prefetcher = _default_prefetcher
+    return prefetcher is not None and prefetcher.claim(video_id)
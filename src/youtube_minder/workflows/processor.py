@@ -1,17 +1,48 @@
+import json
 import os
-import shutil
+import queue
+import subprocess
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Literal
+from typing import Callable, Iterator, Literal
 
-from youtube_minder.config import DATA_DIR, DOWNLOADS_DIR, TRANSCRIPTIONS_DIR
-from youtube_minder.services.downloader import download_audio, get_video_info, download_subtitles
-from youtube_minder.services.transcriber import transcribe_openai
-from youtube_minder.services.summarizer import summarize_text
+from youtube_minder.config import AUDIO_MAX_DURATION, LOCKS_DIR, TRANSCRIPTIONS_DIR
+from youtube_minder.services import notes, qa, summarizer, vad
+from youtube_minder.services.extractive import extractive_summary
+from youtube_minder.services.openai_client import API_UNAVAILABLE_ERRORS
+from youtube_minder.services.cache import CacheKey, get_result_cache
+from youtube_minder.services.downloader import (
+    download_audio,
+    download_subtitle_tracks,
+    find_audio_file,
+    get_video_info,
+)
+from youtube_minder.services.retrieval import TranscriptIndex, load_or_build_index
+from youtube_minder.services.transcriber import get_transcription_engine, transcription_engine_name
 from youtube_minder.utils.hashing import get_sha256_hash
+from youtube_minder.utils import metrics
+from youtube_minder.utils.singleflight import SingleFlight
+from youtube_minder.utils.text import estimate_tokens
+from youtube_minder.workflows.prefetch import claim_prefetch
+from youtube_minder.workflows.sources import (
+    acquire_download_dir,
+    download_lock,
+    load_cached_subtitles,
+    release_download_dir,
+    setup_directories,
+    store_subtitles,
+    subtitle_langs,
+    subtitle_track_path,
+    transcription_cache_path,
+)
 
 
 StatusLevel = Literal["info", "warning", "error"]
+OnEvent = Callable[[metrics.StageEvent], None]
+
+# Deduplicates concurrent runs for the same (video, method, language) within and across processes
+_single_flight = SingleFlight(LOCKS_DIR)
 
 
 class ProcessingError(RuntimeError):
@@ -27,6 +58,8 @@ class ProcessingResult:
     is_subtitle: bool
     used_cache: bool
     video_info: dict
+    # The summary is the local extractive one because the OpenAI API was unavailable
+    summary_is_fallback: bool = False
 
 
 def _emit(on_update: Callable[[str, StatusLevel], None] | None, message: str, level: StatusLevel = "info") -> None:
@@ -34,112 +67,523 @@ def _emit(on_update: Callable[[str, StatusLevel], None] | None, message: str, le
         on_update(message, level)
 
 
-def setup_directories() -> None:
-    """Creates necessary directories for data storage if they don't exist."""
-    Path(DATA_DIR).mkdir(parents=True, exist_ok=True)
-    Path(DOWNLOADS_DIR).mkdir(parents=True, exist_ok=True)
-    Path(TRANSCRIPTIONS_DIR).mkdir(parents=True, exist_ok=True)
-
-
 def process_video(
     url: str,
     language: str,
     method: Literal["subs", "audio"],
     on_update: Callable[[str, StatusLevel], None] | None = None,
     video_info: dict | None = None,
+    on_summary_delta: Callable[[str], None] | None = None,
+    on_event: OnEvent | None = None,
+    engine: str | None = None,
+    on_preview: Callable[[str], None] | None = None,
 ) -> ProcessingResult:
-    """Process a YouTube video and return summary + transcription details."""
+    """
+    Process a YouTube video and return summary + transcription details.
+    With on_summary_delta the summary is streamed and each text delta is passed to it.
+    on_preview receives an instant extractive summary before the LLM summary starts.
+    on_event receives a StageEvent (timings, bytes, audio seconds, tokens) per finished stage.
+    engine picks the speech-to-text backend for audio ("openai" or "local"; default TRANSCRIBE_ENGINE).
+    A call that joins an identical run already in flight waits for its result, then gets the
+    transcript and summary stages as cached events, the summary as a single delta, and a
+    fallback summary through on_preview, like a run served from the caches.
+    """
     if not url:
         raise ProcessingError("Missing YouTube URL.")
 
     setup_directories()
 
-    download_dir: str | None = None
-    cache_path: Path | None = None
-    display_filename: str | None = None
+    if video_info is None:
+        _emit(on_update, "Fetching video info...")
+        try:
+            with metrics.stage("metadata", on_event):
+                video_info = get_video_info(url)
+        except Exception as exc:
+            raise ProcessingError(str(exc)) from exc
 
-    try:
-        if video_info is None:
-            _emit(on_update, "Fetching video info...")
-            video_info = get_video_info(url)
-
-        title = video_info["title"]
-        video_id = video_info["id"]
-        duration = video_info["duration"]
-
-        name_hash = get_sha256_hash(url)
-        download_dir = os.path.join(DOWNLOADS_DIR, name_hash)
-
-        safe_title = "".join([c for c in title if c.isalpha() or c.isdigit() or c == " "]).rstrip()
-        filename_base = f"{safe_title}_{video_id}"
-
-        transcription_text = ""
-        is_subtitle = False
-
-        if method == "subs":
-            is_subtitle = True
-            cache_path = Path(TRANSCRIPTIONS_DIR) / f"{video_id}_subtitles_{language}.txt"
-            display_filename = f"{filename_base}_subtitles_{language}.txt"
-        elif method == "audio":
-            cache_path = Path(TRANSCRIPTIONS_DIR) / f"{video_id}_transcription.txt"
-            display_filename = f"{filename_base}_transcription.txt"
-        else:
-            raise ProcessingError("Unknown processing method.")
+    flight_key = processing_flight_key(video_info["id"], method, language, engine)
+    if _single_flight.is_inflight(flight_key):
+        _emit(on_update, "This video is already being processed; waiting for that result...")
+    led = []
+
+    def _run() -> ProcessingResult:
+        led.append(True)
+        return _process_video(
+            url, language, method, on_update, video_info, on_summary_delta, on_event, engine, on_preview
+        )
+
+    result = _single_flight.do(flight_key, _run)
+    if not led:
+        _replay_to_follower(result, on_summary_delta, on_event, on_preview)
+    return result
+
+
+def _replay_to_follower(
+    result: ProcessingResult,
+    on_summary_delta: Callable[[str], None] | None,
+    on_event: OnEvent | None,
+    on_preview: Callable[[str], None] | None,
+) -> None:
+    # The leader's callbacks went to its own caller; hand this one what a cached run would see
+    video_id = result.video_info["id"]
+    with metrics.stage("subtitles" if result.is_subtitle else "transcription", on_event, video_id) as event:
+        event.cached = True
+    with metrics.stage("summary", on_event, video_id) as event:
+        event.cached = True
+        if result.summary_is_fallback:
+            event.status = "fallback"
+    if result.summary_is_fallback:
+        if on_preview:
+            on_preview(result.summary)
+    elif on_summary_delta:
+        on_summary_delta(result.summary)
+
+
+def processing_flight_key(video_id: str, method: str, language: str, engine: str | None = None) -> str:
+    """Single-flight key of a run; audio runs with different engines produce different transcripts."""
+    if method == "audio":
+        return f"{video_id}|{method}|{language}|{transcription_engine_name(engine)}"
+    return f"{video_id}|{method}|{language}"
 
-        used_cache = False
-        if cache_path and cache_path.is_file() and cache_path.stat().st_size > 0:
-            transcription_text = cache_path.read_text(encoding="utf-8")
-            used_cache = True
-            _emit(on_update, "Using cached subtitles." if is_subtitle else "Using cached transcription.")
+
+@dataclass
+class SourceMaterial:
+    """Transcript source for one video: cached/subtitle text, or downloaded audio to transcribe."""
+
+    video_info: dict
+    method: Literal["subs", "audio"]
+    language: str
+    download_dir: str
+    cache_path: Path
+    display_filename: str
+    transcription_text: str | None = None
+    audio_path: str | None = None
+    speech_map: vad.SpeechMap | None = None
+    used_cache: bool = False
+
+    @property
+    def is_subtitle(self) -> bool:
+        return self.method == "subs"
+
+
+def prepare_source(
+    url: str,
+    language: str,
+    method: Literal["subs", "audio"],
+    video_info: dict,
+    download_dir: str,
+    on_update: Callable[[str, StatusLevel], None] | None = None,
+    on_event: OnEvent | None = None,
+    engine: str | None = None,
+) -> SourceMaterial:
+    """
+    Stage 1: load the cached transcript, or download subtitles / audio for the video.
+    Audio transcripts are cached per engine, so switching engines transcribes again.
+    """
+    title = video_info["title"]
+    video_id = video_info["id"]
+    duration = video_info["duration"]
+
+    safe_title = "".join([c for c in title if c.isalpha() or c.isdigit() or c == " "]).rstrip()
+    filename_base = f"{safe_title}_{video_id}"
+
+    if method == "subs":
+        return _prepare_subtitles(url, language, video_info, download_dir, filename_base, on_update, on_event)
+    if method != "audio":
+        raise ProcessingError("Unknown processing method.")
+
+    cache_path = transcription_cache_path(video_id, engine)
+    source = SourceMaterial(
+        video_info=video_info,
+        method=method,
+        language=language,
+        download_dir=download_dir,
+        cache_path=cache_path,
+        display_filename=f"{filename_base}_transcription.txt",
+    )
+
+    if cache_path.is_file() and cache_path.stat().st_size > 0:
+        with metrics.stage("transcription", on_event, video_id) as event:
+            event.cached = True
+            source.transcription_text = cache_path.read_text(encoding="utf-8")
+        source.used_cache = True
+        _emit(on_update, "Using cached transcription.")
+        return source
+
+    if duration > AUDIO_MAX_DURATION:
+        raise ProcessingError("Video is too long for audio transcription. Please use subtitles.")
+
+    # Runs for other languages of the same video share the directory; one downloads at a time
+    with download_lock(video_id):
+        audio_path = find_audio_file(download_dir, video_id)
+        if audio_path is not None:
+            with metrics.stage("audio_download", on_event, video_id) as event:
+                event.cached = True
+            _emit(on_update, "Using previously downloaded audio.")
         else:
-            if method == "subs":
+            _emit(on_update, "Downloading and converting audio...")
+            with metrics.stage("audio_download", on_event, video_id):
+                download_audio(url, download_dir)
+            audio_path = find_audio_file(download_dir, video_id)
+
+    if audio_path is None:
+        raise ProcessingError("No audio file found after download.")
+    source.audio_path = str(audio_path)
+    return source
+
+
+def _prepare_subtitles(
+    url: str,
+    language: str,
+    video_info: dict,
+    download_dir: str,
+    filename_base: str,
+    on_update: Callable[[str, StatusLevel], None] | None,
+    on_event: OnEvent | None,
+) -> SourceMaterial:
+    video_id = video_info["id"]
+    langs = subtitle_langs(language)
+
+    with metrics.stage("subtitles", on_event, video_id) as event:
+        # Runs for other summary languages fetch the same tracks; only one goes to the network
+        with download_lock(video_id):
+            track = load_cached_subtitles(video_id, langs)
+            event.cached = track is not None
+            if track is None:
                 _emit(on_update, "Checking for subtitles...")
-                subtitle_langs = [language, "ru" if language == "en" else "en"]
-                subtitle_content = download_subtitles(url, download_dir, langs=subtitle_langs)
-                if subtitle_content:
-                    transcription_text = subtitle_content
-                    _emit(on_update, "Subtitles found and downloaded.")
+                tracks = download_subtitle_tracks(url, download_dir, langs)
+                store_subtitles(video_id, langs, tracks)
+                track = tracks[0] if tracks else None
+
+    if track is None:
+        if video_info["duration"] > AUDIO_MAX_DURATION:
+            raise ProcessingError(f"Video is too long (>{AUDIO_MAX_DURATION}s) and no subtitles found.")
+        raise ProcessingError("No subtitles found. Try the audio option.")
+    _emit(on_update, "Using cached subtitles." if event.cached else "Subtitles found and downloaded.")
+
+    return SourceMaterial(
+        video_info=video_info,
+        method="subs",
+        language=language,
+        download_dir=download_dir,
+        cache_path=subtitle_track_path(video_id, track.lang, track.kind),
+        display_filename=f"{filename_base}_subtitles_{track.lang}_{track.kind}.txt",
+        transcription_text=track.text,
+        used_cache=event.cached,
+    )
+
+
+def speech_audio(
+    source: SourceMaterial,
+    on_update: Callable[[str, StatusLevel], None] | None = None,
+    on_event: OnEvent | None = None,
+) -> str:
+    """
+    Path of a speech-only copy of the downloaded audio (silence and music cut by VAD), kept in
+    the download directory with its timestamp map. Falls back to the original audio when
+    little would be cut or the audio cannot be decoded.
+    """
+    video_id = source.video_info["id"]
+    target = Path(source.download_dir) / f"{video_id}_speech.mp3"
+    map_path = Path(source.download_dir) / f"{video_id}_speech.json"
+    with metrics.stage("vad", on_event, video_id) as event:
+        with download_lock(video_id):
+            if map_path.is_file():
+                event.cached = True
+                source.speech_map = vad.SpeechMap.from_dict(json.loads(map_path.read_text(encoding="utf-8")))
+            else:
+                _emit(on_update, "Detecting speech...")
+                try:
+                    source.speech_map = vad.extract_speech(source.audio_path, target)
+                except (OSError, subprocess.CalledProcessError):
+                    _emit(on_update, "Speech detection failed; transcribing the full audio.", "warning")
+                    return source.audio_path
+                map_path.write_text(json.dumps(source.speech_map.as_dict()), encoding="utf-8")
+        event.audio_seconds = source.speech_map.duration
+
+    if not target.is_file():
+        return source.audio_path
+    removed = source.speech_map.duration - source.speech_map.speech_seconds
+    _emit(on_update, f"Skipping {removed:.0f}s of silence and music.")
+    return str(target)
+
+
+def transcribe_source(
+    source: SourceMaterial,
+    on_update: Callable[[str, StatusLevel], None] | None = None,
+    on_event: OnEvent | None = None,
+    engine: str | None = None,
+) -> str:
+    """
+    Stage 2: return the transcript, transcribing downloaded audio (and caching it) if needed.
+    """
+    if source.transcription_text is not None:
+        return source.transcription_text
+
+    audio_path = source.audio_path
+    if os.getenv("TRANSCRIBE_VAD", "1") != "0":
+        audio_path = speech_audio(source, on_update, on_event)
+
+    transcription_engine = get_transcription_engine(engine)
+    _emit(on_update, f"Transcribing with {transcription_engine.description}...")
+    with metrics.stage("transcription", on_event, source.video_info["id"]) as event:
+        event.audio_seconds = source.video_info["duration"]
+        if audio_path != source.audio_path:
+            event.audio_seconds = source.speech_map.speech_seconds
+        transcription_text = transcription_engine.transcribe(audio_path)
+    source.cache_path.write_text(transcription_text, encoding="utf-8")
+    source.transcription_text = transcription_text
+    return transcription_text
+
+
+def summary_cache_key(video_id: str, transcription_text: str, language: str) -> CacheKey:
+    return CacheKey(
+        video_id=video_id,
+        stage="summary",
+        language=language,
+        model=summarizer.MODEL,
+        prompt_hash=summarizer.prompt_hash(),
+        input_hash=get_sha256_hash(transcription_text),
+    )
+
+
+def notes_cache_key(video_info: dict, transcription_text: str, language: str) -> CacheKey:
+    return CacheKey(
+        video_id=video_info["id"],
+        stage="notes",
+        language=language,
+        model=notes.MODEL,
+        prompt_hash=notes.prompt_hash(),
+        input_hash=get_sha256_hash(f"{video_info['title']}\x1f{transcription_text}"),
+    )
+
+
+def qa_cache_key(video_id: str, transcription_text: str, questions: list[str], stage: str = "qa") -> CacheKey:
+    return CacheKey(
+        video_id=video_id,
+        stage=stage,
+        language="",
+        model=qa.MODEL,
+        prompt_hash=qa.prompt_hash(),
+        input_hash=get_sha256_hash("\x1f".join([transcription_text, *questions])),
+    )
+
+
+def qa_retrieval_cache_key(video_id: str, transcription_text: str, questions: list[str], top_k: int) -> CacheKey:
+    return qa_cache_key(video_id, transcription_text, [*questions, f"top_k={top_k}"], stage="qa_retrieval")
+
+
+def summarize_transcript(
+    video_id: str,
+    transcription_text: str,
+    language: str,
+    on_update: Callable[[str, StatusLevel], None] | None = None,
+    on_summary_delta: Callable[[str], None] | None = None,
+    on_event: OnEvent | None = None,
+    on_preview: Callable[[str], None] | None = None,
+    on_fallback: Callable[[], None] | None = None,
+) -> str:
+    """
+    Stage 3: summarize the transcript, going through the result cache. on_preview first
+    receives a local extractive summary; it also stands in (uncached) for the LLM summary
+    when the API is rate-limited or unreachable, in which case on_fallback is called.
+    """
+    summary_key = summary_cache_key(video_id, transcription_text, language)
+    preview = None
+    with metrics.stage("summary", on_event, video_id) as event:
+        summary = get_result_cache().get(summary_key)
+        event.cached = summary is not None
+        if summary is None:
+            if on_preview:
+                preview = extractive_summary(transcription_text)
+                on_preview(preview)
+            _emit(on_update, "Summarizing...")
+            try:
+                if on_summary_delta:
+                    deltas: list[str] = []
+                    for delta in summarizer.summarize_text_stream(transcription_text, language=language):
+                        deltas.append(delta)
+                        on_summary_delta(delta)
+                    summary = "".join(deltas)
                 else:
-                    if duration > 1400:
-                        raise ProcessingError("Video is too long (>1400s) and no subtitles found.")
-                    raise ProcessingError("No subtitles found. Try the audio option.")
-            elif method == "audio":
-                if duration > 1400:
-                    raise ProcessingError("Video is too long for audio transcription. Please use subtitles.")
-
-                _emit(on_update, "Downloading and converting audio...")
-                download_audio(url, download_dir)
+                    summary = summarizer.summarize_text(transcription_text, language=language)
+            except API_UNAVAILABLE_ERRORS as exc:
+                event.status = "fallback"
+                event.error = str(exc) or exc.__class__.__name__
+                _emit(
+                    on_update,
+                    "OpenAI API is unavailable; showing key sentences from the transcript instead of a summary.",
+                    "warning",
+                )
+                if on_fallback:
+                    on_fallback()
+                return preview if preview is not None else extractive_summary(transcription_text)
 
-                mp3_files = list(Path(download_dir).glob("*.mp3"))
-                if not mp3_files:
-                    raise ProcessingError("No MP3 file found after download.")
-                mp3_path = str(mp3_files[0])
+    if event.cached:
+        _emit(on_update, "Using cached summary.")
+        if on_summary_delta:
+            on_summary_delta(summary)
+        return summary
 
-                _emit(on_update, "Transcribing with gpt-4o-mini-transcribe...")
-                transcription_text = transcribe_openai(mp3_path)
+    if summary:
+        get_result_cache().set(summary_key, summary)
+    return summary
 
-            if cache_path:
-                cache_path.write_text(transcription_text, encoding="utf-8")
 
-        _emit(on_update, "Summarizing...")
-        summary = summarize_text(transcription_text, language=language)
+def build_result(source: SourceMaterial, summary: str, summary_is_fallback: bool = False) -> ProcessingResult:
+    return ProcessingResult(
+        summary=summary,
+        transcription_text=source.transcription_text or "",
+        transcription_path=source.cache_path,
+        display_filename=source.display_filename,
+        is_subtitle=source.is_subtitle,
+        used_cache=source.used_cache,
+        video_info=source.video_info,
+        summary_is_fallback=summary_is_fallback,
+    )
 
-        return ProcessingResult(
-            summary=summary,
-            transcription_text=transcription_text,
-            transcription_path=cache_path or Path(""),
-            display_filename=display_filename or (cache_path.name if cache_path else "transcription.txt"),
-            is_subtitle=is_subtitle,
-            used_cache=used_cache,
-            video_info=video_info,
+
+def _process_video(
+    url: str,
+    language: str,
+    method: Literal["subs", "audio"],
+    on_update: Callable[[str, StatusLevel], None] | None,
+    video_info: dict,
+    on_summary_delta: Callable[[str], None] | None = None,
+    on_event: OnEvent | None = None,
+    engine: str | None = None,
+    on_preview: Callable[[str], None] | None = None,
+) -> ProcessingResult:
+    download_dir = acquire_download_dir(video_info["id"])
+    # A prefetch started when the video info was fetched hands its files over to this run
+    claim_prefetch(video_info["id"])
+    try:
+        source = prepare_source(url, language, method, video_info, download_dir, on_update, on_event, engine)
+        transcription_text = transcribe_source(source, on_update, on_event, engine)
+        fallbacks: list[bool] = []
+        summary = summarize_transcript(
+            video_info["id"],
+            transcription_text,
+            language,
+            on_update,
+            on_summary_delta,
+            on_event,
+            on_preview,
+            on_fallback=lambda: fallbacks.append(True),
         )
+        return build_result(source, summary, summary_is_fallback=bool(fallbacks))
     except ProcessingError:
         raise
     except Exception as exc:
         raise ProcessingError(str(exc)) from exc
     finally:
-        if download_dir and os.path.exists(download_dir):
+        release_download_dir(video_info["id"])
+
+
+class SummaryStream:
+    """
+    Iterable of summary deltas for one process_video run executed in a background thread.
+    After iteration completes, the ProcessingResult is available as `result`; processing
+    errors are re-raised from the iterator. on_update is called from the background thread.
+    """
+
+    _DONE = object()
+
+    def __init__(self, **process_kwargs) -> None:
+        self._process_kwargs = process_kwargs
+        self.result: ProcessingResult | None = None
+
+    def __iter__(self) -> Iterator[str]:
+        deltas: queue.Queue = queue.Queue()
+        errors: list[BaseException] = []
+
+        def _run() -> None:
             try:
-                shutil.rmtree(download_dir)
-            except Exception:
-                pass
+                self.result = process_video(**self._process_kwargs, on_summary_delta=deltas.put)
+            except BaseException as exc:
+                errors.append(exc)
+            finally:
+                deltas.put(self._DONE)
+
+        thread = threading.Thread(target=_run, name="summary-stream", daemon=True)
+        thread.start()
+        while True:
+            item = deltas.get()
+            if item is self._DONE:
+                break
+            yield item
+        thread.join()
+        if errors:
+            raise errors[0]
+
+
+def stream_process_video(
+    url: str,
+    language: str,
+    method: Literal["subs", "audio"],
+    on_update: Callable[[str, StatusLevel], None] | None = None,
+    video_info: dict | None = None,
+) -> SummaryStream:
+    """Generator-style process_video: iterate to receive summary deltas (e.g. with st.write_stream)."""
+    return SummaryStream(url=url, language=language, method=method, on_update=on_update, video_info=video_info)
+
+
+def generate_video_notes(result: ProcessingResult, language: str, on_event: OnEvent | None = None) -> str:
+    """Generate (or load cached) HTML notes for a processed video."""
+    key = notes_cache_key(result.video_info, result.transcription_text, language)
+    with metrics.stage("notes", on_event, result.video_info["id"]) as event:
+        html, event.cached = get_result_cache().get_or_compute(
+            key,
+            lambda: notes.generate_notes_html(
+                result.transcription_text,
+                language=language,
+                title=result.video_info["title"],
+                cache=get_result_cache(),
+                video_id=result.video_info["id"],
+            ),
+        )
+    return html
+
+
+def transcript_index(video_id: str, transcription_text: str) -> TranscriptIndex:
+    """
+    Retrieval index for a processed transcript, persisted next to the transcript cache.
+    The file name carries everything the index depends on, so changing the backend or
+    QA_CHUNK_TOKENS builds a new one.
+    """
+    backend = os.getenv("QA_RETRIEVAL_BACKEND", "bm25")
+    chunk_tokens = int(os.getenv("QA_CHUNK_TOKENS", "300"))
+    text_hash = get_sha256_hash(transcription_text)[:16]
+    index_path = Path(TRANSCRIPTIONS_DIR) / f"{video_id}_{text_hash}_{backend}_{chunk_tokens}.index.npz"
+    return load_or_build_index(transcription_text, index_path, chunk_tokens=chunk_tokens, backend=backend)
+
+
+def qa_retrieval_top_k(transcription_text: str) -> int | None:
+    """
+    Passages per question to answer from, or None when the transcript is short enough
+    (QA_RETRIEVAL_MIN_TOKENS) to send whole.
+    """
+    if estimate_tokens(transcription_text) <= int(os.getenv("QA_RETRIEVAL_MIN_TOKENS", "4000")):
+        return None
+    return int(os.getenv("QA_TOP_K", "4"))
+
+
+def answer_video_questions(result: ProcessingResult, questions: list[str], on_event: OnEvent | None = None) -> str:
+    """
+    Answer (or load cached answers for) questions about a processed video. Long transcripts
+    are answered from the top retrieved passages instead of the full text.
+    """
+    text = result.transcription_text
+    video_id = result.video_info["id"]
+    top_k = qa_retrieval_top_k(text)
+    with metrics.stage("qa", on_event, video_id) as event:
+        if top_k is None:
+            key = qa_cache_key(video_id, text, questions)
+            answers, event.cached = get_result_cache().get_or_compute(key, lambda: qa.answer_questions(text, questions))
+            return answers
+
+        key = qa_retrieval_cache_key(video_id, text, questions, top_k)
+        answers, event.cached = get_result_cache().get_or_compute(
+            key, lambda: qa.answer_questions_retrieval(transcript_index(video_id, text), questions, top_k=top_k)
+        )
+        return answers
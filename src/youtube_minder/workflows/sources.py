@@ -0,0 +1,96 @@
+"""
+Where a video's transcript sources live between runs: the pinned per-video download
+directory, the cached subtitle tracks with their manifest, and cached transcripts. Shared
+by processing runs and the speculative prefetch.
+"""
+import json
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from youtube_minder.config import DATA_DIR, DOWNLOADS_DIR, SUBTITLE_LANGS, TRANSCRIPTIONS_DIR
+from youtube_minder.services.downloader import SubtitleTrack
+from youtube_minder.services.transcriber import transcription_engine_name
+from youtube_minder.services.workspace import get_download_workspace
+
+
+def setup_directories() -> None:
+    """Creates necessary directories for data storage if they don't exist."""
+    Path(DATA_DIR).mkdir(parents=True, exist_ok=True)
+    Path(DOWNLOADS_DIR).mkdir(parents=True, exist_ok=True)
+    Path(TRANSCRIPTIONS_DIR).mkdir(parents=True, exist_ok=True)
+
+
+def acquire_download_dir(video_id: str) -> str:
+    """
+    The video's workspace directory, pinned until release_download_dir. Its files survive
+    the run, so a retry reuses finished downloads and resumes partial ones.
+    """
+    return str(get_download_workspace().acquire(video_id))
+
+
+def release_download_dir(video_id: str) -> None:
+    get_download_workspace().release(video_id)
+
+
+@contextmanager
+def download_lock(video_id: str) -> Iterator[None]:
+    """Serialize downloads into the video's directory (runs for other languages, prefetches)."""
+    with get_download_workspace().download_lock(video_id):
+        yield
+
+
+def transcription_cache_path(video_id: str, engine: str | None = None) -> Path:
+    """Cached audio transcript; one per engine, so switching engines transcribes again."""
+    return Path(TRANSCRIPTIONS_DIR) / f"{video_id}_transcription_{transcription_engine_name(engine)}.txt"
+
+
+def subtitle_langs(language: str) -> list[str]:
+    """Subtitle languages to fetch, in preference order: the summary language first."""
+    return [language, *(lang for lang in SUBTITLE_LANGS if lang != language)]
+
+
+def subtitle_track_path(video_id: str, lang: str, kind: str) -> Path:
+    """Cached text of one subtitle track ("manual" or "auto")."""
+    return Path(TRANSCRIPTIONS_DIR) / f"{video_id}_subtitles_{lang}_{kind}.txt"
+
+
+def _subtitle_manifest_path(video_id: str) -> Path:
+    return Path(TRANSCRIPTIONS_DIR) / f"{video_id}_subtitles.json"
+
+
+def _load_subtitle_manifest(video_id: str) -> dict:
+    try:
+        return json.loads(_subtitle_manifest_path(video_id).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {"langs": [], "tracks": {}}
+
+
+def load_cached_subtitles(video_id: str, langs: list[str]) -> SubtitleTrack | None:
+    """
+    The first cached track among langs, provided an earlier fetch already asked for all of
+    them (so a missing language is known to be unavailable, not just not fetched yet).
+    """
+    manifest = _load_subtitle_manifest(video_id)
+    if not set(langs) <= set(manifest["langs"]):
+        return None
+    for lang in langs:
+        kind = manifest["tracks"].get(lang)
+        path = subtitle_track_path(video_id, lang, kind) if kind else None
+        if path is not None and path.is_file():
+            return SubtitleTrack(lang=lang, kind=kind, text=path.read_text(encoding="utf-8"))
+    return None
+
+
+def store_subtitles(video_id: str, langs: list[str], tracks: list[SubtitleTrack]) -> None:
+    """Cache each track under its real language and kind, and record which languages were asked for."""
+    for track in tracks:
+        subtitle_track_path(video_id, track.lang, track.kind).write_text(track.text, encoding="utf-8")
+    manifest = _load_subtitle_manifest(video_id)
+    manifest["langs"] = sorted({*manifest["langs"], *langs})
+    manifest["tracks"].update({track.lang: track.kind for track in tracks})
+    manifest_path = _subtitle_manifest_path(video_id)
+    tmp_path = manifest_path.with_name(f"{manifest_path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_text(json.dumps(manifest), encoding="utf-8")
+    tmp_path.replace(manifest_path)
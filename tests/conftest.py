@@ -1,8 +1,35 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure src/ is on sys.path for tests
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+from youtube_minder.services.cache import ResultCache  # noqa: E402
+from youtube_minder.services.workspace import DownloadWorkspace  # noqa: E402
+from youtube_minder.utils.singleflight import SingleFlight  # noqa: E402
+from youtube_minder.workflows import async_processor, processor, sources  # noqa: E402
+
+
+@pytest.fixture
+def pipeline_dirs(monkeypatch, tmp_path) -> DownloadWorkspace:
+    """
+    Point everything process_video keeps on disk (data, downloads, transcripts, locks and
+    the result cache) into tmp_path. Returns the download workspace.
+    """
+    cache = ResultCache(tmp_path / "cache.sqlite3", 1 << 20)
+    workspace = DownloadWorkspace(tmp_path / "downloads", 1 << 30, tmp_path / "locks")
+    single_flight = SingleFlight(tmp_path / "locks")
+    monkeypatch.setattr(sources, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(sources, "DOWNLOADS_DIR", tmp_path / "downloads")
+    monkeypatch.setattr(sources, "TRANSCRIPTIONS_DIR", tmp_path / "transcriptions")
+    monkeypatch.setattr(processor, "TRANSCRIPTIONS_DIR", tmp_path / "transcriptions")
+    monkeypatch.setattr(sources, "get_download_workspace", lambda: workspace)
+    for module in (processor, async_processor):
+        monkeypatch.setattr(module, "get_result_cache", lambda: cache)
+        monkeypatch.setattr(module, "_single_flight", single_flight)
+    return workspace
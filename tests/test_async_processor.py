@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from youtube_minder.services import notes, qa, summarizer
+from youtube_minder.services.downloader import SubtitleTrack
+from youtube_minder.workflows import async_processor, processor
+
+
+class FakeAsyncOpenAI:
+    """Stands in for the shared AsyncOpenAI client; counts calls and concurrent requests."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model, messages, **kwargs):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        task = messages[-1]["content"]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"reply to: {task}"))])
+
+
+def test_process_video_async_runs_summary_notes_and_qa_concurrently(monkeypatch, pipeline_dirs):
+    monkeypatch.setattr(
+        processor, "download_subtitle_tracks", lambda url, out, langs: [SubtitleTrack("en", "auto", "Transcript text.")]
+    )
+    client = FakeAsyncOpenAI()
+    for module in (summarizer, notes, qa):
+        monkeypatch.setattr(module, "get_async_openai_client", lambda: client)
+
+    video_info = {"title": "Title", "id": "vid1", "duration": 60, "webpage_url": "https://youtu.be/vid1"}
+
+    async def _run(questions):
+        return await async_processor.process_video_async(
+            "https://youtu.be/vid1", "en", "subs", video_info=video_info, with_notes=True, questions=questions
+        )
+
+    async def _run_many():
+        return await asyncio.gather(*(_run([f"Question {i}?"]) for i in range(1, 4)))
+
+    first = asyncio.run(_run(["Question 0?"]))
+
+    assert first.result.transcription_text == "Transcript text."
+    assert first.result.summary.startswith("reply to: Summarize the video")
+    assert first.notes_html.startswith("reply to: Write clean")
+    assert first.answers.startswith("reply to: Answer the questions")
+    # Summary, notes and Q&A are requested at the same time
+    assert (client.calls, client.max_active) == (3, 3)
+
+    client.max_active = 0
+    results = asyncio.run(_run_many())
+
+    # Summary and notes now come from the cache; the three new questions run concurrently
+    assert [r.result.summary for r in results] == [first.result.summary] * 3
+    assert [r.notes_html for r in results] == [first.notes_html] * 3
+    assert (client.calls, client.max_active) == (6, 3)
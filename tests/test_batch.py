@@ -0,0 +1,96 @@
+import json
+import time
+
+import httpx
+import openai
+
+from youtube_minder.services.downloader import SubtitleTrack
+from youtube_minder.workflows import batch, processor
+
+
+def _patch_processing(monkeypatch, delay=0.0):
+    def _info(url):
+        time.sleep(delay)
+        video_id = url.rsplit("=", 1)[-1]
+        return {"title": f"Title {video_id}", "id": video_id, "duration": 60, "webpage_url": url}
+
+    def _subs(url, output_dir, langs):
+        time.sleep(delay)
+        if url.endswith("nosubs00000"):
+            return []
+        return [SubtitleTrack("en", "auto", f"Transcript of {url}.")]
+
+    def _summarize(text, language="en"):
+        time.sleep(delay)
+        return f"Summary: {text}"
+
+    monkeypatch.setattr(batch, "get_video_info", _info)
+    monkeypatch.setattr(processor, "download_subtitle_tracks", _subs)
+    monkeypatch.setattr(processor.summarizer, "summarize_text", _summarize)
+
+
+def test_expand_sources_reads_files_and_playlists(monkeypatch, tmp_path):
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text(
+        "# favourites\nhttps://youtu.be/aaaaaaaaaaa\n\nhttps://www.youtube.com/playlist?list=PL1\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(
+        batch,
+        "expand_playlist",
+        lambda url: ["https://www.youtube.com/watch?v=bbbbbbbbbbb", "https://www.youtube.com/watch?v=aaaaaaaaaaa"],
+    )
+
+    assert batch.expand_sources([str(url_file)]) == [
+        "https://youtu.be/aaaaaaaaaaa",
+        "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+    ]
+
+
+def test_process_batch_pipelines_stages_and_reports_failures(monkeypatch, tmp_path, pipeline_dirs):
+    _patch_processing(monkeypatch, delay=0.05)
+    urls = [f"https://www.youtube.com/watch?v=video{i:06d}" for i in range(8)]
+    urls.append("https://www.youtube.com/watch?v=nosubs00000")
+    report = tmp_path / "report.jsonl"
+
+    started = time.monotonic()
+    rows = batch.process_batch(urls, report, limits=batch.StageLimits(4, 4, 4, 4))
+    elapsed = time.monotonic() - started
+
+    # 9 items x 3 sleeping stages run sequentially would take ~1.35s
+    assert elapsed < 0.9
+    assert [row["index"] for row in rows] == list(range(9))
+    assert rows[0]["status"] == "ok"
+    assert rows[0]["summary"] == f"Summary: Transcript of {urls[0]}."
+    assert rows[0]["summary_is_fallback"] is False
+    failed = rows[-1]
+    assert failed["status"] == "failed"
+    assert failed["failed_stage"] == "fetch"
+    assert "No subtitles found" in failed["error"]
+
+    lines = [json.loads(line) for line in report.read_text(encoding="utf-8").splitlines()]
+    assert sorted(line["index"] for line in lines) == list(range(9))
+
+
+def test_process_batch_writes_csv(monkeypatch, tmp_path, pipeline_dirs):
+    _patch_processing(monkeypatch)
+    report = tmp_path / "report.csv"
+    batch.process_batch(["https://www.youtube.com/watch?v=video000001"], report)
+    header, row = report.read_text(encoding="utf-8").splitlines()[:2]
+    assert header.split(",") == batch.REPORT_FIELDS
+    assert row.startswith("0,https://www.youtube.com/watch?v=video000001,video000001,")
+
+
+def test_process_batch_reports_extractive_fallback_summaries(monkeypatch, tmp_path, pipeline_dirs):
+    _patch_processing(monkeypatch)
+
+    def _unavailable(text, language="en"):
+        response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+        raise openai.RateLimitError("Rate limited", response=response, body=None)
+
+    monkeypatch.setattr(processor.summarizer, "summarize_text", _unavailable)
+    rows = batch.process_batch(["https://www.youtube.com/watch?v=video000001"], tmp_path / "report.jsonl")
+
+    assert rows[0]["status"] == "ok"
+    assert rows[0]["summary_is_fallback"] is True
+    assert rows[0]["summary"].startswith("- Transcript of")
@@ -0,0 +1,105 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from youtube_minder import api, cli
+from youtube_minder.workflows import processor
+
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+HEAVY_MODULES = ("streamlit", "yt_dlp", "openai", "weasyprint", "numpy")
+
+
+def _fake_result(url: str) -> processor.ProcessingResult:
+    return processor.ProcessingResult(
+        summary=f"Summary of {url}",
+        transcription_text="Transcript.",
+        transcription_path=Path("vid_subtitles_en_auto.txt"),
+        display_filename="Title_vid_subtitles_en_auto.txt",
+        is_subtitle=True,
+        used_cache=False,
+        video_info={"id": "vid", "title": "Title", "duration": 60},
+    )
+
+
+def _fake_process_video(url, language, method, on_update=None, on_event=None, **kwargs):
+    if "bad" in url:
+        raise processor.ProcessingError("No subtitles found. Try the audio option.")
+    return _fake_result(url)
+
+
+def test_entry_points_start_without_heavy_imports():
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    code = (
+        "import sys, youtube_minder.cli, youtube_minder.api; "
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+    assert proc.stdout.strip() == "[]"
+
+    cumulative_us = {
+        match.group(2): int(match.group(1))
+        for match in re.finditer(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)", proc.stderr)
+    }
+    import_seconds = (cumulative_us["youtube_minder.cli"] + cumulative_us["youtube_minder.api"]) / 1e6
+    assert import_seconds < 0.5, f"entry point imports took {import_seconds:.3f}s"
+
+
+def test_cli_summarize_prints_summary(monkeypatch, capsys):
+    monkeypatch.setattr(processor, "process_video", _fake_process_video)
+
+    assert cli.main(["summarize", "https://youtu.be/vid"]) == 0
+    assert capsys.readouterr().out.strip() == "Summary of https://youtu.be/vid"
+
+    assert cli.main(["summarize", "https://youtu.be/bad"]) == 1
+    assert "No subtitles found" in capsys.readouterr().err
+
+
+@pytest.fixture
+def api_url():
+    server = api.create_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url: str, payload: dict) -> tuple[int, dict]:
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_http_api_routes_and_errors(monkeypatch, api_url):
+    monkeypatch.setattr(processor, "process_video", _fake_process_video)
+    monkeypatch.setattr(processor, "answer_video_questions", lambda result, questions, on_event=None: "Answers.")
+
+    with urllib.request.urlopen(f"{api_url}/health") as response:
+        assert json.loads(response.read()) == {"status": "ok"}
+
+    status, body = _post(f"{api_url}/process", {"url": "https://youtu.be/vid"})
+    assert status == 200
+    assert body["summary"] == "Summary of https://youtu.be/vid" and body["stages"] == []
+
+    assert _post(f"{api_url}/qa", {"url": "https://youtu.be/vid", "questions": ["Why?"]})[1]["answers"] == "Answers."
+    assert _post(f"{api_url}/qa", {"url": "https://youtu.be/vid"})[0] == 400
+    assert _post(f"{api_url}/process", {"url": "https://youtu.be/vid", "method": "video"})[0] == 400
+    assert _post(f"{api_url}/process", {"url": "https://youtu.be/bad"}) == (
+        422,
+        {"error": "No subtitles found. Try the audio option."},
+    )
+    assert _post(f"{api_url}/nope", {})[0] == 404
@@ -82,3 +82,203 @@ def test_download_subtitles_retries_and_returns_clean_text(monkeypatch, tmp_path
     assert result == "Hello"
     assert attempts["count"] == 3
     assert sleep_calls["count"] == 2
+
+
+def test_download_subtitle_tracks_fetches_all_languages_once(monkeypatch, tmp_path):
+    seen_langs = []
+
+    class FakeYoutubeDL:
+        def __init__(self, opts):
+            self.opts = opts
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def extract_info(self, url, download=True):
+            seen_langs.append(self.opts["subtitleslangs"])
+            outdir = Path(self.opts["outtmpl"]).parent
+            for lang, text in (("en", "Hello"), ("ru", "Privet")):
+                (outdir / f"abc123.{lang}.vtt").write_text(
+                    f"WEBVTT\n\n00:00:00.000 --> 00:00:01.000\n{text}\n", encoding="utf-8"
+                )
+            return {"id": "abc123", "subtitles": {"ru": [{"ext": "vtt"}]}}
+
+    monkeypatch.setattr(downloader.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+
+    tracks = downloader.download_subtitle_tracks("https://example.com", str(tmp_path), ["ru", "de", "en"])
+    assert tracks == [
+        downloader.SubtitleTrack("ru", "manual", "Privet"),
+        downloader.SubtitleTrack("en", "auto", "Hello"),
+    ]
+    assert seen_langs == [["ru", "de", "en"]]
+
+
+@pytest.fixture
+def fresh_session():
+    session = downloader.get_extraction_session()
+    session.clear()
+    yield session
+    session.clear()
+
+
+def test_extract_video_id_handles_url_forms():
+    assert downloader.extract_video_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10") == "dQw4w9WgXcQ"
+    assert downloader.extract_video_id("https://youtu.be/dQw4w9WgXcQ?si=abc") == "dQw4w9WgXcQ"
+    assert downloader.extract_video_id("https://www.youtube.com/shorts/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
+    assert downloader.extract_video_id("https://example.com") is None
+
+
+def test_extraction_session_drops_expired_and_least_recently_used_entries(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(downloader.time, "monotonic", lambda: now[0])
+    session = downloader.ExtractionSession(ttl_seconds=10, max_entries=2)
+
+    session.store("https://example.com/a", {"id": "a"})
+    now[0] = 5
+    session.store("https://example.com/b", {"id": "b"})
+    assert session.get("https://example.com/a")["id"] == "a"
+    session.store("https://example.com/c", {"id": "c"})
+    assert set(session._entries) == {"a", "c"}  # b was the least recently used
+
+    now[0] = 12
+    session.store("https://example.com/d", {"id": "d"})
+    assert set(session._entries) == {"c", "d"}  # a expired, even though nothing looked it up
+    assert session._url_ids == {"https://example.com/c": "c", "https://example.com/d": "d"}
+
+
+def test_downloads_reuse_session_info_and_player_client(monkeypatch, tmp_path, fresh_session):
+    calls = {"extract": [], "process": []}
+    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+    class FakeYoutubeDL:
+        def __init__(self, opts):
+            self.opts = opts
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def extract_info(self, url, download=True):
+            player_client = self.opts.get("extractor_args", {}).get("youtube", {}).get("player_client")
+            calls["extract"].append(player_client)
+            if player_client != ["android"]:
+                raise Exception("HTTP Error 403: Forbidden")
+            return {"id": "dQw4w9WgXcQ", "title": "Title", "duration": 42, "webpage_url": url}
+
+        @staticmethod
+        def sanitize_info(info, remove_private_keys=False):
+            return info
+
+        def process_ie_result(self, info, download=True):
+            calls["process"].append(self.opts["extractor_args"]["youtube"]["player_client"])
+            outdir = Path(self.opts["outtmpl"]).parent
+            (outdir / f"{info['id']}.en.vtt").write_text(
+                "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello\n", encoding="utf-8"
+            )
+            return info
+
+    monkeypatch.setattr(downloader.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+    monkeypatch.delenv("YTDLP_PLAYER_CLIENT", raising=False)
+
+    info = downloader.get_video_info(url)
+    assert info["title"] == "Title"
+    assert calls["extract"] == [None, ["android"]]
+
+    assert downloader.get_video_info("https://youtu.be/dQw4w9WgXcQ")["duration"] == 42
+    assert downloader.download_subtitles(url, str(tmp_path), langs=["en"]) == "Hello"
+    assert len(calls["extract"]) == 2
+    assert calls["process"] == [["android"]]
+
+
+def _audio_youtube_dl(downloaded_name: str, info: dict, seen_opts: list):
+    class FakeYoutubeDL:
+        def __init__(self, opts):
+            self.opts = opts
+            seen_opts.append(opts)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def extract_info(self, url, download=True):
+            outdir = Path(self.opts["outtmpl"]).parent
+            (outdir / downloaded_name).write_bytes(b"audio")
+            return {"id": "dQw4w9WgXcQ", "title": "Title", **info}
+
+    return FakeYoutubeDL
+
+
+def test_download_audio_keeps_native_stream(monkeypatch, tmp_path, fresh_session):
+    seen_opts = []
+    fake = _audio_youtube_dl("dQw4w9WgXcQ.webm", {"acodec": "opus", "vcodec": "none"}, seen_opts)
+    monkeypatch.setattr(downloader.yt_dlp, "YoutubeDL", fake)
+    monkeypatch.setattr(downloader, "_run_ffmpeg", lambda args: pytest.fail("no ffmpeg expected"))
+    monkeypatch.delenv("AUDIO_DOWNLOAD_MODE", raising=False)
+
+    assert downloader.download_audio("https://youtu.be/dQw4w9WgXcQ", str(tmp_path)) == "Title"
+
+    assert "postprocessors" not in seen_opts[0]
+    assert seen_opts[0]["format"].startswith("bestaudio[ext=webm]")
+    assert [p.name for p in tmp_path.iterdir()] == ["dQw4w9WgXcQ.webm"]
+
+
+def test_download_audio_remuxes_or_downsamples_unsupported_containers(monkeypatch, tmp_path, fresh_session):
+    ffmpeg_calls = []
+
+    def _fake_ffmpeg(args):
+        ffmpeg_calls.append(args)
+        if "copy" in args and "fail-remux" in args[-1]:
+            raise downloader.subprocess.CalledProcessError(1, "ffmpeg")
+        Path(args[-1]).write_bytes(b"converted")
+
+    monkeypatch.setattr(downloader, "_run_ffmpeg", _fake_ffmpeg)
+    monkeypatch.delenv("AUDIO_DOWNLOAD_MODE", raising=False)
+
+    fake = _audio_youtube_dl("dQw4w9WgXcQ.mkv", {"acodec": "opus", "vcodec": "none"}, [])
+    monkeypatch.setattr(downloader.yt_dlp, "YoutubeDL", fake)
+    downloader.download_audio("https://youtu.be/dQw4w9WgXcQ", str(tmp_path / "remux"))
+    assert [p.name for p in (tmp_path / "remux").iterdir()] == ["dQw4w9WgXcQ.audio.webm"]
+    assert "copy" in ffmpeg_calls[-1]
+
+    downloader.get_extraction_session().clear()
+    downloader.download_audio("https://youtu.be/dQw4w9WgXcQ", str(tmp_path / "fail-remux"))
+    assert [p.name for p in (tmp_path / "fail-remux").iterdir()] == ["dQw4w9WgXcQ.audio.mp3"]
+    assert ffmpeg_calls[-1][ffmpeg_calls[-1].index("-ar") + 1] == "16000"
+
+
+def test_download_audio_ignores_subtitles_already_in_the_directory(monkeypatch, tmp_path, fresh_session):
+    for name in ("dQw4w9WgXcQ.en.vtt", "dQw4w9WgXcQ.de.vtt", "dQw4w9WgXcQ.info.json"):
+        (tmp_path / name).write_text("WEBVTT\n", encoding="utf-8")
+    fake = _audio_youtube_dl("dQw4w9WgXcQ.webm", {"acodec": "opus", "vcodec": "none"}, [])
+    monkeypatch.setattr(downloader.yt_dlp, "YoutubeDL", fake)
+    monkeypatch.setattr(downloader, "_run_ffmpeg", lambda args: pytest.fail("no ffmpeg expected"))
+    monkeypatch.delenv("AUDIO_DOWNLOAD_MODE", raising=False)
+
+    downloader.download_audio("https://youtu.be/dQw4w9WgXcQ", str(tmp_path))
+
+    assert downloader.find_audio_file(str(tmp_path), "dQw4w9WgXcQ") == tmp_path / "dQw4w9WgXcQ.webm"
+    assert (tmp_path / "dQw4w9WgXcQ.en.vtt").is_file()
+
+    # The recorded filepath wins over the glob when yt-dlp reports one
+    (tmp_path / "dQw4w9WgXcQ.aaa.mkv").write_bytes(b"other")
+    info = {"id": "dQw4w9WgXcQ", "requested_downloads": [{"filepath": str(tmp_path / "dQw4w9WgXcQ.webm")}]}
+    assert downloader._downloaded_media(tmp_path, info) == tmp_path / "dQw4w9WgXcQ.webm"
+
+
+def test_download_audio_mp3_mode_uses_extract_audio(monkeypatch, tmp_path, fresh_session):
+    seen_opts = []
+    fake = _audio_youtube_dl("dQw4w9WgXcQ.mp3", {}, seen_opts)
+    monkeypatch.setattr(downloader.yt_dlp, "YoutubeDL", fake)
+    monkeypatch.setenv("AUDIO_DOWNLOAD_MODE", "mp3")
+
+    downloader.download_audio("https://youtu.be/dQw4w9WgXcQ", str(tmp_path))
+
+    assert seen_opts[0]["format"] == "bestaudio/best"
+    assert seen_opts[0]["postprocessors"][0]["key"] == "FFmpegExtractAudio"
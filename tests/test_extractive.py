@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+import openai
+
+from youtube_minder.services import extractive, summarizer
+from youtube_minder.services.cache import ResultCache
+from youtube_minder.workflows import async_processor, processor
+
+
+TRANSCRIPT = (
+    "Photosynthesis turns light energy into chemical energy inside plant leaves. "
+    "The weather was nice yesterday so we went outside. "
+    "Chlorophyll in the leaves absorbs the light energy that photosynthesis needs. "
+    "Do not forget to like and subscribe. "
+    "Inside the chloroplasts light energy splits water and plants release oxygen. "
+    "Thanks for watching and see you next time."
+)
+
+
+def test_extractive_summary_keeps_central_sentences_in_order():
+    summary = extractive.extractive_summary(TRANSCRIPT, max_sentences=3)
+
+    assert summary.splitlines() == [
+        "- Photosynthesis turns light energy into chemical energy inside plant leaves.",
+        "- Chlorophyll in the leaves absorbs the light energy that photosynthesis needs.",
+        "- Inside the chloroplasts light energy splits water and plants release oxygen.",
+    ]
+
+
+def test_split_sentences_windows_unpunctuated_captions():
+    captions = " ".join(f"word{i}" for i in range(100))
+
+    sentences = extractive.split_sentences(captions)
+
+    assert [len(s.split()) for s in sentences] == [25, 25, 25, 25]
+
+
+def _unavailable(*args, **kwargs):
+    raise openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+def test_summarize_transcript_previews_and_falls_back_when_api_is_down(monkeypatch, tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3", 1 << 20)
+    monkeypatch.setattr(processor, "get_result_cache", lambda: cache)
+
+    monkeypatch.setattr(summarizer, "summarize_text", _unavailable)
+    previews, updates, events, fallbacks = [], [], [], []
+
+    summary = processor.summarize_transcript(
+        "vid",
+        TRANSCRIPT,
+        "en",
+        on_update=lambda message, level: updates.append(level),
+        on_event=events.append,
+        on_preview=previews.append,
+        on_fallback=lambda: fallbacks.append(True),
+    )
+
+    assert summary == previews[0] == extractive.extractive_summary(TRANSCRIPT)
+    assert fallbacks == [True]
+    assert "warning" in updates
+    assert events[0].status == "fallback"
+    assert cache.get(processor.summary_cache_key("vid", TRANSCRIPT, "en")) is None
+
+    monkeypatch.setattr(summarizer, "summarize_text", lambda text, language="en": "LLM summary.")
+    assert processor.summarize_transcript("vid", TRANSCRIPT, "en") == "LLM summary."
+
+
+def test_async_summary_falls_back_with_the_same_stage_status(monkeypatch, tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3", 1 << 20)
+    monkeypatch.setattr(async_processor, "get_result_cache", lambda: cache)
+
+    async def _unavailable_async(text, language="en"):
+        _unavailable()
+
+    monkeypatch.setattr(summarizer, "summarize_text_async", _unavailable_async)
+    key = processor.summary_cache_key("vid", TRANSCRIPT, "en")
+    previews, events = [], []
+
+    summary, is_fallback = asyncio.run(
+        async_processor._summary_or_fallback(key, TRANSCRIPT, "en", None, events.append, previews.append)
+    )
+
+    assert is_fallback
+    assert summary == previews[0] == extractive.extractive_summary(TRANSCRIPT)
+    assert [(event.stage, event.status) for event in events] == [("summary", "fallback")]
+    assert cache.get(key) is None
@@ -0,0 +1,142 @@
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from youtube_minder.utils.metrics import StageEvent
+from youtube_minder.workflows import jobs
+from youtube_minder.workflows.processor import ProcessingError, ProcessingResult
+
+
+def _wait_done(queue, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job.is_done:
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def _fake_process_video(
+    url, language, method, on_update=None, video_info=None, on_summary_delta=None, on_event=None, on_preview=None
+):
+    if url == "bad":
+        raise ProcessingError("No subtitles found.")
+    if on_preview:
+        on_preview(f"- key sentence of {url}")
+    on_update("Summarizing...", "info")
+    if on_event:
+        on_event(StageEvent(stage="summary", started_at=1.0, ended_at=3.5, prompt_tokens=10))
+    if on_summary_delta:
+        for word in ("summary ", "of ", url):
+            on_summary_delta(word)
+    return ProcessingResult(
+        summary=f"summary of {url}",
+        transcription_text="text",
+        transcription_path=Path("/tmp/text.txt"),
+        display_filename="text.txt",
+        is_subtitle=method == "subs",
+        used_cache=False,
+        video_info=video_info or {},
+    )
+
+
+def test_job_queue_runs_jobs_and_records_events(monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs, "process_video", _fake_process_video)
+    queue = jobs.JobQueue(tmp_path / "jobs.sqlite3", workers=2, poll_interval=0.05)
+    queue.start()
+    try:
+        ok_id = queue.submit("https://youtu.be/x", "en", "subs", video_info={"id": "x"})
+        bad_id = queue.submit("bad", "en", "subs")
+
+        ok = _wait_done(queue, ok_id)
+        bad = _wait_done(queue, bad_id)
+    finally:
+        queue.stop(timeout=2)
+
+    assert ok.status == "succeeded"
+    assert ok.result.summary == "summary of https://youtu.be/x"
+    assert ok.preview == "- key sentence of https://youtu.be/x"
+    assert ok.result.transcription_path == Path("/tmp/text.txt")
+    assert [e.message for e in ok.events] == ["Summarizing..."]
+    assert [(s["stage"], s["duration"], s["prompt_tokens"]) for s in ok.stages] == [("summary", 2.5, 10)]
+    assert bad.status == "failed"
+    assert bad.error == "No subtitles found."
+
+
+def test_jobs_are_claimed_once_across_queues(monkeypatch, tmp_path):
+    runs = []
+
+    def _counting(url, language, method, on_update=None, video_info=None, **kwargs):
+        runs.append(url)
+        time.sleep(0.05)
+        return _fake_process_video(url, language, method, on_update, video_info)
+
+    monkeypatch.setattr(jobs, "process_video", _counting)
+    first = jobs.JobQueue(tmp_path / "jobs.sqlite3", workers=2, poll_interval=0.02)
+    second = jobs.JobQueue(tmp_path / "jobs.sqlite3", workers=2, poll_interval=0.02)
+    job_ids = [first.submit(f"url{i}", "en", "subs") for i in range(6)]
+    first.start()
+    second.start()
+    try:
+        for job_id in job_ids:
+            assert _wait_done(first, job_id).status == "succeeded"
+    finally:
+        first.stop(timeout=2)
+        second.stop(timeout=2)
+
+    assert sorted(runs) == sorted(f"url{i}" for i in range(6))
+
+
+def test_iter_summary_streams_partial_text(monkeypatch, tmp_path):
+    def _slow_stream(url, language, method, on_update=None, video_info=None, on_summary_delta=None, **kwargs):
+        for word in ("one ", "two ", "three"):
+            on_summary_delta(word)
+            time.sleep(0.05)
+        result = _fake_process_video(url, language, method, on_update, video_info)
+        return replace(result, summary="one two three")
+
+    monkeypatch.setattr(jobs, "process_video", _slow_stream)
+    queue = jobs.JobQueue(tmp_path / "jobs.sqlite3", workers=1, poll_interval=0.02, summary_flush_interval=0)
+    queue.start()
+    try:
+        job_id = queue.submit("https://youtu.be/x", "en", "subs")
+        pieces = list(queue.iter_summary(job_id, poll_interval=0.01))
+    finally:
+        queue.stop(timeout=2)
+
+    assert len(pieces) > 1
+    assert "".join(pieces) == "one two three"
+
+
+def test_worker_survives_database_errors(monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs, "process_video", _fake_process_video)
+    queue = jobs.JobQueue(tmp_path / "jobs.sqlite3", workers=1, poll_interval=0.02)
+    claim_next, finish = queue._claim_next, queue._finish
+    errors = {"claim": 1, "finish": 1}
+
+    def _flaky_claim_next():
+        if errors["claim"]:
+            errors["claim"] -= 1
+            raise jobs.sqlite3.OperationalError("database is locked")
+        return claim_next()
+
+    def _flaky_finish(job_id, status, **kwargs):
+        if kwargs.get("result") and errors["finish"]:
+            errors["finish"] -= 1
+            raise jobs.sqlite3.OperationalError("disk I/O error")
+        return finish(job_id, status, **kwargs)
+
+    monkeypatch.setattr(queue, "_claim_next", _flaky_claim_next)
+    monkeypatch.setattr(queue, "_finish", _flaky_finish)
+    first_id = queue.submit("https://youtu.be/a", "en", "subs")
+    queue.start()
+    try:
+        first = _wait_done(queue, first_id)
+        second = _wait_done(queue, queue.submit("https://youtu.be/b", "en", "subs"))
+    finally:
+        queue.stop(timeout=2)
+
+    assert first.status == "failed"
+    assert "disk I/O error" in first.error
+    assert second.status == "succeeded"
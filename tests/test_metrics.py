@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from youtube_minder.services import summarizer
+from youtube_minder.services.cache import ResultCache
+from youtube_minder.utils import metrics
+from youtube_minder.workflows import processor
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, "get_metrics_registry", lambda: registry)
+    return registry
+
+
+class FakeOpenAI:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="summary"))],
+            usage=SimpleNamespace(prompt_tokens=len(prompt) // 4, completion_tokens=2),
+        )
+
+
+def test_stage_collects_usage_from_worker_threads_and_renders(registry):
+    events = []
+    with metrics.stage("summary", events.append, video_id="vid") as event:
+        usage = SimpleNamespace(
+            prompt_tokens=10, completion_tokens=3, prompt_tokens_details=SimpleNamespace(cached_tokens=6)
+        )
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(metrics.bind_context(lambda _: metrics.record_usage(usage)), range(8)))
+        metrics.record_usage(None)
+
+    assert events == [event]
+    assert (event.requests, event.prompt_tokens, event.cached_tokens, event.completion_tokens) == (9, 80, 48, 24)
+    assert event.ended_at is not None and event.status == "ok"
+
+    with pytest.raises(RuntimeError):
+        with metrics.stage("subtitles"):
+            raise RuntimeError("HTTP Error 429")
+    metrics.record_usage(SimpleNamespace(prompt_tokens=5, completion_tokens=5))  # outside any stage
+
+    text = registry.render()
+    assert 'ym_stage_runs_total{stage="summary",status="ok"} 1' in text
+    assert 'ym_stage_runs_total{stage="subtitles",status="error"} 1' in text
+    assert 'ym_tokens_total{kind="prompt",stage="summary"} 80' in text
+    assert 'ym_tokens_total{kind="cached",stage="summary"} 48' in text
+    assert 'ym_openai_requests_total{stage="summary"} 9' in text
+    assert 'ym_stage_duration_seconds_bucket{stage="summary",le="+Inf"} 1' in text
+    assert 'ym_stage_duration_seconds_count{stage="subtitles"} 1' in text
+
+
+def test_summarize_transcript_reports_tokens_and_cache_hits(monkeypatch, registry, tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3", 1 << 20)
+    monkeypatch.setattr(processor, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(summarizer, "get_openai_client", FakeOpenAI)
+    monkeypatch.setenv("SUMMARY_CHUNK_TOKENS", "50")
+    text = "\n\n".join(f"Paragraph {i} talks about caching." for i in range(40))
+
+    events = []
+    processor.summarize_transcript("vid", text, "en", on_event=events.append)
+    processor.summarize_transcript("vid", text, "en", on_event=events.append)
+
+    cold, warm = events
+    assert cold.stage == warm.stage == "summary"
+    assert not cold.cached and cold.requests > 1 and cold.prompt_tokens > 0
+    assert warm.cached and warm.requests == 0
+    assert 'ym_stage_cache_hits_total{stage="summary"} 1' in registry.render()
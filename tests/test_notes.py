@@ -0,0 +1,42 @@
+import re
+from types import SimpleNamespace
+
+from youtube_minder.services import notes
+from youtube_minder.services.cache import ResultCache
+
+
+class FakeOpenAI:
+    prompts: list[str] = []
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        prompt = "\n".join(m["content"] for m in messages[1:])
+        self.prompts.append(prompt)
+        part = re.search(r"part (\d+) of", prompt).group(1)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"<body><h2>Topic {part}</h2><p>notes</p></body>"))],
+            usage=None,
+        )
+
+
+def test_long_transcript_notes_are_sectioned_with_toc_and_cached_per_section(monkeypatch, tmp_path):
+    FakeOpenAI.prompts = []
+    monkeypatch.setattr(notes, "get_openai_client", FakeOpenAI)
+    monkeypatch.setenv("NOTES_SECTION_TOKENS", "60")
+    cache = ResultCache(tmp_path / "cache.sqlite3", 1 << 20)
+    paragraphs = [f"Paragraph {i} explains one more idea about caching." for i in range(12)]
+
+    html = notes.generate_notes_html("\n\n".join(paragraphs), title="Caching", cache=cache, video_id="vid")
+
+    sections = len(FakeOpenAI.prompts)
+    assert sections > 2
+    assert html.startswith("<h1>Caching</h1>\n<nav class=\"toc\">")
+    assert '<li><a href="#section-1">Topic 1</a></li>' in html
+    assert f'<section id="section-{sections}">\n<h2>Topic {sections}</h2>' in html
+
+    paragraphs[-1] = "The last paragraph now says something else entirely."
+    notes.generate_notes_html("\n\n".join(paragraphs), title="Caching", cache=cache, video_id="vid")
+    assert len(FakeOpenAI.prompts) == sections + 1
+    assert "something else entirely" in FakeOpenAI.prompts[-1]
@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+
+from youtube_minder.services import openai_client
+
+
+def test_parse_reset_durations():
+    assert openai_client._parse_reset("6m0s") == 360
+    assert openai_client._parse_reset("1.5s") == 1.5
+    assert abs(openai_client._parse_reset("120ms") - 0.12) < 1e-9
+    assert openai_client._parse_reset("2") == 2
+    assert openai_client._parse_reset(None) is None
+
+
+def test_limiter_spaces_requests_beyond_rpm():
+    limiter = openai_client.RateLimiter(requests_per_minute=60, tokens_per_minute=1_000_000)
+    waits = [limiter.reserve(tokens=10) for _ in range(62)]
+    assert waits[:60] == [0.0] * 60
+    assert 0.9 < waits[60] < 1.1
+    assert 1.9 < waits[61] < 2.1
+
+
+def test_limiter_waits_for_tokens():
+    limiter = openai_client.RateLimiter(requests_per_minute=1000, tokens_per_minute=6000)
+    assert limiter.reserve(tokens=6000) == 0.0
+    assert 9 < limiter.reserve(tokens=1000) < 11
+
+
+def test_limiter_follows_headers_and_pauses_on_429():
+    limiter = openai_client.RateLimiter(requests_per_minute=10_000, tokens_per_minute=1_000_000)
+    limiter.update(
+        200,
+        httpx.Headers({"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "0"}),
+    )
+    assert 0.9 < limiter.reserve(tokens=0) < 1.1
+
+    limiter = openai_client.RateLimiter(requests_per_minute=10_000, tokens_per_minute=1_000_000)
+    limiter.update(429, httpx.Headers({"retry-after": "3"}))
+    assert 2.9 < limiter.reserve(tokens=0) <= 3
+
+
+def test_clients_are_shared(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(openai_client, "_client", None)
+    monkeypatch.setattr(openai_client, "_async_clients", openai_client.weakref.WeakKeyDictionary())
+
+    client = openai_client.get_openai_client()
+    assert openai_client.get_openai_client() is client
+    assert client.max_retries == 5
+
+    async def _same_loop():
+        return openai_client.get_async_openai_client() is openai_client.get_async_openai_client()
+
+    assert asyncio.run(_same_loop())
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from youtube_minder.services.downloader import SubtitleTrack
+from youtube_minder.workflows import prefetch, processor
+
+
+VIDEO_INFO = {"title": "Title", "id": "vid00000001", "duration": 120, "webpage_url": "https://youtu.be/vid00000001"}
+
+
+@pytest.fixture
+def workspace(monkeypatch, pipeline_dirs):
+    monkeypatch.setattr(processor.summarizer, "summarize_text", lambda text, language="en": "Summary.")
+    return pipeline_dirs
+
+
+def test_run_reuses_subtitles_prefetched_while_options_were_chosen(monkeypatch, workspace):
+    fetched = []
+
+    def _download_tracks(url, output_path, langs):
+        fetched.append(langs)
+        return [SubtitleTrack(lang="en", kind="manual", text="Prefetched transcript.")]
+
+    monkeypatch.setattr(prefetch, "download_subtitle_tracks", _download_tracks)
+    monkeypatch.setattr(processor, "download_subtitle_tracks", _download_tracks)
+    prefetcher = prefetch.Prefetcher(ttl=60)
+    monkeypatch.setattr(prefetch, "_default_prefetcher", prefetcher)
+
+    assert prefetcher.start(VIDEO_INFO["webpage_url"], VIDEO_INFO, ["en", "ru"]).result(timeout=5) == "subs"
+    assert "vid00000001" in workspace._pins  # pinned until claimed
+
+    events = []
+    result = processor.process_video(
+        VIDEO_INFO["webpage_url"], "ru", "subs", video_info=VIDEO_INFO, on_event=events.append
+    )
+
+    assert result.transcription_text == "Prefetched transcript."
+    assert fetched == [["en", "ru"]]
+    assert [event.cached for event in events if event.stage == "subtitles"] == [True]
+    assert workspace._pins == {}
+    assert not prefetcher.claim("vid00000001")
+
+
+def test_unclaimed_prefetch_is_dropped_after_the_ttl(monkeypatch, workspace):
+    monkeypatch.setattr(prefetch, "download_subtitle_tracks", lambda url, output_path, langs: [])
+    downloaded = threading.Event()
+
+    def _download_audio(url, output_path):
+        (processor.Path(output_path) / "vid00000001.webm").write_bytes(b"audio")
+        downloaded.set()
+
+    monkeypatch.setattr(prefetch, "download_audio", _download_audio)
+    prefetcher = prefetch.Prefetcher(ttl=0.2, audio_max_duration=300)
+
+    assert prefetcher.start(VIDEO_INFO["webpage_url"], VIDEO_INFO, ["en"]).result(timeout=5) == "audio"
+    assert downloaded.is_set() and "vid00000001" in workspace._pins
+
+    for _ in range(100):
+        if not workspace._pins:
+            break
+        time.sleep(0.05)
+    assert workspace._pins == {}
+    assert (workspace.path_for("vid00000001") / "vid00000001.webm").is_file()  # left to LRU eviction
+    assert not prefetcher.claim("vid00000001")
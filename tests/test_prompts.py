@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from youtube_minder.services import notes, qa, summarizer
+
+
+def test_summary_notes_and_qa_share_the_transcript_prefix(monkeypatch):
+    requests = []
+
+    def _create(model, messages, **kwargs):
+        requests.append(messages)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="<p>reply</p>"))], usage=None)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    for module in (summarizer, notes, qa):
+        monkeypatch.setattr(module, "get_openai_client", lambda: client)
+    transcript = "A long lecture about prompt caching. " * 50
+
+    summarizer.summarize_text(transcript, language="ru")
+    notes.generate_notes_html(transcript, language="en", title="Caching")
+    qa.answer_questions(transcript, ["What is cached?"])
+
+    prefixes = [messages[:2] for messages in requests]
+    assert prefixes[0] == prefixes[1] == prefixes[2]
+    assert transcript in prefixes[0][1]["content"]
+    assert "in Russian" in requests[0][-1]["content"]
+    assert "Caching" in requests[1][-1]["content"]
+    assert "What is cached?" in requests[2][-1]["content"]
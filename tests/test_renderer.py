@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from youtube_minder.services import renderer
+
+
+class _FakeWeasy:
+    def __init__(self):
+        self.css_parsed = []
+        self.rendered = []
+        test = self
+
+        class CSS:
+            def __init__(self, string, base_url=None, font_config=None):
+                test.css_parsed.append(string)
+
+        class HTML:
+            def __init__(self, string, base_url=None):
+                self.string = string
+
+            def render(self, stylesheets=None, font_config=None):
+                test.rendered.append((self.string, stylesheets))
+                html = self.string
+                return SimpleNamespace(write_pdf=lambda: f"%PDF {html}".encode("utf-8"))
+
+        self.namespace = SimpleNamespace(HTML=HTML, CSS=CSS, FontConfiguration=lambda: "fonts")
+
+
+def _wrapper(tmp_path):
+    path = tmp_path / "wrapper.html"
+    path.write_text(
+        "<html><head><style>h1 { color: red; }</style></head><body>{{CONTENT}}</body></html>",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_renderer_parses_stylesheet_once_and_caches_pdfs(monkeypatch, tmp_path):
+    fake = _FakeWeasy()
+    monkeypatch.setattr(renderer, "_load_weasyprint", lambda: fake.namespace)
+    html_renderer = renderer.HTMLRenderer(_wrapper(tmp_path), cache_dir=tmp_path / "pdf")
+
+    first = html_renderer.render("<h1>One</h1>")
+    again = html_renderer.render("<h1>One</h1>")
+    other = html_renderer.render("<h1>Two</h1>")
+
+    assert first == again
+    assert first != other
+    assert fake.css_parsed == ["h1 { color: red; }"]
+    assert len(fake.rendered) == 2
+    page, stylesheets = fake.rendered[0]
+    assert "<style>" not in page and "<h1>One</h1>" in page
+    assert len(stylesheets) == 1
+    assert len(list((tmp_path / "pdf").glob("*.pdf"))) == 2
+
+
+def test_renderer_cache_evicts_oldest(monkeypatch, tmp_path):
+    fake = _FakeWeasy()
+    monkeypatch.setattr(renderer, "_load_weasyprint", lambda: fake.namespace)
+    html_renderer = renderer.HTMLRenderer(_wrapper(tmp_path), cache_dir=tmp_path / "pdf", cache_max_bytes=250)
+
+    for idx in range(5):
+        html_renderer.render(f"<p>{idx}</p>")
+
+    sizes = [p.stat().st_size for p in (tmp_path / "pdf").glob("*.pdf")]
+    assert 0 < len(sizes) < 5
+    assert sum(sizes) <= 250
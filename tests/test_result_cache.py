@@ -0,0 +1,119 @@
+import threading
+import time
+
+from youtube_minder.services.cache import CacheKey, ResultCache
+from youtube_minder.services.downloader import SubtitleTrack
+from youtube_minder.workflows import processor, sources
+
+
+def _key(stage: str, input_hash: str = "") -> CacheKey:
+    return CacheKey(video_id="vid", stage=stage, language="en", model="m", prompt_hash="p", input_hash=input_hash)
+
+
+def test_result_cache_roundtrip_and_lru_eviction(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3", max_bytes=25)
+    cache.set(_key("a"), "x" * 10)
+    cache.set(_key("b"), "y" * 10)
+    assert cache.get(_key("a")) == "x" * 10  # "a" becomes most recently used
+    cache.set(_key("c"), "z" * 10)
+
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) == "x" * 10
+    assert cache.get(_key("c")) == "z" * 10
+    assert cache.get(_key("a", input_hash="other")) is None
+
+
+def test_get_or_compute_only_computes_once(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3", max_bytes=1024)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_compute(_key("s"), compute) == ("value", False)
+    assert cache.get_or_compute(_key("s"), compute) == ("value", True)
+    assert len(calls) == 1
+
+
+def test_process_video_reuses_cached_summary(monkeypatch, tmp_path, pipeline_dirs):
+    monkeypatch.setattr(
+        processor, "download_subtitle_tracks", lambda url, out, langs: [SubtitleTrack("en", "auto", "Transcript text.")]
+    )
+
+    summaries = []
+
+    def _summarize(text, language="en"):
+        summaries.append(text)
+        return "Summary."
+
+    monkeypatch.setattr(processor.summarizer, "summarize_text", _summarize)
+    video_info = {"title": "Title", "id": "vid1", "duration": 60, "webpage_url": "https://youtu.be/vid1"}
+
+    first = processor.process_video("https://youtu.be/vid1", "en", "subs", video_info=video_info)
+    second = processor.process_video("https://youtu.be/vid1", "en", "subs", video_info=video_info)
+
+    assert first.summary == second.summary == "Summary."
+    assert len(summaries) == 1
+
+
+def test_run_that_joins_an_identical_run_gets_its_callbacks(monkeypatch, tmp_path, pipeline_dirs):
+    monkeypatch.setattr(
+        processor, "download_subtitle_tracks", lambda url, out, langs: [SubtitleTrack("en", "auto", "Transcript text.")]
+    )
+    joined = threading.Event()
+    summaries = []
+
+    def _summarize(text, language="en"):
+        summaries.append(text)
+        joined.wait(5)
+        time.sleep(0.1)  # let the follower reach the single-flight wait
+        return "Summary."
+
+    monkeypatch.setattr(processor.summarizer, "summarize_text", _summarize)
+    video_info = {"title": "Title", "id": "vid1", "duration": 60, "webpage_url": "https://youtu.be/vid1"}
+    leader = threading.Thread(
+        target=processor.process_video, args=("https://youtu.be/vid1", "en", "subs"), kwargs={"video_info": video_info}
+    )
+    leader.start()
+    while not summaries:
+        time.sleep(0.01)
+
+    deltas, events = [], []
+    result = processor.process_video(
+        "https://youtu.be/vid1",
+        "en",
+        "subs",
+        on_update=lambda message, level="info": joined.set(),
+        video_info=video_info,
+        on_summary_delta=deltas.append,
+        on_event=events.append,
+    )
+    leader.join()
+
+    assert result.summary == "Summary." and len(summaries) == 1
+    assert deltas == ["Summary."]
+    assert [(event.stage, event.cached) for event in events] == [("subtitles", True), ("summary", True)]
+
+
+def test_switching_summary_language_reuses_subtitle_tracks(monkeypatch, tmp_path, pipeline_dirs):
+    monkeypatch.setattr(sources, "SUBTITLE_LANGS", ["en", "ru"])
+    monkeypatch.setattr(processor.summarizer, "summarize_text", lambda text, language="en": f"{language}: {text}")
+
+    fetches = []
+
+    def _tracks(url, out, langs):
+        fetches.append(langs)
+        return [SubtitleTrack("ru", "manual", "Russian text.")]
+
+    monkeypatch.setattr(processor, "download_subtitle_tracks", _tracks)
+    video_info = {"title": "Title", "id": "vid1", "duration": 60, "webpage_url": "https://youtu.be/vid1"}
+
+    english = processor.process_video("https://youtu.be/vid1", "en", "subs", video_info=video_info)
+    russian = processor.process_video("https://youtu.be/vid1", "ru", "subs", video_info=video_info)
+
+    assert fetches == [["en", "ru"]]
+    assert not english.used_cache and russian.used_cache
+    assert english.transcription_text == russian.transcription_text == "Russian text."
+    assert russian.transcription_path == tmp_path / "transcriptions" / "vid1_subtitles_ru_manual.txt"
+    assert russian.summary == "ru: Russian text."
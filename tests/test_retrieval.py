@@ -0,0 +1,117 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+from youtube_minder.services import qa
+from youtube_minder.services.cache import ResultCache
+from youtube_minder.services.retrieval import TranscriptIndex, load_or_build_index
+from youtube_minder.workflows import async_processor, processor
+from youtube_minder.workflows.processor import ProcessingResult
+
+
+TOPICS = [
+    "Photosynthesis converts sunlight, water and carbon dioxide into glucose inside chloroplasts.",
+    "The French revolution began in 1789 with the storming of the Bastille in Paris.",
+    "Gradient descent updates model weights in the direction that lowers the training loss.",
+    "Volcanoes form where tectonic plates diverge or where magma rises through hotspots.",
+]
+
+
+def _transcript(repeat: int = 1) -> str:
+    paragraphs = []
+    for _ in range(repeat):
+        for topic in TOPICS:
+            paragraphs.append(topic + " " + "Filler words keep the talk going here. " * 5)
+    return "\n\n".join(paragraphs)
+
+
+def test_bm25_index_ranks_relevant_chunk_first(tmp_path):
+    index = TranscriptIndex.build(_transcript(), chunk_tokens=80)
+    assert len(index.chunks) == 4
+    assert index.search("When did the storming of the Bastille happen?", top_k=1) == [1]
+    assert index.search("how does gradient descent change weights", top_k=2)[0] == 2
+
+    path = tmp_path / "video.index.npz"
+    index.save(path)
+    loaded = TranscriptIndex.load(path)
+    assert loaded.chunks == index.chunks
+    assert loaded.search("chloroplasts glucose", top_k=1) == [0]
+
+
+def test_load_or_build_index_persists(tmp_path):
+    path = tmp_path / "video.index.npz"
+    built = load_or_build_index(_transcript(), path, chunk_tokens=80)
+    assert path.is_file()
+    assert load_or_build_index("ignored", path).chunks == built.chunks
+
+
+def test_answer_video_questions_sends_only_retrieved_passages(monkeypatch, tmp_path):
+    prompts = []
+
+    def _create(model, messages, **kwargs):
+        prompts.append("\n".join(m["content"] for m in messages[1:]))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="answer"))])
+
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    monkeypatch.setattr(qa, "get_openai_client", lambda: fake_client)
+    monkeypatch.setattr(processor, "get_result_cache", lambda: ResultCache(tmp_path / "cache.sqlite3", 1 << 20))
+    monkeypatch.setattr(processor, "TRANSCRIPTIONS_DIR", tmp_path)
+    monkeypatch.setenv("QA_RETRIEVAL_MIN_TOKENS", "500")
+    monkeypatch.setenv("QA_CHUNK_TOKENS", "80")
+    monkeypatch.setenv("QA_TOP_K", "1")
+
+    text = _transcript(repeat=10)
+    result = ProcessingResult(
+        summary="",
+        transcription_text=text,
+        transcription_path=Path(tmp_path / "t.txt"),
+        display_filename="t.txt",
+        is_subtitle=True,
+        used_cache=False,
+        video_info={"id": "vid", "title": "Lecture"},
+    )
+
+    assert processor.answer_video_questions(result, ["What happened at the Bastille?"]) == "answer"
+    assert len(prompts) == 1
+    assert "Bastille" in prompts[0]
+    assert "chloroplasts" not in prompts[0]
+    assert len(prompts[0]) < len(text) / 10
+    assert list(tmp_path.glob("vid_*_bm25_80.index.npz"))
+
+
+def test_async_questions_use_the_retrieved_passages_too(monkeypatch, tmp_path):
+    prompts = []
+
+    async def _create(model, messages, **kwargs):
+        prompts.append("\n".join(m["content"] for m in messages[1:]))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="answer"))])
+
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    monkeypatch.setattr(qa, "get_async_openai_client", lambda: fake_client)
+    monkeypatch.setattr(async_processor, "get_result_cache", lambda: ResultCache(tmp_path / "cache.sqlite3", 1 << 20))
+    monkeypatch.setattr(processor, "TRANSCRIPTIONS_DIR", tmp_path)
+    monkeypatch.setenv("QA_RETRIEVAL_MIN_TOKENS", "500")
+    monkeypatch.setenv("QA_CHUNK_TOKENS", "80")
+    monkeypatch.setenv("QA_TOP_K", "1")
+
+    text = _transcript(repeat=10)
+    answers = asyncio.run(async_processor._answers("vid", text, ["What happened at the Bastille?"], None))
+
+    assert answers == "answer"
+    assert len(prompts) == 1
+    assert "Bastille" in prompts[0]
+    assert "chloroplasts" not in prompts[0]
+    assert list(tmp_path.glob("vid_*_bm25_80.index.npz"))
+
+
+def test_transcript_index_is_rebuilt_when_the_chunk_size_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr(processor, "TRANSCRIPTIONS_DIR", tmp_path)
+    text = _transcript()
+
+    monkeypatch.setenv("QA_CHUNK_TOKENS", "80")
+    coarse = processor.transcript_index("vid", text)
+    monkeypatch.setenv("QA_CHUNK_TOKENS", "40")
+    fine = processor.transcript_index("vid", text)
+
+    assert len(fine.chunks) > len(coarse.chunks)
+    assert len(list(tmp_path.glob("vid_*.index.npz"))) == 2
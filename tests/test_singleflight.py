@@ -0,0 +1,61 @@
+import threading
+import time
+
+from youtube_minder.utils.hashing import get_sha256_hash
+from youtube_minder.utils.singleflight import SingleFlight
+
+
+def _run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def _worker(idx):
+        try:
+            results[idx] = target()
+        except Exception as exc:
+            errors[idx] = exc
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_single_flight_runs_once_for_concurrent_callers(tmp_path):
+    flight = SingleFlight(tmp_path / "locks")
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.2)
+        return "done"
+
+    results, errors = _run_concurrently(5, lambda: flight.do("video|subs|en", work))
+    assert results == ["done"] * 5
+    assert errors == [None] * 5
+    assert len(calls) == 1
+    assert not flight.is_inflight("video|subs|en")
+
+
+def test_single_flight_shares_failures_and_allows_retry(tmp_path):
+    flight = SingleFlight(tmp_path / "locks")
+
+    def fail():
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    _, errors = _run_concurrently(3, lambda: flight.do("key", fail))
+    assert all(isinstance(err, RuntimeError) for err in errors)
+
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_single_flight_keys_are_independent(tmp_path):
+    flight = SingleFlight(tmp_path / "locks")
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert sorted(p.name for p in (tmp_path / "locks").iterdir()) == sorted(
+        f"{get_sha256_hash(key)}.lock" for key in ("a", "b")
+    )
@@ -0,0 +1,96 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from youtube_minder.services import summarizer
+from youtube_minder.utils.text import estimate_tokens, split_text
+
+
+class FakeOpenAI:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.prompts: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        prompt = "\n".join(m["content"] for m in messages[1:])
+        task = messages[-1]["content"]
+        with self._lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if task.startswith("This is part"):
+            content = f"partial {task.split()[3]}"
+        else:
+            content = "final summary"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_split_text_respects_budget_and_sentence_boundaries():
+    text = "\n\n".join(f"Sentence {i} is here. Another one follows." for i in range(200))
+    chunks = split_text(text, max_tokens=100)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(text.split())
+
+
+def test_summarize_text_chunked_maps_concurrently_then_reduces(monkeypatch):
+    fake = FakeOpenAI(delay=0.05)
+    monkeypatch.setattr(summarizer, "get_openai_client", lambda: fake)
+
+    text = "\n\n".join(f"Paragraph {i}. " + "word " * 150 for i in range(8))
+    summary = summarizer.summarize_text_chunked(text, language="en", max_chunk_tokens=200, max_workers=4)
+
+    assert summary == "final summary"
+    map_prompts = [p for p in fake.prompts if "This is part" in p]
+    assert len(map_prompts) == 8
+    assert fake.max_active == 4
+    reduce_prompt = fake.prompts[-1]
+    assert "partial 1" in reduce_prompt and "partial 8" in reduce_prompt
+
+
+def test_summarize_text_switches_to_chunked_over_budget(monkeypatch):
+    fake = FakeOpenAI()
+    monkeypatch.setattr(summarizer, "get_openai_client", lambda: fake)
+    monkeypatch.setenv("SUMMARY_CHUNK_TOKENS", "50")
+
+    assert summarizer.summarize_text("Short text.") == "final summary"
+    assert len(fake.prompts) == 1
+
+    fake.prompts.clear()
+    summarizer.summarize_text("\n\n".join(["A sentence with several words in it."] * 40))
+    assert len(fake.prompts) > 2
+
+
+class FakeStreamingOpenAI(FakeOpenAI):
+    def _create(self, model, messages, stream=False, **kwargs):
+        if not stream:
+            return super()._create(model, messages, **kwargs)
+        self.prompts.append("\n".join(m["content"] for m in messages[1:]))
+
+        def _chunks():
+            for piece in ("Final ", "streamed ", "summary"):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+            yield SimpleNamespace(choices=[])
+
+        return _chunks()
+
+
+def test_summarize_text_stream_yields_deltas(monkeypatch):
+    fake = FakeStreamingOpenAI()
+    monkeypatch.setattr(summarizer, "get_openai_client", lambda: fake)
+
+    assert list(summarizer.summarize_text_stream("Short text.")) == ["Final ", "streamed ", "summary"]
+
+    fake.prompts.clear()
+    text = "\n\n".join(f"Paragraph {i}. " + "word " * 150 for i in range(4))
+    deltas = list(summarizer.summarize_text_stream(text, max_chunk_tokens=200, max_workers=2))
+    assert "".join(deltas) == "Final streamed summary"
+    assert sum("This is part" in p for p in fake.prompts) == 4
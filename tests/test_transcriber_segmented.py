@@ -0,0 +1,104 @@
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from youtube_minder.services import transcriber
+
+
+def test_plan_segments_uses_silences_or_overlapping_windows():
+    fixed = transcriber._plan_segments(1000, 300, 2)
+    assert fixed[0] == (0.0, 300)
+    assert fixed[1][0] == 298
+    assert fixed[-1][1] == 1000
+
+    snapped = transcriber._plan_segments(700, 300, 2, silences=[(310.0, 312.0)])
+    assert snapped[0] == (0.0, 311.0)
+    assert snapped[1][0] == 311.0
+
+
+def test_stitch_transcripts_drops_overlap():
+    parts = [
+        "We start with the basics of the topic and then",
+        "and then, we move on to advanced material.",
+        "Finally we wrap up.",
+    ]
+    assert transcriber._stitch_transcripts(parts) == (
+        "We start with the basics of the topic and then we move on to advanced material. Finally we wrap up."
+    )
+
+
+def test_transcribe_segmented_runs_segments_concurrently(monkeypatch, tmp_path):
+    audio = tmp_path / "video.mp3"
+    audio.write_bytes(b"fake")
+
+    def _fake_split(file_path, output_dir, segments):
+        paths = []
+        for idx, _ in enumerate(segments):
+            path = Path(output_dir) / f"segment_{idx}.mp3"
+            path.write_text(f"part{idx}", encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    threads = set()
+
+    def _create(model, file, response_format):
+        threads.add(threading.get_ident())
+        return file.read().decode("utf-8")
+
+    fake_client = SimpleNamespace(audio=SimpleNamespace(transcriptions=SimpleNamespace(create=_create)))
+    monkeypatch.setattr(transcriber, "_probe_duration", lambda _: 1000.0)
+    monkeypatch.setattr(transcriber, "_detect_silences", lambda _: [])
+    monkeypatch.setattr(transcriber, "_split_audio", _fake_split)
+    monkeypatch.setattr(transcriber, "get_openai_client", lambda: fake_client)
+
+    text = transcriber.transcribe_openai_segmented(str(audio), segment_seconds=300, overlap_seconds=2, max_workers=4)
+    assert text == "part0 part1 part2 part3"
+    assert threading.get_ident() not in threads
+
+
+def test_transcribe_segmented_rejects_overlap_that_would_never_advance(monkeypatch):
+    monkeypatch.setenv("TRANSCRIBE_SEGMENT_SECONDS", "60")
+    monkeypatch.setenv("TRANSCRIBE_OVERLAP_SECONDS", "60")
+    monkeypatch.setattr(transcriber, "_probe_duration", lambda _: pytest.fail("settings must be checked first"))
+
+    with pytest.raises(ValueError, match="TRANSCRIBE_OVERLAP_SECONDS"):
+        transcriber.transcribe_openai_segmented("audio.mp3")
+
+
+def test_local_engine_keeps_model_loaded_and_is_selectable(monkeypatch, tmp_path):
+    loaded = []
+
+    class FakeWhisperModel:
+        def __init__(self, model_size, device, compute_type, cpu_threads, num_workers):
+            loaded.append((model_size, device, compute_type, cpu_threads, num_workers))
+
+        def transcribe(self, file_path, beam_size, vad_filter):
+            segments = [SimpleNamespace(text=" Hello"), SimpleNamespace(text=" "), SimpleNamespace(text=" world. ")]
+            return iter(segments), SimpleNamespace(duration=2.0)
+
+    monkeypatch.setattr(transcriber, "_load_faster_whisper", lambda: FakeWhisperModel)
+    monkeypatch.setattr(transcriber, "_engines", {})
+    monkeypatch.setenv("LOCAL_STT_THREADS", "3")
+
+    engine = transcriber.get_transcription_engine("local")
+    assert transcriber.get_transcription_engine("local") is engine
+    assert [engine.transcribe(str(tmp_path / f"{idx}.webm")) for idx in range(2)] == ["Hello world."] * 2
+    assert loaded == [("small", "cpu", "int8", 3, 1)]
+
+    monkeypatch.setenv("TRANSCRIBE_ENGINE", "openai")
+    assert transcriber.get_transcription_engine().name == "openai"
+    with pytest.raises(ValueError):
+        transcriber.get_transcription_engine("cloud")
+
+
+def test_local_engine_reports_missing_faster_whisper(monkeypatch):
+    monkeypatch.setitem(sys.modules, "faster_whisper", None)
+    transcriber._load_faster_whisper.cache_clear()
+    try:
+        with pytest.raises(RuntimeError, match="faster-whisper is required"):
+            transcriber.LocalWhisperEngine().load()
+    finally:
+        transcriber._load_faster_whisper.cache_clear()
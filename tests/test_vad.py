@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from youtube_minder.services import vad
+from youtube_minder.workflows import processor
+
+
+def _pcm(signal: np.ndarray) -> np.ndarray:
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2")
+
+
+def _tone(seconds: float, amplitude: float = 0.3) -> np.ndarray:
+    t = np.arange(int(seconds * vad.SAMPLE_RATE)) / vad.SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+
+def _speech_like(seconds: float) -> np.ndarray:
+    """A voiced tone gated at a syllable rate of ~4 Hz."""
+    t = np.arange(int(seconds * vad.SAMPLE_RATE)) / vad.SAMPLE_RATE
+    return _tone(seconds) * (np.sin(2 * np.pi * 4 * t) > -0.3)
+
+
+def test_detect_speech_keeps_syllabic_audio_and_drops_silence_and_steady_music():
+    rng = np.random.default_rng(0)
+    silence = lambda seconds: 0.001 * rng.standard_normal(int(seconds * vad.SAMPLE_RATE))
+    signal = np.concatenate(
+        [silence(3), _tone(6), silence(2), _speech_like(8), silence(4), _speech_like(5), silence(3)]
+    )
+
+    regions = vad.detect_speech(vad.frame_powers(_pcm(signal)))
+
+    assert len(regions) == 2
+    (first_start, first_end), (second_start, second_end) = regions
+    assert 10.5 <= first_start <= 11.2 and 18.8 <= first_end <= 19.5
+    assert 22.5 <= second_start <= 23.2 and 27.8 <= second_end <= 28.5
+
+
+def test_speech_map_translates_times_back_to_the_original():
+    speech_map = vad.SpeechMap(((10.0, 20.0), (30.0, 35.0)), duration=40.0)
+
+    assert speech_map.speech_seconds == 15.0
+    assert speech_map.removed_fraction == 1 - 15 / 40
+    assert speech_map.to_original(0.0) == 10.0
+    assert speech_map.to_original(9.5) == 19.5
+    assert speech_map.to_original(10.0) == 30.0
+    assert speech_map.to_original(12.5) == 32.5
+    assert speech_map.to_original(99.0) == 35.0
+    assert vad.SpeechMap.from_dict(speech_map.as_dict()) == speech_map
+
+
+def test_transcribe_source_sends_only_speech_and_reuses_the_map(monkeypatch, tmp_path, pipeline_dirs):
+    speech_map = vad.SpeechMap(((5.0, 50.0),), duration=60.0)
+    detections = []
+
+    def _extract(file_path, target):
+        detections.append(file_path)
+        target.write_bytes(b"speech")
+        return speech_map
+
+    transcribed = []
+    engine = SimpleNamespace(description="fake engine", transcribe=lambda path: transcribed.append(path) or "Text.")
+    monkeypatch.setattr(vad, "extract_speech", _extract)
+    monkeypatch.setattr(processor, "get_transcription_engine", lambda name=None: engine)
+    (tmp_path / "vid.webm").write_bytes(b"audio")
+
+    for attempt in range(2):
+        source = processor.SourceMaterial(
+            video_info={"id": "vid", "duration": 60},
+            method="audio",
+            language="en",
+            download_dir=str(tmp_path),
+            cache_path=tmp_path / f"transcription_{attempt}.txt",
+            display_filename="vid.txt",
+            audio_path=str(tmp_path / "vid.webm"),
+        )
+        events = []
+        assert processor.transcribe_source(source, on_event=events.append) == "Text."
+        assert source.speech_map == speech_map
+        assert [(event.stage, event.cached) for event in events] == [("vad", attempt == 1), ("transcription", False)]
+        assert events[1].audio_seconds == 45.0
+
+    assert detections == [str(tmp_path / "vid.webm")]
+    assert transcribed == [str(tmp_path / "vid_speech.mp3")] * 2
@@ -0,0 +1,60 @@
+import io
+
+from youtube_minder.services import vtt
+
+
+ROLLING_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+welcome<00:00:00.500><c> to</c><c> the</c><c> course</c>
+
+00:00:02.000 --> 00:00:02.010 align:start position:0%
+welcome to the course
+ 
+
+00:00:02.010 --> 00:00:04.000 align:start position:0%
+welcome to the course
+today<00:00:02.500><c> we</c><c> talk</c><c> about</c><c> parsers</c>
+
+00:00:04.000 --> 00:00:04.010 align:start position:0%
+today we talk about parsers
+ 
+"""
+
+
+def test_iter_vtt_cues_parses_timings_and_identifiers():
+    content = """WEBVTT
+
+intro
+00:01.000 --> 00:02.500
+Hello &amp; <b>welcome</b>
+everyone
+
+2
+01:00:00.000 --> 01:00:01.000
+Bye
+"""
+    cues = list(vtt.iter_vtt_cues(io.StringIO(content)))
+    assert [(c.start, c.end, c.text) for c in cues] == [
+        (1.0, 2.5, "Hello & welcome everyone"),
+        (3600.0, 3601.0, "Bye"),
+    ]
+
+
+def test_merge_rolling_cues_removes_repeated_caption_text():
+    cues = list(vtt.merge_rolling_cues(vtt.iter_vtt_cues(io.StringIO(ROLLING_VTT))))
+    assert [c.text for c in cues] == ["welcome to the course", "today we talk about parsers"]
+    assert cues[1].start == 2.01
+    assert cues[1].continues_previous
+
+    text = vtt.clean_vtt_lines(io.StringIO(ROLLING_VTT))
+    assert text == "welcome to the course today we talk about parsers"
+
+
+def test_clean_vtt_file_streams_from_disk(tmp_path):
+    path = tmp_path / "video.en.vtt"
+    path.write_text(ROLLING_VTT, encoding="utf-8")
+    assert vtt.clean_vtt_file(path) == "welcome to the course today we talk about parsers"
+    assert len(vtt.parse_vtt_file(path)) == 2
@@ -0,0 +1,96 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from youtube_minder.services.workspace import DownloadWorkspace
+from youtube_minder.workflows import processor
+
+
+def _fill(workspace: DownloadWorkspace, video_id: str, size: int, mtime: float) -> None:
+    path = workspace.acquire(video_id)
+    (path / f"{video_id}.webm").write_bytes(b"x" * size)
+    workspace.release(video_id)
+    for entry in (path, *path.iterdir()):
+        os.utime(entry, (mtime, mtime))
+
+
+def test_evicts_least_recently_used_unpinned_dirs(tmp_path):
+    workspace = DownloadWorkspace(tmp_path / "downloads", max_bytes=30, lock_dir=tmp_path / "locks")
+    pinned = workspace.acquire("pinned")
+    (pinned / "pinned.webm.part").write_bytes(b"x" * 10)
+    os.utime(pinned, (500, 500))
+    _fill(workspace, "old", 10, 1_000)
+    _fill(workspace, "new", 10, 2_000)
+
+    assert workspace.evict() == []
+    _fill(workspace, "newest", 10, 3_000)  # release() enforces the quota
+    assert sorted(p.name for p in workspace.root.iterdir()) == ["new", "newest", "pinned"]
+
+    workspace.release("pinned")
+    for entry in (pinned, *pinned.iterdir()):
+        os.utime(entry, (500, 500))
+    workspace.max_bytes = 20
+    assert workspace.evict() == [pinned]
+
+
+def test_retry_after_transcription_failure_reuses_downloaded_audio(monkeypatch, tmp_path, pipeline_dirs):
+    monkeypatch.setattr(processor.summarizer, "summarize_text", lambda text, language="en": "Summary.")
+
+    downloads = []
+
+    def _download(url, output_path):
+        downloads.append(output_path)
+        (processor.Path(output_path) / "vid00000001.webm").write_bytes(b"audio")
+
+    attempts = []
+
+    def _transcribe(audio_path):
+        attempts.append(audio_path)
+        if len(attempts) == 1:
+            raise RuntimeError("Error code: 503")
+        return "Transcript."
+
+    monkeypatch.setattr(processor, "download_audio", _download)
+    engine = SimpleNamespace(description="fake engine", transcribe=_transcribe)
+    monkeypatch.setattr(processor, "get_transcription_engine", lambda name=None: engine)
+    video_info = {"title": "Title", "id": "vid00000001", "duration": 60, "webpage_url": "https://youtu.be/vid00000001"}
+
+    with pytest.raises(processor.ProcessingError):
+        processor.process_video("https://youtu.be/vid00000001", "en", "audio", video_info=video_info)
+    result = processor.process_video("https://www.youtube.com/watch?v=vid00000001", "ru", "audio", video_info=video_info)
+
+    assert result.transcription_text == "Transcript."
+    assert downloads == [str(tmp_path / "downloads" / "vid00000001")]
+    assert attempts[0] == attempts[1] == str(tmp_path / "downloads" / "vid00000001" / "vid00000001.webm")
+
+
+def test_audio_transcripts_are_cached_per_engine(monkeypatch, tmp_path, pipeline_dirs):
+    monkeypatch.setattr(processor.summarizer, "summarize_text", lambda text, language="en": "Summary.")
+    monkeypatch.setenv("TRANSCRIBE_VAD", "0")
+    monkeypatch.setenv("TRANSCRIBE_ENGINE", "openai")
+    monkeypatch.setattr(
+        processor,
+        "download_audio",
+        lambda url, output_path: (processor.Path(output_path) / "vid00000001.webm").write_bytes(b"audio"),
+    )
+    transcribed = []
+
+    def _engine(name=None):
+        name = name or "openai"
+        return SimpleNamespace(description=name, transcribe=lambda path: transcribed.append(name) or f"{name} text.")
+
+    monkeypatch.setattr(processor, "get_transcription_engine", _engine)
+    video_info = {"title": "Title", "id": "vid00000001", "duration": 60}
+
+    texts = [
+        processor.process_video("https://youtu.be/vid00000001", "en", "audio", video_info=video_info, engine=engine)
+        .transcription_text
+        for engine in (None, "local", "openai", "local")
+    ]
+
+    assert texts == ["openai text.", "local text.", "openai text.", "local text."]
+    assert transcribed == ["openai", "local"]
+    assert processor.processing_flight_key("vid00000001", "audio", "en") != processor.processing_flight_key(
+        "vid00000001", "audio", "en", "local"
+    )